@@ -37,6 +37,7 @@ sys.path.append(f'{root_path}{os.sep}core')
 import aedi  # noqa: E402
 
 # pylint: disable=wrong-import-position
+import rfreq  # noqa: E402
 import target  # noqa: E402
 
 
@@ -48,7 +49,8 @@ def _main():
     group.add_argument('--static-usb', action='store_true', help='build usb static library, disabled by default')
     group.add_argument('--dfu-util-speedup', action='store_true', help='build dfu-util with speedup patch')
 
-    builder.run(sys.argv[1:])
+    driver = rfreq.Driver(builder, root_path)
+    driver.run(sys.argv[1:])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,26 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+def __getattr__(name: str):
+    # Driver requires aedi core, import it on demand to keep other modules usable without it
+    if name == 'Driver':
+        from .driver import Driver  # pylint: disable=import-outside-toplevel
+        return Driver
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,150 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import contextlib
+import fcntl
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from aedi.state import BuildState
+from aedi.target import base
+
+from . import hooks
+from .toolchain import STANDARD_FUNCTIONS, STANDARD_HEADERS, toolchain_id
+
+# Path is relative to build directory, absolute one would be recorded in config.status and similar files
+CACHE_FILENAME = 'config.cache'
+
+# Results that depend only on compiler and SDK, everything else is kept in private cache of a target
+_SHARED_ENTRIES = frozenset((
+    # Compiler probes
+    'ac_cv_c_bigendian',
+    'ac_cv_c_compiler_gnu',
+    'ac_cv_c_const',
+    'ac_cv_c_inline',
+    'ac_cv_c_restrict',
+    'ac_cv_cxx_compiler_gnu',
+    'ac_cv_exeext',
+    'ac_cv_header_stdc',
+    'ac_cv_objext',
+    'ac_cv_prog_cc_c11',
+    'ac_cv_prog_cc_c89',
+    'ac_cv_prog_cc_c99',
+    'ac_cv_prog_cc_g',
+    'ac_cv_prog_cc_stdc',
+    'ac_cv_prog_cxx_cxx11',
+    'ac_cv_prog_cxx_cxx98',
+    'ac_cv_prog_cxx_g',
+    'ac_cv_prog_cxx_stdcxx',
+    # Sizes and types of C language and standard headers
+    *(f'ac_cv_sizeof_{name}' for name in ('char', 'int', 'long', 'long_long', 'short', 'size_t', 'void_p')),
+    *(f'ac_cv_type_{name}' for name in ('int8_t', 'int16_t', 'int32_t', 'int64_t', 'long_long_int', 'off_t',
+                                        'pid_t', 'size_t', 'ssize_t', 'uint8_t', 'uint16_t', 'uint32_t',
+                                        'uint64_t', 'uintptr_t', 'unsigned_long_long_int')),
+    # Standard headers and functions, header names are mangled by autoconf, e.g. sys/types.h to sys_types_h
+    *(f'ac_cv_header_{re.sub(r"[^a-zA-Z0-9]", "_", header)}' for header in STANDARD_HEADERS),
+    *(f'ac_cv_func_{function}' for function in STANDARD_FUNCTIONS),
+))
+
+# Simple cache entries look like ac_cv_header_stdio_h=${ac_cv_header_stdio_h=yes}
+_ENTRY_PATTERN = re.compile(r'^(\w+)=\$\{\1=.*\}$')
+
+
+class ConfigCache:
+    # Autoconf results shared between configure scripts of all targets
+    # Separate cache is used for each combination of architecture, SDK, and compiler
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def instrument(self, targets):
+        hooks.wrap_method(targets, 'configure', self._configure, _uses_cache)
+
+    def _configure(self, _, configure, state: BuildState, *args, **kwargs):
+        shared_path = self._shared_path(state)
+        private_path = state.build_path / CACHE_FILENAME
+
+        os.makedirs(state.build_path, exist_ok=True)
+
+        with _locked(shared_path):
+            entries = _read_entries(shared_path)
+
+        _write_entries(private_path, entries)
+        state.options['--cache-file'] = CACHE_FILENAME
+
+        result = configure(state, *args, **kwargs)
+
+        with _locked(shared_path):
+            entries = _read_entries(shared_path)
+            new_entries = _read_entries(private_path)
+
+            # Results from the first configure script win, a target cannot change them for others
+            if not new_entries.keys() <= entries.keys():
+                _write_entries(shared_path, {**new_entries, **entries})
+
+        return result
+
+    def _shared_path(self, state: BuildState) -> Path:
+        return self.path / f'{toolchain_id(state)}.cache'
+
+
+def _uses_cache(target) -> bool:
+    return isinstance(target, base.ConfigureMakeDependencyTarget) or getattr(target, 'config_cache', False)
+
+
+def cache_file_args(state: BuildState) -> tuple:
+    # Arguments for hand-written configure invocations of targets with enabled config_cache attribute
+    cache_file = state.options.get('--cache-file')
+    return (f'--cache-file={cache_file}',) if cache_file else ()
+
+
+@contextlib.contextmanager
+def _locked(path: Path):
+    lock_path = path.with_suffix('.lock')
+    os.makedirs(lock_path.parent, exist_ok=True)
+
+    with open(lock_path, 'w', encoding='utf-8') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def _read_entries(path: Path) -> dict:
+    entries = {}
+
+    if path.exists():
+        with open(path, encoding='utf-8', errors='surrogateescape') as f:
+            for line in f:
+                line = line.rstrip('\n')
+                match = _ENTRY_PATTERN.match(line)
+
+                if match and match.group(1) in _SHARED_ENTRIES:
+                    entries[match.group(1)] = line
+
+    return entries
+
+
+def _write_entries(path: Path, entries: dict):
+    descriptor, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+
+    with os.fdopen(descriptor, 'w', encoding='utf-8', errors='surrogateescape') as f:
+        for name in sorted(entries):
+            f.write(entries[name] + '\n')
+
+    os.replace(temp_path, path)
@@ -0,0 +1,120 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import fcntl
+import os
+import shutil
+import tarfile
+import tempfile
+from pathlib import Path
+
+from . import tarball
+
+
+class BuildCache:
+    def __init__(self, path: Path, max_size: int):
+        self.path = path
+        self.max_size = max_size
+
+    def _archive_path(self, name: str, fingerprint: str) -> Path:
+        return self.path / name / f'{fingerprint}.tar'
+
+    def restore(self, name: str, fingerprint: str, install_path: Path) -> bool:
+        archive_path = self._archive_path(name, fingerprint)
+
+        if not archive_path.exists():
+            return False
+
+        # Unpack next to installed dependency, and swap them when done, so it is never left partially restored
+        os.makedirs(install_path.parent, exist_ok=True)
+        temp_path = Path(tempfile.mkdtemp(dir=install_path.parent, prefix=f'.{install_path.name}-'))
+        old_path = temp_path.with_name(temp_path.name + '-old')
+
+        try:
+            with tarfile.open(archive_path) as tar_file:
+                tarball.extract(tar_file, temp_path)
+
+            # Temporary directory is accessible by owner only
+            os.chmod(temp_path, 0o755)
+
+            if install_path.exists():
+                os.replace(install_path, old_path)
+
+            try:
+                os.replace(temp_path, install_path)
+            except OSError:
+                # Put installed dependency back
+                if old_path.exists():
+                    os.replace(old_path, install_path)
+
+                raise
+        finally:
+            for path in (temp_path, old_path):
+                if path.exists():
+                    shutil.rmtree(path)
+
+        # Mark cache entry as recently used
+        os.utime(archive_path)
+        return True
+
+    def store(self, name: str, fingerprint: str, install_path: Path):
+        archive_path = self._archive_path(name, fingerprint)
+        os.makedirs(archive_path.parent, exist_ok=True)
+
+        # Write to temporary file first, and rename it when done, so incomplete archive is never picked up
+        descriptor, temp_path = tempfile.mkstemp(dir=archive_path.parent, suffix='.tmp')
+
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                with tarfile.open(fileobj=f, mode='w') as tar_file:
+                    tar_file.add(install_path, arcname='.')
+
+            os.replace(temp_path, archive_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+        self._evict()
+
+    def _evict(self):
+        with open(self.path / '.lock', 'w', encoding='utf-8') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+            entries = []
+            total_size = 0
+
+            for archive_path in self.path.glob('*/*.tar'):
+                try:
+                    stat = archive_path.stat()
+                except FileNotFoundError:
+                    continue
+
+                entries.append((stat.st_mtime, stat.st_size, archive_path))
+                total_size += stat.st_size
+
+            # Remove least recently used entries until cache fits into its size limit
+            for _, size, archive_path in sorted(entries):
+                if total_size <= self.max_size:
+                    break
+
+                try:
+                    os.unlink(archive_path)
+                except FileNotFoundError:
+                    pass
+
+                total_size -= size
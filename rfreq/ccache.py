@@ -0,0 +1,102 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import shutil
+from pathlib import Path
+
+from aedi.state import BuildState
+from aedi.target import base
+
+from . import hooks
+
+# Compilers that ccache runs when invoked via symbolic link with the same name
+_COMPILERS = ('cc', 'c++', 'clang', 'clang++', 'gcc', 'g++')
+
+
+class CompilerCache:
+    # Runs compilers of all targets through ccache, configuration is applied right before target's configure step
+
+    def __init__(self, launcher: str, root_path: Path, cache_path: Path):
+        self.launcher = launcher
+        self.root_path = root_path
+        self.cache_path = cache_path
+        self.bin_path = cache_path / 'bin'
+
+    def instrument(self, targets):
+        self._create_links()
+        hooks.wrap_method(targets, 'configure', self._configure)
+
+    def _create_links(self):
+        # Symbolic links to ccache named after compilers, ccache runs the next compiler with the same name from PATH
+        os.makedirs(self.bin_path, exist_ok=True)
+
+        for compiler in _COMPILERS:
+            link_path = self.bin_path / compiler
+
+            if link_path.is_symlink() and os.readlink(link_path) == self.launcher:
+                continue
+
+            # Several targets can be built concurrently, so link is replaced atomically
+            temp_path = self.bin_path / f'.{compiler}-{os.getpid()}'
+            temp_path.unlink(missing_ok=True)
+            os.symlink(self.launcher, temp_path)
+            os.replace(temp_path, link_path)
+
+    def _configure(self, target, configure, state: BuildState, *args, **kwargs):
+        self.apply(target, state)
+        return configure(state, *args, **kwargs)
+
+    def apply(self, target, state: BuildState):
+        environment = state.environment
+
+        # Absolute paths inside checkout are hashed as relative ones, so several checkouts can share cached objects
+        environment['CCACHE_BASEDIR'] = str(self.root_path)
+        environment['CCACHE_NOHASHDIR'] = '1'
+        environment['CCACHE_DIR'] = str(self.cache_path / state.architecture())
+
+        if isinstance(target, (base.CMakeDependencyTarget, base.CMakeMainTarget)):
+            environment['CMAKE_C_COMPILER_LAUNCHER'] = self.launcher
+            environment['CMAKE_CXX_COMPILER_LAUNCHER'] = self.launcher
+            environment['CMAKE_OBJC_COMPILER_LAUNCHER'] = self.launcher
+            environment['CMAKE_OBJCXX_COMPILER_LAUNCHER'] = self.launcher
+        else:
+            # Configure scripts, Meson, and qmake find compilers in PATH, and some scripts treat $CC as one word
+            # so compilers are replaced with links to ccache instead of prepending ccache to compiler command
+            search_path = environment.get('PATH', os.environ.get('PATH', os.defpath))
+            bin_path = str(self.bin_path)
+
+            if search_path.split(os.pathsep)[0] != bin_path:
+                environment['PATH'] = f'{bin_path}{os.pathsep}{search_path}'
+
+            for variable in ('CC', 'CXX'):
+                compiler = environment.get(variable)
+
+                if compiler and os.path.isabs(compiler):
+                    environment[variable] = self._link_path(compiler, search_path)
+
+    def _link_path(self, compiler: str, search_path: str) -> str:
+        # Compiler set by absolute path can be replaced only when ccache will find the same compiler in PATH
+        name = os.path.basename(compiler)
+
+        if name not in _COMPILERS:
+            return compiler
+
+        found = shutil.which(name, path=search_path)
+        is_same = found and os.path.exists(compiler) and os.path.samefile(found, compiler)
+        return str(self.bin_path / name) if is_same else compiler
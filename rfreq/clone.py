@@ -0,0 +1,129 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import ctypes
+import ctypes.util
+import errno
+import fcntl
+import functools
+import os
+import shutil
+import sys
+import threading
+from pathlib import Path
+
+CLONE = 'clone'
+LINK = 'link'
+COPY = 'copy'
+
+# Errors meaning that operation is not supported between given file systems rather than failed
+_UNSUPPORTED_ERRORS = (errno.ENOTSUP, errno.EOPNOTSUPP, errno.EXDEV, errno.ENOTTY, errno.ENOSYS)
+
+# Errors meaning that operation is not possible for particular file, e.g. because of link count limit
+_FILE_ERRORS = (errno.EINVAL, errno.EMLINK, errno.EPERM)
+
+# From linux/fs.h
+_FICLONE = 0x40049409
+
+_strategies = {}
+_strategies_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _load_clonefile():
+    libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+    function = getattr(libc, 'clonefile', None)
+
+    if function:
+        function.argtypes = (ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32)
+        function.restype = ctypes.c_int
+
+    return function
+
+
+def _clone(source: Path, destination: Path):
+    if sys.platform == 'darwin':
+        clonefile = _load_clonefile()
+
+        if not clonefile:
+            raise OSError(errno.ENOTSUP, 'clonefile() is not available', str(destination))
+
+        # Cloned file gets the same permissions and timestamps as the source one
+        if clonefile(os.fsencode(source), os.fsencode(destination), 0) != 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), str(destination))
+    elif sys.platform.startswith('linux'):
+        with open(source, 'rb') as src, open(destination, 'wb') as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            except OSError:
+                dst.close()
+                os.unlink(destination)
+                raise
+
+        shutil.copystat(source, destination)
+    else:
+        raise OSError(errno.ENOTSUP, 'File cloning is not supported', str(destination))
+
+
+def _link(source: Path, destination: Path):
+    os.link(source, destination)
+
+
+def _copy(source: Path, destination: Path):
+    shutil.copy2(source, destination)
+
+
+_OPERATIONS = {
+    CLONE: _clone,
+    LINK: _link,
+}
+
+
+def hardcopy(source: Path, destination: Path, link: bool = False) -> str:
+    # Copy file with the cheapest operation supported by source and destination file systems
+    # Hard link is used only when requested, i.e. when neither of two files is ever modified in place
+    # Returns the operation that was performed
+    source = Path(source).resolve()
+    destination = Path(destination)
+
+    key = (os.stat(source).st_dev, os.stat(destination.parent).st_dev)
+    candidates = (CLONE, LINK) if link else (CLONE,)
+
+    with _strategies_lock:
+        unsupported = _strategies.setdefault(key, set())
+        candidates = [candidate for candidate in candidates if candidate not in unsupported]
+
+    for candidate in candidates:
+        try:
+            _OPERATIONS[candidate](source, destination)
+            return candidate
+        except OSError as ex:
+            if ex.errno in _FILE_ERRORS:
+                # Try the next operation for this file only
+                continue
+
+            if ex.errno not in _UNSUPPORTED_ERRORS:
+                raise
+
+            # Remember unsupported operation for this pair of file systems, and do not try it again
+            with _strategies_lock:
+                unsupported.add(candidate)
+
+    _copy(source, destination)
+    return COPY
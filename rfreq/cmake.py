@@ -0,0 +1,110 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import fcntl
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from aedi.state import BuildState
+from aedi.target import base
+
+from . import hooks
+from .toolchain import STANDARD_FUNCTIONS, STANDARD_HEADERS, toolchain_id
+
+# Results of check_include_file(), check_function_exists(), check_symbol_exists(), and similar modules
+_CHECK_PATTERN = re.compile(r'^(HAVE_\w+):INTERNAL=(.*)$', re.MULTILINE)
+
+# Projects name results of checks as they like, only conventional names of standard checks are shared
+# e.g. HAVE_SYS_TYPES_H for sys/types.h header, and HAVE_STRNDUP for strndup() function
+_SHARED_CHECKS = frozenset(f'HAVE_{re.sub(r"[^A-Z0-9]", "_", name.upper())}'
+                           for name in (*STANDARD_HEADERS, *STANDARD_FUNCTIONS))
+
+
+class CheckCache:
+    # Results of CMake checks shared between targets
+    # Separate cache is used for each combination of architecture, SDK, compiler, and CMake version
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def instrument(self, targets):
+        hooks.wrap_method(targets, 'configure', self._configure,
+                          lambda target: isinstance(target, (base.CMakeDependencyTarget, base.CMakeMainTarget)))
+
+    def _configure(self, _, configure, state: BuildState, *args, **kwargs):
+        shared_path = self.path / f'{toolchain_id(state, "cmake")}.json'
+        preloaded = self._read(shared_path)['results']
+
+        options = state.options
+        specified = {option.split(':', 1)[0] for option in options}
+
+        for name, value in preloaded.items():
+            # Explicitly specified values must not be overridden
+            if name not in specified:
+                options[f'{name}:INTERNAL'] = value
+
+        result = configure(state, *args, **kwargs)
+
+        with open(state.build_path / 'CMakeCache.txt', encoding='utf-8', errors='surrogateescape') as f:
+            harvested = {name: value for name, value in _CHECK_PATTERN.findall(f.read())
+                         if name not in specified and name in _SHARED_CHECKS}
+
+        self._merge(shared_path, harvested)
+
+        return result
+
+    @staticmethod
+    def _read(path: Path) -> dict:
+        if not path.exists():
+            return {'results': {}, 'conflicts': []}
+
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _merge(self, path: Path, harvested: dict):
+        os.makedirs(path.parent, exist_ok=True)
+
+        with open(path.with_suffix('.lock'), 'w', encoding='utf-8') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+            cache = self._read(path)
+            results = cache['results']
+            conflicts = set(cache['conflicts'])
+
+            for name, value in harvested.items():
+                if name in conflicts:
+                    continue
+
+                # The same name is used for different checks by different projects, do not share such results
+                if name in results and results[name] != value:
+                    del results[name]
+                    conflicts.add(name)
+                else:
+                    results[name] = value
+
+            cache['conflicts'] = sorted(conflicts)
+
+            descriptor, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=1, sort_keys=True)
+
+            os.replace(temp_path, path)
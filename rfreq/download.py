@@ -0,0 +1,165 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import functools
+import hashlib
+import os
+import shutil
+import tarfile
+import tempfile
+import typing
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from . import hooks, tarball
+from .source import record_sources
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+class _StreamReader:
+    # Hashes data read from underlying stream, and optionally copies it to another file
+
+    def __init__(self, stream, copy=None):
+        self.stream = stream
+        self.copy = copy
+        self.hasher = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        self.hasher.update(data)
+
+        if self.copy:
+            self.copy.write(data)
+
+        return data
+
+    def drain(self):
+        # Archive end can be reached before the end of stream, e.g. because of padding
+        while self.read(_CHUNK_SIZE):
+            pass
+
+
+def archive_filename(url: str) -> str:
+    return url.rsplit('/', 1)[1]
+
+
+def _is_extracted(path: Path) -> bool:
+    # Archive is unpacked next to itself, to directory named after the first component of its first member
+    with tarfile.open(path, mode='r|*') as tar_file:
+        member = tar_file.next()
+
+    directory = os.path.normpath(member.name).split(os.sep, 1)[0] if member else os.curdir
+    return directory != os.curdir and (path.parent / directory).is_dir()
+
+
+def _extract(reader: _StreamReader, path: Path):
+    with tarfile.open(fileobj=reader, mode='r|*') as tar_file:
+        tarball.extract(tar_file, path)
+
+    reader.drain()
+
+
+def _read(source, checksum: str, description: str, copy=None, extract_path: typing.Optional[Path] = None):
+    reader = _StreamReader(source, copy)
+    temp_path = None
+
+    try:
+        if extract_path:
+            # Unpack to temporary directory, its content is moved to destination only after successful verification
+            temp_path = Path(tempfile.mkdtemp(dir=extract_path, prefix='.extract-'))
+            _extract(reader, temp_path)
+        else:
+            reader.drain()
+
+        digest = reader.hasher.hexdigest()
+
+        if digest != checksum:
+            raise RuntimeError(f'Checksum of {description} does not match, expected {checksum}, got {digest}')
+
+        if temp_path:
+            # Move unpacked top-level directory in place with a single rename
+            # Another process may unpack the same archive concurrently, keep its result if so
+            for entry in temp_path.iterdir():
+                destination = extract_path / entry.name
+
+                if not destination.exists():
+                    os.replace(entry, destination)
+    finally:
+        if temp_path:
+            shutil.rmtree(temp_path)
+
+
+def fetch(url: str, checksum: str, path: Path, extract: bool = False, store=None):
+    os.makedirs(path.parent, exist_ok=True)
+    extract_path = path.parent if extract else None
+
+    if path.exists() or (store and store.link(checksum, path)):
+        if extract_path and not _is_extracted(path):
+            # Verify and unpack already downloaded archive reading it only once
+            with open(path, 'rb') as f:
+                _read(f, checksum, str(path), extract_path=extract_path)
+
+        return
+
+    descriptor, temp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.part')
+
+    try:
+        request = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
+
+        # Verify checksum and unpack while data is streaming in, without reading downloaded file again
+        with urllib.request.urlopen(request) as response, os.fdopen(descriptor, 'wb') as f:  # nosec B310
+            _read(response, checksum, url, copy=f, extract_path=extract_path)
+
+        # Temporary files are accessible by owner only
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+
+    if store:
+        store.add(checksum, path)
+
+
+def prefetch(downloads: list, jobs: int, extract: bool = False, store=None):
+    # Each download is (url, checksum, path) tuple
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(fetch, *download, extract, store) for download in downloads]
+
+        for future in futures:
+            future.result()
+
+
+def instrument(targets, source_path: Path, store=None):
+    # Source archives of regular builds are also verified and unpacked in a single pass before build state gets them
+    # Build state finds archives already downloaded and unpacked, and only applies patches
+    hooks.wrap_method(targets, 'prepare_source', functools.partial(_prepare_source, source_path, store))
+
+
+def _prepare_source(source_path: Path, store, target, method, state):
+    # Sources specified by user are used as is
+    sources = None if getattr(state, 'external_source', False) else record_sources(target, method)
+
+    if sources:
+        for archive in sources.archives:
+            path = source_path / target.name / archive_filename(archive.url)
+            fetch(archive.url, archive.checksum, path, extract=True, store=store)
+
+    method(state)
@@ -0,0 +1,674 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import shutil
+import subprocess
+import sys
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from aedi.target import base
+
+from . import hooks, universal
+from .autoconf import ConfigCache
+from .cache import BuildCache
+from .ccache import CompilerCache
+from .clone import hardcopy
+from .cmake import CheckCache
+from .download import archive_filename
+from .download import instrument as instrument_downloads
+from .download import prefetch
+from .fingerprint import Fingerprinter, read_fingerprint, write_fingerprint
+from .graph import TargetGraph
+from .history import BuildHistory
+from .jobserver import JobServer
+from .jobserver import is_supported as is_jobserver_supported
+from .query import describe, format_dot, format_json
+from .scheduler import Scheduler
+from .source import record_sources
+from .store import ArchiveStore
+from .trace import Tracer, critical_path, read_events
+
+# Options that do not affect build results, with number of values they consume
+_NEUTRAL_OPTIONS = {
+    '--build-path': 1,
+    '--cache-path': 1,
+    '--compiler-cache': 0,
+    '--stage-cache': 0,
+    '--stage-cache-size': 1,
+    '--output-path': 1,
+    '--source-path': 1,
+    '--temp-path': 1,
+    '--verbose': 0,
+}
+
+# Set for build scripts launched by driver, each of them builds its target by itself
+_CHILD_VARIABLE = 'RFREQ_DRIVER_CHILD'
+
+# Set for per-architecture builds of split target, overrides its install directory
+_INSTALL_VARIABLE = 'RFREQ_INSTALL_PATH'
+
+# Architectures of multi-platform targets that are built in separate processes with --parallel-arch option
+_SPLIT_ARCHITECTURES = ('arm64', 'x86_64')
+
+
+class Driver:
+    def __init__(self, builder, root_path: Path):
+        self.builder = builder
+        self.root_path = Path(root_path)
+        self.deps_path = self.root_path / 'deps'
+
+        group = builder.argparser.add_argument_group('Driver')
+        group.add_argument('--parallel', action='store_true',
+                           help='build target together with its prerequisites, independent targets concurrently')
+        group.add_argument('--parallel-arch', action='store_true',
+                           help='build each architecture of multi-platform dependencies concurrently '
+                                'in separate processes, and merge them into universal binaries')
+        group.add_argument('--build-cache', action='store_true',
+                           help='restore unchanged dependencies from build cache instead of building them')
+        group.add_argument('--build-cache-size', type=int, default=20, metavar='GB',
+                           help='size limit of build cache, 20 GB by default')
+        group.add_argument('--cache-path', metavar='PATH', help='path to build cache directory')
+        group.add_argument('--changed-only', action='store_true',
+                           help='build only prerequisites changed since their last build, '
+                                'and targets depending on them')
+        group.add_argument('--prefetch', action='store_true',
+                           help='download and unpack source archives of target and all its prerequisites '
+                                'concurrently before build')
+        group.add_argument('--prefetch-jobs', type=int, default=8, metavar='N',
+                           help='number of concurrent downloads, 8 by default')
+        group.add_argument('--archive-store', metavar='PATH', default=os.environ.get('RFREQ_ARCHIVE_STORE'),
+                           help='path to source archives store shared between checkouts, '
+                                'RFREQ_ARCHIVE_STORE environment variable by default')
+        group.add_argument('--archive-store-size', type=int, default=20, metavar='GB',
+                           help='size limit of source archives store, 20 GB by default')
+        group.add_argument('--git-mirrors', metavar='PATH', default=os.environ.get('RFREQ_GIT_MIRRORS'),
+                           help='path to bare mirrors of Git repositories, RFREQ_GIT_MIRRORS environment variable '
+                                'by default, blob-less clones are made when not set')
+        group.add_argument('--compiler-cache', action='store_true',
+                           help='compile with ccache, objects are cached separately for each architecture')
+        group.add_argument('--config-cache', action='store_true',
+                           help='share results of configure scripts between targets, separately for each '
+                                'architecture, SDK, and compiler')
+        group.add_argument('--cmake-check-cache', action='store_true',
+                           help='share results of CMake checks between targets, separately for each '
+                                'architecture, SDK, compiler, and CMake version')
+        group.add_argument('--stage-cache', action='store_true',
+                           help='cache intermediate stages of long builds, like compiler of GCC toolchains')
+        group.add_argument('--stage-cache-size', type=int, default=20, metavar='GB',
+                           help='size limit of stage cache, 20 GB by default')
+        group.add_argument('--jobserver', action='store_true',
+                           help='share job slots between all make-based builds of targets, '
+                                'requires GNU Make 4.4 or newer, implies --parallel')
+        group.add_argument('--graph', nargs='?', const='dot', choices=('dot', 'json'),
+                           help='print graph of targets with their prerequisites and recorded build times '
+                                'instead of building, limited to target prerequisites when target is specified')
+        group.add_argument('--reverse', action='store_true',
+                           help='print targets depending on specified target instead of its prerequisites')
+        group.add_argument('--trace', metavar='PATH',
+                           help='write timing of target build phases and launched processes to Chrome trace file')
+
+        # Driver options that must not be passed to child builds, with number of values they consume
+        self._driver_options = {
+            '--build-cache': 0,
+            '--build-cache-size': 1,
+            '--changed-only': 0,
+            '--parallel': 0,
+            '--parallel-arch': 0,
+            '--prefetch': 0,
+            '--prefetch-jobs': 1,
+            '--archive-store': 1,
+            '--archive-store-size': 1,
+            '--jobserver': 0,
+            '--trace': 1,
+        }
+
+    def run(self, args: list):
+        arguments = self.builder.argparser.parse_known_args(args)[0]
+
+        if arguments.graph:
+            self._print_graph(arguments)
+            return
+
+        driven = (arguments.parallel or arguments.parallel_arch or arguments.build_cache or arguments.changed_only
+                  or arguments.prefetch or arguments.jobserver or arguments.xcode)
+
+        # Child build may get --xcode option only, other driver options are not passed to it
+        if arguments.target and driven and _CHILD_VARIABLE not in os.environ:
+            self._build(arguments, args)
+            return
+
+        instrument_downloads(self.builder.targets, Path(arguments.source_path or self.root_path / 'source'),
+                             _archive_store(arguments))
+
+        self._instrument_caches(arguments)
+
+        install_path = os.environ.get(_INSTALL_VARIABLE)
+
+        if install_path:
+            _redirect_install(self.builder.targets, arguments.target, Path(install_path))
+
+        if arguments.trace:
+            tracer = Tracer()
+            tracer.instrument(self.builder.targets)
+
+            try:
+                self.builder.run(args)
+            finally:
+                tracer.write(Path(arguments.trace))
+        else:
+            self.builder.run(args)
+
+        # Driver records fingerprint of split target after merging its per-architecture builds
+        if arguments.target and not arguments.xcode and not install_path:
+            self._record_fingerprint(arguments.target, args)
+
+    def _instrument_caches(self, arguments):
+        if arguments.compiler_cache:
+            launcher = shutil.which('ccache')
+
+            if launcher:
+                cache_path = self._cache_path(arguments) / 'ccache'
+                CompilerCache(launcher, self.root_path, cache_path).instrument(self.builder.targets)
+            else:
+                print('Compiler cache is disabled because ccache was not found')
+
+        if arguments.config_cache:
+            cache_path = self._cache_path(arguments) / 'autoconf'
+            ConfigCache(cache_path).instrument(self.builder.targets)
+
+        if arguments.cmake_check_cache:
+            cache_path = self._cache_path(arguments) / 'cmake'
+            CheckCache(cache_path).instrument(self.builder.targets)
+
+        if arguments.stage_cache:
+            cache_path = self._cache_path(arguments) / 'stage'
+            stage_cache = BuildCache(cache_path, arguments.stage_cache_size * 1024 ** 3)
+
+            for target in self.builder.targets:
+                if hasattr(target, 'stage_cache'):
+                    target.stage_cache = stage_cache
+
+    def _record_fingerprint(self, name: str, args: list):
+        # Dependency built without driver is up-to-date for following --changed-only and --build-cache runs
+        graph = TargetGraph(self.builder.targets, self.deps_path)
+        target = graph.targets.get(name)
+
+        if not target or target.destination != target.DESTINATION_DEPS:
+            return
+
+        fingerprint = self._fingerprinter(graph, args).fingerprint(name)
+        install_path = self.deps_path / name
+
+        if fingerprint and install_path.exists():
+            write_fingerprint(install_path, fingerprint)
+
+    def _fingerprinter(self, graph: TargetGraph, args: list) -> Fingerprinter:
+        # Dependencies are always built without Xcode, and only arguments that affect build results are hashed
+        arguments = _strip_arguments(args, self._driver_options, _NEUTRAL_OPTIONS,
+                                     {'--target': 1, '--jobs': 1, '--xcode': 0})
+        return Fingerprinter(graph, self.root_path / 'patch', arguments)
+
+    def _cache_path(self, arguments) -> Path:
+        return Path(arguments.cache_path or self.root_path / 'cache')
+
+    def _build(self, arguments, args: list):
+        graph = TargetGraph(self.builder.targets, self.deps_path)
+        child_args = _strip_arguments(args, self._driver_options, {'--target': 1, '--jobs': 1})
+        build = _Build(arguments, graph, self.root_path, self._cache_path(arguments), child_args)
+        build.run(self._fingerprinter(graph, args))
+
+    def _print_graph(self, arguments):
+        graph = TargetGraph(self.builder.targets, self.deps_path, linked=True)
+
+        if not arguments.target:
+            names = graph.closure(*sorted(graph.targets))
+        elif arguments.reverse:
+            names = graph.reverse_closure(arguments.target)
+        else:
+            names = graph.closure(arguments.target)
+
+        history_path = self._cache_path(arguments) / 'history.sqlite3'
+        build_times = {}
+
+        if history_path.exists():
+            architectures = {name: _architectures(graph.targets[name], arguments) for name in names}
+            build_times = BuildHistory(history_path).estimates(architectures)
+
+        source_path = Path(arguments.source_path or self.root_path / 'source')
+        nodes = describe(graph, names, build_times, source_path)
+        print(format_json(nodes) if arguments.graph == 'json' else format_dot(nodes))
+
+
+class _Build:  # pylint: disable=too-many-instance-attributes
+    # Builds target with its prerequisites, each of them is built by separate build script process
+
+    def __init__(self, arguments, graph: TargetGraph, root_path: Path, cache_path: Path, child_args: list):
+        self.arguments = arguments
+        self.graph = graph
+        self.root_path = root_path
+        self.deps_path = root_path / 'deps'
+        self.log_path = Path(arguments.build_path or root_path / 'build')
+        self.source_path = Path(arguments.source_path or root_path / 'source')
+
+        # Dependencies are always built without Xcode, only the requested target may generate Xcode project
+        # Thus, dependencies built by normal run are reused by Xcode one, and vice versa
+        self.child_args = child_args
+        self.dependency_args = _strip_arguments(child_args, {'--xcode': 0})
+
+        self.cache = BuildCache(cache_path, arguments.build_cache_size * 1024 ** 3) if arguments.build_cache else None
+        self.history = BuildHistory(cache_path / 'history.sqlite3')
+        self.store = _archive_store(arguments)
+
+        self.environment = None
+        # Nodes that take job slots from jobserver on their own
+        self.shared = set()
+        self.fingerprints = {}
+        self.spans = {}
+
+        # Scheduled nodes mapped to target name and architectures, merge node of split target has no architecture
+        self.nodes = {}
+        # Source archives of targets split into per-architecture nodes
+        self.split = {}
+
+    def run(self, fingerprinter: Fingerprinter):
+        arguments = self.arguments
+        with_prerequisites = arguments.parallel or arguments.changed_only or arguments.jobserver or arguments.xcode
+        names = self.graph.closure(arguments.target) if with_prerequisites else [arguments.target]
+
+        for name in names:
+            target = self.graph.targets[name]
+
+            # Xcode project of the requested target is always generated, and it does not install anything
+            if target.destination == target.DESTINATION_DEPS and not self._is_xcode(name):
+                self.fingerprints[name] = fingerprinter.fingerprint(name)
+
+        # Xcode project generation needs only installed dependencies, so only ones with stale fingerprints are rebuilt
+        # Plain build of the target records no fingerprints for its dependencies, and it does not install
+        # build-only prerequisites to deps directory, thus neither of them is rebuilt because of missing files
+        if arguments.changed_only or arguments.xcode:
+            recorded = {name: read_fingerprint(self.deps_path / name) for name in names}
+            names = self.graph.changed(names, self.fingerprints, recorded, stale_only=arguments.xcode)
+
+            if not names:
+                print('All targets are up-to-date')
+                return
+
+        if arguments.prefetch:
+            self._prefetch()
+
+        os.makedirs(self.log_path, exist_ok=True)
+        jobs = int(arguments.jobs) if getattr(arguments, 'jobs', None) else os.cpu_count()
+
+        if self.cache:
+            names = self._restore(names, jobs)
+
+        prerequisites = self._schedule_nodes(names)
+
+        if not prerequisites:
+            print(f'Nothing to build for {arguments.target}')
+            return
+
+        if self.split:
+            self._download_split()
+
+        scheduler = self._scheduler(prerequisites, jobs)
+        jobserver = self._start_jobserver(jobs)
+
+        try:
+            scheduler.run(self._build_timed, jobserver, self.shared)
+        finally:
+            if jobserver:
+                jobserver.close()
+
+            if arguments.trace:
+                self._write_trace(prerequisites)
+
+    def _is_xcode(self, name: str) -> bool:
+        return self.arguments.xcode and name == self.arguments.target
+
+    def _prefetch(self):
+        downloads = []
+
+        for name in self.graph.closure(self.arguments.target):
+            sources = record_sources(self.graph.targets[name])
+
+            if not sources:
+                continue
+
+            # Put archives to the same place where build state looks for already downloaded ones
+            for archive in sources.archives:
+                path = self.source_path / name / archive_filename(archive.url)
+                downloads.append((archive.url, archive.checksum, path))
+
+        # Build state skips unpacking of source archive when its directory already exists
+        print(f'Prefetching {len(downloads)} source archive(s)')
+        prefetch(downloads, self.arguments.prefetch_jobs, extract=True, store=self.store)
+
+    def _restore(self, names: list, jobs: int) -> list:
+        # Restored targets are not scheduled at all, so split ones do not start their per-architecture builds
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            restored = list(executor.map(self._restore_target, names))
+
+        return [name for name, is_restored in zip(names, restored) if not is_restored]
+
+    def _restore_target(self, name: str) -> bool:
+        fingerprint = self.fingerprints.get(name)
+
+        if fingerprint and self.cache.restore(name, fingerprint, self.deps_path / name):
+            print(f'Restored {name} from build cache')
+            return True
+
+        return False
+
+    def _schedule_nodes(self, names: list) -> dict:
+        # Returns prerequisites of every node, split target is built by a node per architecture and merge node
+        prerequisites = {}
+
+        for name in names:
+            target = self.graph.targets[name]
+
+            if _is_meta(target):
+                continue
+
+            architecture = _architectures(target, self.arguments)
+
+            if self._is_split(name, architecture):
+                architecture_nodes = tuple(f'{name}:{split}' for split in _SPLIT_ARCHITECTURES)
+
+                for node, node_architecture in zip(architecture_nodes, _SPLIT_ARCHITECTURES):
+                    self.nodes[node] = (name, node_architecture)
+                    prerequisites[node] = self._prerequisites(name)
+
+                self.nodes[name] = (name, None)
+                prerequisites[name] = architecture_nodes
+            else:
+                self.nodes[name] = (name, architecture)
+                prerequisites[name] = self._prerequisites(name)
+
+        return prerequisites
+
+    def _prerequisites(self, name: str) -> tuple:
+        # Meta targets are not scheduled, so their dependents depend on their prerequisites directly
+        result = set()
+
+        for prerequisite in self.graph.prerequisites[name]:
+            if _is_meta(self.graph.targets[prerequisite]):
+                result.update(self._prerequisites(prerequisite))
+            else:
+                result.add(prerequisite)
+
+        return tuple(sorted(result))
+
+    def _is_split(self, name: str, architecture: str) -> bool:
+        # Only dependencies are split, their installation is merged into universal binaries by driver
+        if not self.arguments.parallel_arch or name not in self.fingerprints \
+                or architecture != '+'.join(_SPLIT_ARCHITECTURES):
+            return False
+
+        # Each architecture is built from its own copy of sources, Git checkouts are not copied
+        sources = record_sources(self.graph.targets[name])
+
+        if not sources or sources.repositories:
+            return False
+
+        self.split[name] = sources.archives
+        return True
+
+    def _download_split(self):
+        # Download archives of split targets once, copies of them are unpacked by per-architecture builds
+        downloads = []
+
+        for name, archives in self.split.items():
+            for archive in archives:
+                path = self.source_path / name / archive_filename(archive.url)
+                downloads.append((archive.url, archive.checksum, path))
+
+        prefetch(downloads, self.arguments.prefetch_jobs, store=self.store)
+
+    def _scheduler(self, prerequisites: dict, jobs: int) -> Scheduler:
+        durations = {}
+
+        for node in prerequisites:
+            name, architecture = self.nodes[node]
+            duration = self.history.estimate(name, architecture) if architecture else None
+
+            if duration is not None:
+                durations[node] = duration
+
+        scheduler = Scheduler(prerequisites, jobs, durations)
+
+        print(f'Building {len(prerequisites)} target(s) using {jobs} job(s): ' + ', '.join(prerequisites))
+
+        if durations:
+            minutes, seconds = divmod(round(scheduler.estimate()), 60)
+            print(f'Estimated build time is {minutes}:{seconds:02} based on previous builds '
+                  f'of {len(durations)} target(s)')
+
+        return scheduler
+
+    def _start_jobserver(self, jobs: int) -> typing.Optional[JobServer]:
+        if not self.arguments.jobserver:
+            return None
+
+        if not is_jobserver_supported():
+            print('Warning: jobserver is disabled because make found in PATH is not GNU Make 4.4 or newer, '
+                  'each target will use its own job slots')
+            return None
+
+        jobserver = JobServer(jobs)
+        self.environment = jobserver.environment(os.environ)
+        self.shared = {node for node, (name, _) in self.nodes.items()
+                       if getattr(self.graph.targets[name], 'jobserver', False)}
+        return jobserver
+
+    def _build_timed(self, node: str, jobs: int):
+        start = time.time()
+
+        try:
+            self._build_target(node, jobs)
+        finally:
+            self.spans[node] = (start, time.time())
+
+    def _build_target(self, node: str, jobs: int):
+        name, _ = self.nodes[node]
+
+        if node != name:
+            self._build_architecture(node, jobs)
+            return
+
+        install_path = self.deps_path / name
+
+        if name in self.split:
+            print(f'Merging {name} into universal binaries')
+            install_paths = [self._split_path(split_architecture) / 'install' / name
+                             for split_architecture in _SPLIT_ARCHITECTURES]
+            universal.merge(install_paths, install_path)
+        else:
+            self._run_child(node, jobs, self.child_args if self._is_xcode(name) else self.dependency_args)
+
+        fingerprint = self.fingerprints.get(name)
+
+        if fingerprint:
+            write_fingerprint(install_path, fingerprint)
+
+            if self.cache:
+                self.cache.store(name, fingerprint, install_path)
+
+        print(f'Built {name}')
+
+    def _split_path(self, architecture: str) -> Path:
+        return self.log_path / architecture
+
+    def _build_architecture(self, node: str, jobs: int):
+        name, architecture = self.nodes[node]
+        split_path = self._split_path(architecture)
+
+        # Source archives are never modified in place, so hard links are fine
+        for archive in self.split[name]:
+            filename = archive_filename(archive.url)
+            path = split_path / 'source' / name / filename
+
+            if not path.exists():
+                os.makedirs(path.parent, exist_ok=True)
+                hardcopy(self.source_path / name / filename, path, link=True)
+
+        disabled = '--disable-x64' if architecture == 'arm64' else '--disable-arm'
+        args = (*_strip_arguments(self.dependency_args, {'--build-path': 1, '--source-path': 1}), disabled,
+                '--build-path', str(split_path / 'build'), '--source-path', str(split_path / 'source'))
+        self._run_child(node, jobs, args, {_INSTALL_VARIABLE: str(split_path / 'install' / name)})
+        print(f'Built {node}')
+
+    def _run_child(self, node: str, jobs: int, args, environment: typing.Optional[dict] = None):
+        name, architecture = self.nodes[node]
+        command = [sys.executable, self.root_path / 'build.py', *args, '--target', name]
+        # Job slots are taken from jobserver, explicit job count would make GNU make to ignore it
+        command += [] if node in self.shared else ['--jobs', str(jobs)]
+        log_file = self.log_path / f'{_file_stem(node)}.log'
+
+        if self.arguments.trace:
+            trace_file = self.log_path / f'{_file_stem(node)}.trace.json'
+            trace_file.unlink(missing_ok=True)
+            command += ['--trace', trace_file]
+
+        slots = 'jobserver slots' if node in self.shared else f'{jobs} job(s)'
+        print(f'Building {node} with {slots}, see {log_file}')
+        start = time.time()
+
+        with open(log_file, 'w', encoding='utf-8') as log:
+            subprocess.run(command, check=True, stdout=log, stderr=subprocess.STDOUT,
+                           env={**(self.environment or os.environ), **(environment or {}), _CHILD_VARIABLE: '1'})
+
+        if not self._is_xcode(name):
+            self.history.record(name, architecture, jobs, time.time() - start)
+
+    def _write_trace(self, prerequisites: dict):
+        path = Path(self.arguments.trace)
+        spans = self.spans
+        tracer = Tracer()
+        tracer.name_process('build.py')
+        phases = {}
+
+        for index, node in enumerate(prerequisites, start=1):
+            if node not in spans:
+                continue
+
+            # Each target gets its own row in driver process
+            tracer.add(node, 'target', *spans[node], tid=index)
+            trace_file = self.log_path / f'{_file_stem(node)}.trace.json'
+
+            if trace_file.exists():
+                phases[node] = _merge_trace(tracer, node, self.nodes[node][0], read_events(trace_file))
+
+        tracer.write(path)
+
+        path_names = critical_path(prerequisites, spans)
+        total = spans[path_names[-1]][1] - min(start for start, _ in spans.values()) if path_names else 0
+        print(f'Critical path takes {total:.1f} seconds, see {path} for details')
+
+        for node in path_names:
+            start, end = spans[node]
+            details = ', '.join(f'{phase} {duration:.1f}' for phase, duration in phases.get(node, {}).items())
+            print(f'  {node}: {end - start:.1f}' + (f' ({details})' if details else ''))
+
+
+def _is_meta(target) -> bool:
+    # Target that only groups its prerequisites, like GCC matrix one, has nothing to build by itself
+    return all(getattr(type(target), phase, None) is getattr(base.Target, phase)
+               for phase in ('prepare_source', 'configure', 'build', 'post_build'))
+
+
+def _merge_trace(tracer: Tracer, process: str, name: str, events: list) -> dict:
+    # Adds events of child build to the trace, and returns durations of target phases
+    phases = {}
+
+    if events:
+        tracer.name_process(process, events[0]['pid'])
+
+    for event in events:
+        tracer.events.append(event)
+
+        if event['cat'] == 'phase' and event['args'].get('target') == name:
+            phases[event['name']] = phases.get(event['name'], 0) + event['dur'] / 1_000_000
+
+    return phases
+
+
+def _archive_store(arguments) -> typing.Optional[ArchiveStore]:
+    if not arguments.archive_store:
+        return None
+
+    return ArchiveStore(Path(arguments.archive_store), arguments.archive_store_size * 1024 ** 3)
+
+
+def _file_stem(node: str) -> str:
+    # Per-architecture node like usb:arm64 has log file named usb.arm64.log
+    return node.replace(':', '.')
+
+
+def _redirect_install(targets, name: str, install_path: Path):
+    # Per-architecture build of split target installs to its own directory, driver merges them afterwards
+    def prepare_source(target, method, state):
+        if target.name == name:
+            state.install_path = install_path
+
+        method(state)
+
+    hooks.wrap_method(targets, 'prepare_source', prepare_source, lambda target: target.name == name)
+
+
+def _architectures(target, arguments) -> str:
+    if not target.multi_platform:
+        return 'host'
+
+    architectures = []
+
+    if not getattr(arguments, 'disable_arm', False):
+        architectures.append('arm64')
+
+    if not getattr(arguments, 'disable_x64', False):
+        architectures.append('x86_64')
+
+    return '+'.join(architectures)
+
+
+def _strip_arguments(args: list, *options) -> list:
+    stripped = {}
+
+    for option in options:
+        stripped.update(option)
+
+    result = []
+    skip = 0
+
+    for arg in args:
+        if skip:
+            skip -= 1
+            continue
+
+        name = arg.split('=', 1)[0]
+
+        if name in stripped:
+            skip = 0 if '=' in arg else stripped[name]
+        else:
+            result.append(arg)
+
+    return result
@@ -0,0 +1,154 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import ast
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sys
+import typing
+from pathlib import Path
+
+import aedi
+
+from .graph import TargetGraph
+from .source import record_sources
+
+# Fingerprint of the last successful build, stored inside installed dependency
+FINGERPRINT_FILENAME = '.fingerprint'
+
+# Environment variables that affect compilation of all targets
+_ENVIRONMENT = (
+    'CFLAGS',
+    'CPPFLAGS',
+    'CXXFLAGS',
+    'DEVELOPER_DIR',
+    'LDFLAGS',
+    'MACOSX_DEPLOYMENT_TARGET',
+    'SDKROOT',
+)
+
+
+class Fingerprinter:
+    def __init__(self, graph: TargetGraph, patch_path: Path, arguments: list):
+        self.graph = graph
+        self.patch_path = patch_path
+
+        # Build settings shared by all targets, i.e. command line arguments, environment, and aedi core
+        common = {
+            'arguments': arguments,
+            'core': self._hash_core(),
+            'environment': {name: os.environ.get(name) for name in _ENVIRONMENT},
+        }
+        self._common = json.dumps(common, sort_keys=True)
+        self._fingerprints = {}
+
+    def fingerprint(self, name: str) -> typing.Optional[str]:
+        if name in self._fingerprints:
+            return self._fingerprints[name]
+
+        inputs = self._inputs(name)
+        result = None
+
+        if inputs is not None:
+            data = json.dumps(inputs, sort_keys=True).encode()
+            result = hashlib.sha256(data).hexdigest()
+
+        self._fingerprints[name] = result
+        return result
+
+    def _inputs(self, name: str) -> typing.Optional[dict]:
+        target = self.graph.targets[name]
+        sources = record_sources(target)
+
+        if not sources or any(not commit for _, _, commit in sources.repositories):
+            # Sources are fetched in some custom way, or from Git branch which can be changed at any time
+            return None
+
+        prerequisites = {}
+
+        for prerequisite in self.graph.prerequisites[name]:
+            fingerprint = self.fingerprint(prerequisite)
+
+            if not fingerprint:
+                return None
+
+            prerequisites[prerequisite] = fingerprint
+
+        archives = []
+
+        for archive in sources.archives:
+            patches = {patch: self._hash_file(self.patch_path / f'{patch}.diff') for patch in archive.patches}
+            archives.append({'url': archive.url, 'checksum': archive.checksum, 'patches': patches})
+
+        repositories = [{'url': url, 'commit': commit} for url, _, commit in sources.repositories]
+
+        return {
+            'archives': archives,
+            'repositories': repositories,
+            'code': self._target_code(target),
+            'common': self._common,
+            'prerequisites': prerequisites,
+        }
+
+    @staticmethod
+    def _target_code(target) -> str:
+        # Source code of all classes from this repository, i.e. options they set, steps they override, etc.
+        code = []
+
+        for cls in type(target).__mro__:
+            if cls.__module__.startswith('target.'):
+                code.append(_module_code(cls.__module__))
+                code.append(inspect.getsource(cls))
+
+        return '\n'.join(code)
+
+    @staticmethod
+    def _hash_core() -> str:
+        hasher = hashlib.sha256()
+        core_path = Path(aedi.__file__).parent
+
+        for path in sorted(core_path.glob('**/*.py')):
+            hasher.update(str(path.relative_to(core_path)).encode())
+            hasher.update(path.read_bytes())
+
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _module_code(name: str) -> str:
+    # Module level code used by target classes, i.e. constants and helper functions, but not imports or other classes
+    source = inspect.getsource(sys.modules[name])
+    skipped = (ast.ClassDef, ast.Import, ast.ImportFrom)
+    return '\n'.join(ast.get_source_segment(source, node) for node in ast.parse(source).body
+                     if not isinstance(node, skipped))
+
+
+def read_fingerprint(install_path: Path) -> typing.Optional[str]:
+    path = install_path / FINGERPRINT_FILENAME
+    return path.read_text().strip() if path.exists() else None
+
+
+def write_fingerprint(install_path: Path, fingerprint: str):
+    (install_path / FINGERPRINT_FILENAME).write_text(fingerprint + '\n')
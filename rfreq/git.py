@@ -0,0 +1,101 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import fcntl
+import os
+import re
+import subprocess
+import typing
+from pathlib import Path
+
+from aedi.state import BuildState
+
+
+def checkout(state: BuildState, url: str, revision: typing.Optional[str] = None,
+             commit: typing.Optional[str] = None, submodules: bool = False):
+    # Stand-in of build state, like recorder of target sources, can handle checkout on its own
+    checkout_hook = getattr(state, 'checkout_git_revision', None)
+
+    if checkout_hook:
+        checkout_hook(url, revision, commit)
+        return
+
+    # Sources specified by user are used as is
+    if getattr(state, 'external_source', False):
+        return
+
+    environment = state.environment
+
+    def git(*args, cwd=state.source, check=True, **kwargs):
+        return subprocess.run(('git', *args), check=check, cwd=cwd, env=environment, **kwargs)
+
+    mirrors_path = state.arguments.git_mirrors
+
+    if not state.source.exists():
+        if mirrors_path:
+            mirror = _update_mirror(Path(mirrors_path), url, environment)
+            # Objects are copied from local mirror, so nothing but new commits is transferred
+            # Checkout does not depend on mirror afterwards, thus it can be pruned or removed at any time
+            git('clone', '--reference', mirror, '--dissociate', url, state.source, cwd=None)
+        else:
+            # Fetch history without file contents, blobs are downloaded on demand for checked out revision only
+            git('clone', '--filter=blob:none', url, state.source, cwd=None)
+    elif revision or commit:
+        # Existing checkout may have been made for previously pinned revision, fetch the new one if needed
+        pinned = _resolve(git, revision or commit)
+
+        if not pinned or (commit and pinned != commit):
+            remote = _update_mirror(Path(mirrors_path), url, environment) if mirrors_path else 'origin'
+            git('fetch', '--tags', '--force', remote, '+refs/heads/*:refs/remotes/origin/*')
+
+    if revision:
+        git('checkout', revision)
+
+    if submodules:
+        git('submodule', 'update', '--init', '--recursive', '--jobs', str(state.jobs))
+
+    if commit:
+        head_run = git('rev-parse', 'HEAD', stdout=subprocess.PIPE)
+        head_output = head_run.stdout.decode('ascii').strip()
+
+        if head_output != commit:
+            raise RuntimeError(f'Commit of {url} does not match with {revision or "expected one"}')
+
+
+def _resolve(git: typing.Callable, revision: str) -> typing.Optional[str]:
+    run = git('rev-parse', '--verify', '--quiet', f'{revision}^{{commit}}', stdout=subprocess.PIPE, check=False)
+    return run.stdout.decode('ascii').strip() if run.returncode == 0 else None
+
+
+def _update_mirror(mirrors_path: Path, url: str, environment: dict) -> Path:
+    name = re.sub(r'^\w+://', '', url).replace(':', '/').strip('/')
+    mirror = mirrors_path / name
+    os.makedirs(mirror.parent, exist_ok=True)
+
+    # Mirror can be used by several builds at the same time
+    with open(mirror.parent / f'{mirror.name}.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+
+        if mirror.exists():
+            args = ('git', 'remote', 'update', '--prune')
+            subprocess.run(args, check=True, cwd=mirror, env=environment)
+        else:
+            args = ('git', 'clone', '--mirror', url, mirror)
+            subprocess.run(args, check=True, env=environment)
+
+    return mirror
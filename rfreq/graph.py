@@ -0,0 +1,158 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from pathlib import Path
+
+from . import macho
+
+
+class TargetGraph:
+    def __init__(self, targets, deps_path: Path, linked: bool = False):
+        self.targets = {target.name: target for target in targets}
+        self.prerequisites = {}
+
+        # Shared libraries of installed dependencies reveal prerequisites that targets may not declare
+        linked_providers = self._linked_providers(deps_path) if linked else {}
+
+        for name, target in self.targets.items():
+            prerequisites = target.prerequisites or ()
+
+            if isinstance(prerequisites, str):
+                prerequisites = (prerequisites,)
+
+            prerequisites += tuple(provider for provider in linked_providers.get(name, ()) if provider in self.targets)
+
+            self.prerequisites[name] = tuple(sorted(set(prerequisites)))
+
+    @staticmethod
+    def _library_providers(deps_path: Path) -> dict:
+        providers = {}
+
+        for library in deps_path.glob('*/lib/*.dylib'):
+            providers[library.name] = library.parent.parent.name
+
+        return providers
+
+    @staticmethod
+    def _linked_providers(deps_path: Path) -> dict:
+        # Targets providing shared libraries that installed libraries of each target are linked with
+        providers = TargetGraph._library_providers(deps_path)
+        result = {}
+
+        for library in deps_path.glob('*/lib/*.dylib'):
+            if library.is_symlink():
+                continue
+
+            name = library.parent.parent.name
+
+            for image in macho.read(library):
+                for dependency in image.dependencies:
+                    provider = providers.get(dependency.rsplit('/', 1)[-1])
+
+                    if provider and provider != name:
+                        result.setdefault(name, set()).add(provider)
+
+        return result
+
+    def dependents(self) -> dict:
+        result = {name: [] for name in self.targets}
+
+        for name, prerequisites in self.prerequisites.items():
+            for prerequisite in prerequisites:
+                if prerequisite in result:
+                    result[prerequisite].append(name)
+
+        return result
+
+    def changed(self, names: list, fingerprints: dict, recorded: dict, stale_only: bool = False) -> list:
+        # Targets with fingerprints different from recorded ones, and all targets depending on them
+        # Target without recorded fingerprint is changed too, unless only stale fingerprints are taken into account
+        changed = set()
+
+        for name in names:
+            fingerprint = fingerprints.get(name)
+            recorded_fingerprint = recorded.get(name)
+
+            # Targets without fingerprint, like main ones, are always considered as changed
+            if not fingerprint:
+                changed.add(name)
+            elif recorded_fingerprint:
+                if fingerprint != recorded_fingerprint:
+                    changed.add(name)
+            elif not stale_only:
+                changed.add(name)
+
+        # Add everything that depends on changed targets, directly or indirectly
+        dependents = self.dependents()
+        queue = list(changed)
+
+        while queue:
+            for dependent in dependents[queue.pop()]:
+                if dependent in names and dependent not in changed:
+                    changed.add(dependent)
+                    queue.append(dependent)
+
+        return [name for name in names if name in changed]
+
+    def closure(self, *names) -> list:
+        # Given targets and all their prerequisites in build order
+        result = []
+        visiting = set()
+        visited = set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+
+            if name in visiting:
+                raise RuntimeError(f'Circular dependency on target {name}')
+
+            if name not in self.targets:
+                raise RuntimeError(f'Unknown target {name}')
+
+            visiting.add(name)
+
+            for prerequisite in self.prerequisites[name]:
+                visit(prerequisite)
+
+            visiting.remove(name)
+            visited.add(name)
+            result.append(name)
+
+        for name in names:
+            visit(name)
+
+        return result
+
+    def reverse_closure(self, *names) -> list:
+        # Given targets and all targets depending on them, directly or indirectly, in build order
+        dependents = self.dependents()
+        found = set()
+        queue = list(names)
+
+        while queue:
+            name = queue.pop()
+
+            if name not in self.targets:
+                raise RuntimeError(f'Unknown target {name}')
+
+            if name not in found:
+                found.add(name)
+                queue += dependents[name]
+
+        return [name for name in self.closure(*sorted(found)) if name in found]
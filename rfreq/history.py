@@ -0,0 +1,76 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import contextlib
+import os
+import sqlite3
+import statistics
+import time
+import typing
+from pathlib import Path
+
+
+class BuildHistory:
+    # Durations of completed builds, per target and per set of architectures it was built for
+
+    # Number of recent builds to estimate duration from
+    SAMPLES = 5
+
+    def __init__(self, path: Path):
+        self.path = path
+
+        os.makedirs(path.parent, exist_ok=True)
+
+        with self._connect() as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS builds ('
+                               'target TEXT NOT NULL, architecture TEXT NOT NULL, jobs INTEGER NOT NULL, '
+                               'duration REAL NOT NULL, finished REAL NOT NULL)')
+            connection.execute('CREATE INDEX IF NOT EXISTS builds_target ON builds (target, architecture)')
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # Builds are recorded from several threads, so every operation uses its own connection
+        with contextlib.closing(sqlite3.connect(self.path, timeout=60)) as connection:
+            # Connection as context manager commits or rolls back transaction, but does not close it
+            with connection:
+                yield connection
+
+    def record(self, target: str, architecture: str, jobs: int, duration: float):
+        with self._connect() as connection:
+            connection.execute('INSERT INTO builds VALUES (?, ?, ?, ?, ?)',
+                               (target, architecture, jobs, duration, time.time()))
+
+    def estimate(self, target: str, architecture: str) -> typing.Optional[float]:
+        with self._connect() as connection:
+            rows = connection.execute('SELECT duration FROM builds WHERE target = ? AND architecture = ? '
+                                      'ORDER BY finished DESC LIMIT ?',
+                                      (target, architecture, self.SAMPLES)).fetchall()
+
+        return statistics.median(row[0] for row in rows) if rows else None
+
+    def estimates(self, targets: dict) -> dict:
+        # targets maps target name to architecture, only targets with known history are returned
+        result = {}
+
+        for target, architecture in targets.items():
+            duration = self.estimate(target, architecture)
+
+            if duration is not None:
+                result[target] = duration
+
+        return result
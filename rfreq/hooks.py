@@ -0,0 +1,57 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import functools
+import threading
+import typing
+
+_active = threading.local()
+
+
+def wrap_method(targets, name: str, hook: typing.Callable, predicate: typing.Optional[typing.Callable] = None):
+    # Calls hook(target, method, *args, **kwargs) instead of given method of targets
+    # Methods are replaced in target classes, so copies of targets and their other instances are handled as well
+    key = object()
+    classes = {type(target) for target in targets if not predicate or predicate(target)}
+
+    for cls in classes:
+        method = getattr(cls, name, None)
+
+        if method:
+            setattr(cls, name, _wrap(key, name, hook, method))
+
+
+def _wrap(key: object, name: str, hook: typing.Callable, method: typing.Callable) -> typing.Callable:
+    @functools.wraps(method)
+    def wrapper(target, *args, **kwargs):
+        active = _active.__dict__.setdefault('calls', set())
+        call = (key, id(target), name)
+
+        if call in active:
+            # Method of wrapped base class is called from wrapped subclass, the hook is already running
+            return method(target, *args, **kwargs)
+
+        active.add(call)
+
+        try:
+            return hook(target, functools.partial(method, target), *args, **kwargs)
+        finally:
+            active.remove(call)
+
+    return wrapper
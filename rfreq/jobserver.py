@@ -0,0 +1,99 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+from aedi.state import BuildState
+
+_AUTH_OPTION = '--jobserver-auth=fifo:'
+
+
+def _make_version(make: str) -> tuple:
+    try:
+        output = subprocess.run((make, '--version'), check=True, capture_output=True, text=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return ()
+
+    match = re.match(r'GNU Make (\d+)\.(\d+)', output)
+    return tuple(int(part) for part in match.groups()) if match else ()
+
+
+def is_supported(make: str = 'make') -> bool:
+    # Named pipe jobserver was added in GNU Make 4.4, macOS comes with 3.81 that supports only inherited descriptors
+    path = shutil.which(make)
+    return bool(path) and _make_version(path) >= (4, 4)
+
+
+class JobServer:
+    # Implements server side of GNU make jobserver protocol
+    # Every client has one implicit job slot, and takes additional ones from the pipe, which is filled with tokens
+    # Driver acquires a token for implicit slot of each client, so the pipe holds tokens for all jobs
+
+    def __init__(self, jobs: int):
+        self.jobs = jobs
+        self.temp_path = Path(tempfile.mkdtemp(prefix='rfreq-jobserver-'))
+        self.path = self.temp_path / 'fifo'
+
+        os.mkfifo(self.path, 0o600)
+
+        # Keep the pipe open for reading too, otherwise it disappears when the last client closes it
+        self.descriptor = os.open(self.path, os.O_RDWR | os.O_NONBLOCK)
+        self.release(jobs)
+
+    def environment(self, environment: dict) -> dict:
+        makeflags = environment.get('MAKEFLAGS', '')
+        makeflags = f'{makeflags} -j{self.jobs} {_AUTH_OPTION}{self.path}'.strip()
+        return dict(environment, MAKEFLAGS=makeflags)
+
+    def acquire(self, count: int) -> int:
+        # Returns number of taken tokens, it can be less than requested one, down to zero
+        try:
+            return len(os.read(self.descriptor, count))
+        except BlockingIOError:
+            return 0
+
+    def release(self, count: int):
+        os.write(self.descriptor, b'+' * count)
+
+    def close(self):
+        os.close(self.descriptor)
+        shutil.rmtree(self.temp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def make_jobs(state: BuildState) -> tuple:
+    # Returns job count arguments for make, none when it should take job slots from jobserver of parent build
+    # Explicit --jobs option makes GNU make to ignore inherited jobserver and to start its own
+    makeflags = os.environ.get('MAKEFLAGS', '')
+
+    if _AUTH_OPTION in makeflags:
+        # Build environment may not pass inherited variables through
+        state.environment['MAKEFLAGS'] = makeflags
+        return ()
+
+    return '--jobs', state.jobs
@@ -0,0 +1,229 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import mmap
+import os
+import struct
+import typing
+from pathlib import Path
+
+_FAT_MAGIC = 0xcafebabe
+_FAT_MAGIC_64 = 0xcafebabf
+_MH_MAGIC = 0xfeedface
+_MH_MAGIC_64 = 0xfeedfacf
+
+_LC_REQ_DYLD = 0x80000000
+_LC_LOAD_DYLIB = 0xc
+_LC_ID_DYLIB = 0xd
+_LC_LOAD_WEAK_DYLIB = 0x18 | _LC_REQ_DYLD
+_LC_RPATH = 0x1c | _LC_REQ_DYLD
+_LC_REEXPORT_DYLIB = 0x1f | _LC_REQ_DYLD
+_LC_LAZY_LOAD_DYLIB = 0x20
+_LC_LOAD_UPWARD_DYLIB = 0x23 | _LC_REQ_DYLD
+_LC_VERSION_MIN_MACOSX = 0x24
+_LC_BUILD_VERSION = 0x32
+
+_DEPENDENCY_COMMANDS = (
+    _LC_LOAD_DYLIB,
+    _LC_LOAD_WEAK_DYLIB,
+    _LC_REEXPORT_DYLIB,
+    _LC_LAZY_LOAD_DYLIB,
+    _LC_LOAD_UPWARD_DYLIB,
+)
+
+# Libraries that come with operating system
+_SYSTEM_PREFIXES = ('/usr/lib/', '/System/')
+
+_ARCHITECTURES = {
+    0x7: 'i386',
+    0xc: 'arm',
+    0x01000007: 'x86_64',
+    0x0100000c: 'arm64',
+}
+
+
+class MachOImage:
+    # Single architecture image of Mach-O file
+
+    def __init__(self, architecture: str, filetype: int):
+        # File type is zero for static library
+        self.architecture = architecture
+        self.filetype = filetype
+        self.load_commands = []
+        self.install_name: typing.Optional[str] = None
+        self.dependencies = []
+        self.rpaths = []
+        self.min_os_version: typing.Optional[str] = None
+
+
+def _architecture(cputype: int, cpusubtype: int) -> str:
+    architecture = _ARCHITECTURES.get(cputype, f'cpu{cputype:#x}')
+
+    if architecture == 'arm64' and (cpusubtype & 0xff) == 2:
+        architecture = 'arm64e'
+
+    return architecture
+
+
+def _read_string(data, offset: int, end: int) -> str:
+    terminator = data.find(b'\0', offset, end)
+    return data[offset:terminator if terminator != -1 else end].decode()
+
+
+def _read_version(version: int) -> str:
+    return f'{version >> 16}.{(version >> 8) & 0xff}.{version & 0xff}'
+
+
+def _read_image(data, offset: int) -> MachOImage:
+    magic = struct.unpack_from('<I', data, offset)[0]
+
+    if magic in (_MH_MAGIC, _MH_MAGIC_64):
+        order = '<'
+    else:
+        order = '>'
+        magic = struct.unpack_from('>I', data, offset)[0]
+
+        if magic not in (_MH_MAGIC, _MH_MAGIC_64):
+            raise ValueError(f'Unknown Mach-O magic {magic:#x}')
+
+    cputype, cpusubtype, filetype, ncmds, _, _ = struct.unpack_from(order + '6I', data, offset + 4)
+    image = MachOImage(_architecture(cputype, cpusubtype), filetype)
+    command_offset = offset + (32 if magic == _MH_MAGIC_64 else 28)
+
+    for _ in range(ncmds):
+        cmd, cmdsize = struct.unpack_from(order + '2I', data, command_offset)
+        end = command_offset + cmdsize
+        image.load_commands.append((cmd, command_offset, cmdsize))
+
+        if cmd in _DEPENDENCY_COMMANDS or cmd == _LC_ID_DYLIB:
+            name_offset = struct.unpack_from(order + 'I', data, command_offset + 8)[0]
+            name = _read_string(data, command_offset + name_offset, end)
+
+            if cmd == _LC_ID_DYLIB:
+                image.install_name = name
+            else:
+                image.dependencies.append(name)
+        elif cmd == _LC_RPATH:
+            path_offset = struct.unpack_from(order + 'I', data, command_offset + 8)[0]
+            image.rpaths.append(_read_string(data, command_offset + path_offset, end))
+        elif cmd == _LC_BUILD_VERSION:
+            minos = struct.unpack_from(order + 'I', data, command_offset + 12)[0]
+            image.min_os_version = _read_version(minos)
+        elif cmd == _LC_VERSION_MIN_MACOSX:
+            version = struct.unpack_from(order + 'I', data, command_offset + 8)[0]
+            image.min_os_version = _read_version(version)
+
+        command_offset = end
+
+    return image
+
+
+def _read_images(data) -> list:
+    magic = struct.unpack_from('>I', data)[0]
+
+    if magic not in (_FAT_MAGIC, _FAT_MAGIC_64):
+        return [_read_image(data, 0)]
+
+    count = struct.unpack_from('>I', data, 4)[0]
+    images = []
+
+    for index in range(count):
+        if magic == _FAT_MAGIC:
+            cputype, cpusubtype, offset = struct.unpack_from('>3I', data, 8 + index * 20)
+        else:
+            cputype, cpusubtype, offset = struct.unpack_from('>2IQ', data, 8 + index * 32)
+
+        if data[offset:offset + 8] == b'!<arch>\n':
+            # Static library slice has no load commands
+            images.append(MachOImage(_architecture(cputype, cpusubtype), 0))
+        else:
+            images.append(_read_image(data, offset))
+
+    return images
+
+
+def is_macho(path: Path) -> bool:
+    with open(path, 'rb') as f:
+        header = f.read(4)
+
+    if len(header) < 4:
+        return False
+
+    # Java class files share magic with fat binaries, but there is no need to distinguish them here
+    magics = (_FAT_MAGIC, _FAT_MAGIC_64, _MH_MAGIC, _MH_MAGIC_64)
+    return struct.unpack('>I', header)[0] in magics or struct.unpack('<I', header)[0] in magics
+
+
+def read(path: Path) -> list:
+    # Returns images of all architectures stored in Mach-O file
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return _read_images(data)
+
+
+def _find_library(dependency: str, search_paths: tuple) -> typing.Optional[Path]:
+    name = dependency.rsplit('/', 1)[-1]
+
+    if not dependency.startswith('@'):
+        # Library with absolute path is taken only when it is one of libraries from search paths
+        # Other ones, like SDRplay API, are installed separately and must be loaded from their locations
+        real_paths = {os.path.realpath(search_path) for search_path in search_paths}
+        directory = os.path.dirname(dependency)
+
+        if os.path.realpath(directory) not in real_paths \
+                and os.path.dirname(os.path.realpath(dependency)) not in real_paths:
+            return None
+
+    for search_path in search_paths:
+        path = search_path / name
+
+        if path.exists():
+            return path
+
+    if dependency.startswith('@'):
+        raise FileNotFoundError(f'Unable to find {dependency}')
+
+    return None
+
+
+def library_closure(binaries: list, search_paths: tuple) -> dict:
+    # Returns libraries referenced by given binaries directly or indirectly, mapped from their names to paths
+    # Libraries referenced relatively, e.g. via @rpath, are looked up by name in search paths
+    libraries = {}
+    pending = list(binaries)
+
+    while pending:
+        binary = pending.pop()
+
+        for image in read(binary):
+            for dependency in image.dependencies:
+                name = dependency.rsplit('/', 1)[-1]
+
+                if dependency.startswith(_SYSTEM_PREFIXES) or name in libraries:
+                    continue
+
+                try:
+                    path = _find_library(dependency, search_paths)
+                except FileNotFoundError as ex:
+                    raise RuntimeError(f'{ex} referenced by {binary}') from ex
+
+                if path:
+                    libraries[name] = path
+                    pending.append(path)
+
+    return libraries
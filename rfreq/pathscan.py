@@ -0,0 +1,86 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Number of matches reported per file
+_REPORTED_MATCHES = 8
+
+_pattern = None
+
+
+def _initialize(prefixes: tuple):
+    global _pattern  # pylint: disable=global-statement
+    _pattern = re.compile(b'|'.join(re.escape(prefix) for prefix in sorted(prefixes, key=len, reverse=True)))
+
+
+def _scan_file(path: str) -> list:
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return [(match.start(), match.group().decode(errors='replace')) for match in _pattern.finditer(data)]
+
+
+def _files(roots: list):
+    for root in roots:
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+
+                if not os.path.islink(path):
+                    yield path
+
+
+def scan(roots: list, prefixes: list, jobs: int) -> dict:
+    # Finds all occurrences of given path prefixes in text and binary files, returns offsets of them per file
+    encoded_prefixes = set()
+
+    for prefix in prefixes:
+        encoded_prefixes.add(str(prefix).encode())
+        encoded_prefixes.add(os.path.realpath(prefix).encode())
+
+    files = sorted(_files(roots))
+    leaks = {}
+
+    initargs = (tuple(encoded_prefixes),)
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_initialize, initargs=initargs) as executor:
+        for path, matches in zip(files, executor.map(_scan_file, files, chunksize=64)):
+            if matches:
+                leaks[Path(path)] = matches
+
+    return leaks
+
+
+def describe(leaks: dict, root_path: Path) -> list:
+    # Returns report line per file, paths outside of root, like custom output path, are kept absolute
+    lines = []
+
+    for path, matches in sorted(leaks.items()):
+        offsets = ', '.join(f'{offset:#x} {prefix}' for offset, prefix in matches[:_REPORTED_MATCHES])
+        more = f' and {len(matches) - _REPORTED_MATCHES} more' if len(matches) > _REPORTED_MATCHES else ''
+        shown_path = path.relative_to(root_path) if path.is_relative_to(root_path) else path
+        lines.append(f'{shown_path}: {offsets}{more}')
+
+    return lines
@@ -0,0 +1,65 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import re
+import typing
+from pathlib import Path
+
+# Assignment to QT variable, optionally inside single line scope like greaterThan(QT_MAJOR_VERSION, 4): QT += widgets
+_QT_ASSIGNMENT = re.compile(r'(?:^|[\s:{])QT\s*[+*]?=([^}]*)')
+_INCLUDE = re.compile(r'(?:^|[\s:{])include\(\s*([^)]+?)\s*\)')
+
+
+def _logical_lines(path: Path) -> list:
+    # Comments are removed, and lines ending with backslash are joined with following ones
+    lines = []
+    pending = ''
+
+    for line in path.read_text(encoding='utf-8', errors='replace').splitlines():
+        line = pending + line.split('#', 1)[0].rstrip()
+
+        if line.endswith('\\'):
+            pending = line[:-1] + ' '
+        else:
+            lines.append(line)
+            pending = ''
+
+    if pending:
+        lines.append(pending)
+
+    return lines
+
+
+def project_modules(path: Path, modules: typing.Optional[set] = None) -> set:
+    # Returns Qt modules added by qmake project file, and by project include files it references
+    # Scopes are not evaluated, and removals are ignored, so all modules that project may use are reported
+    if modules is None:
+        modules = set()
+
+    for line in _logical_lines(path):
+        for include in _INCLUDE.findall(line):
+            include_path = path.parent / include.strip('"').replace('$$PWD', str(path.parent))
+
+            if include_path.exists():
+                project_modules(include_path, modules)
+
+        for values in _QT_ASSIGNMENT.findall(line):
+            modules.update(values.split())
+
+    return modules
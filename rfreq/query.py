@@ -0,0 +1,115 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import json
+import typing
+from pathlib import Path
+
+from .download import archive_filename
+from .graph import TargetGraph
+from .source import record_sources
+
+
+class GraphNode(typing.NamedTuple):
+    name: str
+    prerequisites: tuple
+    dependents: tuple
+    closure_size: int
+    build_time: typing.Optional[float]
+    closure_build_time: typing.Optional[float]
+    archive_count: typing.Optional[int]
+    archive_size: typing.Optional[int]
+
+
+def source_archives(target, source_path: Path) -> tuple:
+    # Returns number of source archives, and their total size when all of them are already downloaded
+    # Both are None when sources cannot be determined without actual build, size is None when it is unknown
+    sources = record_sources(target)
+
+    if not sources:
+        return None, None
+
+    size = 0
+
+    for archive in sources.archives:
+        path = source_path / target.name / archive_filename(archive.url)
+
+        if not path.exists():
+            # Sizes are never requested from servers, so printing of graph works offline
+            return len(sources.archives), None
+
+        size += path.stat().st_size
+
+    return len(sources.archives), size
+
+
+def describe(graph: TargetGraph, names: list, build_times: dict, source_path: Path) -> list:
+    dependents = graph.dependents()
+    shown = set(names)
+    nodes = []
+
+    for name in names:
+        closure = graph.closure(name)[:-1]
+        build_time = build_times.get(name)
+
+        # Sum of all recorded times is what a serial build of target with its prerequisites takes
+        closure_times = [build_times.get(prerequisite) for prerequisite in (*closure, name)]
+        closure_build_time = None if None in closure_times else sum(closure_times)
+        archive_count, size = source_archives(graph.targets[name], source_path)
+
+        nodes.append(GraphNode(
+            name=name,
+            prerequisites=tuple(prerequisite for prerequisite in graph.prerequisites[name] if prerequisite in shown),
+            dependents=tuple(sorted(dependent for dependent in dependents[name] if dependent in shown)),
+            closure_size=len(closure),
+            build_time=build_time,
+            closure_build_time=closure_build_time,
+            archive_count=archive_count,
+            archive_size=size,
+        ))
+
+    return nodes
+
+
+def format_json(nodes: list) -> str:
+    return json.dumps([node._asdict() for node in nodes], indent=2)
+
+
+def format_dot(nodes: list) -> str:
+    lines = ['digraph targets {', '    rankdir=LR;', '    node [shape=box];']
+
+    for node in nodes:
+        details = [f'{node.closure_size} prerequisite(s)']
+
+        if node.build_time is not None:
+            details.append(f'{node.build_time:.0f} s')
+
+        if node.archive_size is not None and node.archive_count:
+            details.append(f'{node.archive_size / 1024 ** 2:.1f} MB')
+        elif node.archive_count:
+            details.append('archive size unknown')
+
+        label = node.name + '\\n' + ', '.join(details)
+        lines.append(f'    "{node.name}" [label="{label}"];')
+
+    for node in nodes:
+        for prerequisite in node.prerequisites:
+            lines.append(f'    "{prerequisite}" -> "{node.name}";')
+
+    lines.append('}')
+    return '\n'.join(lines)
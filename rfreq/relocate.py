@@ -0,0 +1,161 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import fnmatch
+import functools
+import os
+import re
+from pathlib import Path
+
+
+def _is_pattern(files: str) -> bool:
+    return any(char in files for char in '*?[')
+
+
+class _Rule:
+    def __init__(self, search: bytes, replacement: bytes, files: str, whole_line: bool):
+        self.search = search
+        self.replacement = replacement
+        self.files = files
+        self.whole_line = whole_line
+
+
+def _replace_line(rule: _Rule, match: re.Match) -> bytes:
+    replacement = rule.replacement
+
+    # The last line without newline stays so
+    if not match.group(0).endswith(b'\n') and replacement.endswith(b'\n'):
+        replacement = replacement[:-1]
+
+    return match.group(match.lastindex) + replacement
+
+
+class Relocator:
+    # Rewrites text files of installed tree in one pass using all rules combined into single regular expression
+    # Line rules replace remainder of lines starting with given prefix, other rules replace all occurrences
+
+    def __init__(self):
+        self._rules = []
+        self._matchers = {}
+
+    def replace_line(self, prefix: str, replacement: str, files: str = '*'):
+        self._rules.append(_Rule(prefix.encode(), replacement.encode(), files, True))
+
+    def replace(self, search: str, replacement: str, files: str = '*'):
+        self._rules.append(_Rule(search.encode(), replacement.encode(), files, False))
+
+    def remove(self, search: str, files: str = '*'):
+        self.replace(search, '', files)
+
+    def relativize(self, directory: Path, files: str = '*'):
+        # Paths inside given directory become relative to it, resolved path of directory is handled too
+        for variant in sorted({str(directory), os.path.realpath(directory)}):
+            self.remove(variant + os.sep, files)
+
+    def apply(self, path: Path):
+        for file_path in sorted(self._files(path)):
+            self._apply_to_file(file_path, file_path.relative_to(path).as_posix())
+
+    def _files(self, path: Path) -> set:
+        # Rules for particular files are applied without walking installed tree
+        # Otherwise, only directories where file patterns can match are walked
+        files = set()
+        roots = set()
+
+        for rule in self._rules:
+            if _is_pattern(rule.files):
+                prefix = re.split(r'[*?[]', rule.files, maxsplit=1)[0]
+                roots.add(prefix.rsplit('/', 1)[0] if '/' in prefix else '')
+                continue
+
+            file_path = path / rule.files
+
+            # Rules for particular files signal about changes in installed tree if these files are missing
+            if not file_path.is_file():
+                raise FileNotFoundError(f'No file {rule.files} to relocate in {path}')
+
+            if not file_path.is_symlink():
+                files.add(file_path)
+
+        walked_roots = []
+
+        # Parent directories go first, so their subdirectories are not walked twice
+        for root in sorted(roots):
+            if any(not walked or root == walked or root.startswith(walked + '/') for walked in walked_roots):
+                continue
+
+            walked_roots.append(root)
+
+            for directory, _, filenames in os.walk(path / root):
+                for filename in filenames:
+                    file_path = Path(directory) / filename
+
+                    if not file_path.is_symlink():
+                        files.add(file_path)
+
+        return files
+
+    def _apply_to_file(self, path: Path, relative_path: str):
+        rules = tuple(rule for rule in self._rules if fnmatch.fnmatchcase(relative_path, rule.files))
+
+        if not rules:
+            return
+
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        # Skip binary files
+        if b'\0' in content[:8192]:
+            return
+
+        pattern, replacements = self._matcher(rules)
+
+        def replace(match: re.Match) -> bytes:
+            return replacements[match.lastindex - 1](match)
+
+        updated_content = pattern.sub(replace, content)
+
+        if updated_content != content:
+            with open(path, 'wb') as f:
+                f.write(updated_content)
+
+    def _matcher(self, rules: tuple) -> tuple:
+        matcher = self._matchers.get(rules)
+
+        if matcher:
+            return matcher
+
+        alternatives = []
+        replacements = []
+
+        # Line rules go first, so they take precedence over other rules matching at the start of line
+        # Longer search strings of the same kind go first, so they take precedence over their prefixes
+        for rule in sorted(rules, key=lambda r: (not r.whole_line, -len(r.search))):
+            search = re.escape(rule.search)
+
+            if rule.whole_line:
+                alternatives.append(b'^(' + search + b')[^\n]*\n?')
+                replacements.append(functools.partial(_replace_line, rule))
+            else:
+                alternatives.append(b'(' + search + b')')
+                replacements.append(lambda _, r=rule: r.replacement)
+
+        matcher = re.compile(b'|'.join(alternatives), re.MULTILINE), replacements
+        self._matchers[rules] = matcher
+
+        return matcher
@@ -0,0 +1,148 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import statistics
+import threading
+import typing
+from concurrent.futures import ThreadPoolExecutor
+
+# Interval in seconds to check for job slots returned to external pool
+_POLL_INTERVAL = 0.1
+
+
+class Scheduler:
+    def __init__(self, prerequisites: dict, jobs: int, durations: typing.Optional[dict] = None):
+        # Prerequisites outside of the scheduled set are considered as already built
+        self.prerequisites = {name: tuple(prerequisite for prerequisite in prerequisites[name]
+                                          if prerequisite in prerequisites)
+                              for name in prerequisites}
+        self.jobs = max(jobs, 1)
+
+        # Expected duration of the longest chain of builds starting with each target
+        self.remaining = self._remaining_durations(durations or {})
+
+    def _remaining_durations(self, durations: dict) -> dict:
+        # Targets without history are assumed to take a typical time
+        default = statistics.median(durations.values()) if durations else 1.0
+        dependents = {name: [] for name in self.prerequisites}
+
+        for name, prerequisites in self.prerequisites.items():
+            for prerequisite in prerequisites:
+                dependents[prerequisite].append(name)
+
+        remaining = {}
+
+        def visit(name: str) -> float:
+            if name not in remaining:
+                longest = max((visit(dependent) for dependent in dependents[name]), default=0.0)
+                remaining[name] = durations.get(name, default) + longest
+
+            return remaining[name]
+
+        for name in self.prerequisites:
+            visit(name)
+
+        return remaining
+
+    def estimate(self) -> float:
+        # Build cannot finish faster than its critical path
+        return max(self.remaining.values(), default=0.0)
+
+    def run(self, build: typing.Callable[[str, int], None], pool=None, shared: typing.Iterable[str] = ()):
+        # Job slots are taken from the pool when given, e.g. from jobserver, which is also used by builds themselves
+        # Builds of shared targets take job slots from the pool on their own, so they are started with one slot only
+        pending = {name: len(prerequisites) for name, prerequisites in self.prerequisites.items()}
+        dependents = {name: [] for name in pending}
+
+        for name, prerequisites in self.prerequisites.items():
+            for prerequisite in prerequisites:
+                dependents[prerequisite].append(name)
+
+        ready = [name for name, count in pending.items() if count == 0]
+        running = {}
+        failures = []
+        tokens = pool or _TokenCounter(self.jobs)
+        shared = set(shared)
+        condition = threading.Condition()
+
+        def finish(name: str, future):
+            with condition:
+                tokens.release(running.pop(name))
+                error = future.exception()
+
+                if error:
+                    failures.append((name, error))
+                else:
+                    for dependent in dependents[name]:
+                        pending[dependent] -= 1
+
+                        if pending[dependent] == 0:
+                            ready.append(dependent)
+
+                condition.notify()
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            with condition:
+                while not failures and (ready or running):
+                    if not ready:
+                        condition.wait()
+                        continue
+
+                    # Start target with the longest chain of builds after it first, it is the critical one
+                    name = max(ready, key=lambda n: self.remaining[n])
+                    # Split CPU budget evenly between all targets that can run at the moment
+                    share = 1 if name in shared else max(self.jobs // (len(ready) + len(running)), 1)
+                    share = tokens.acquire(share)
+
+                    if share == 0:
+                        # Job slots are returned to the pool by other processes without any notification
+                        condition.wait(_POLL_INTERVAL if pool else None)
+                        continue
+
+                    ready.remove(name)
+                    running[name] = share
+
+                    future = executor.submit(build, name, share)
+                    future.add_done_callback(lambda f, n=name: finish(n, f))
+
+                while running:
+                    condition.wait()
+
+        if failures:
+            name, error = failures[0]
+            raise RuntimeError(f'Failed to build target {name}') from error
+
+        unbuilt = [name for name, count in pending.items() if count > 0]
+
+        if unbuilt:
+            raise RuntimeError('Unable to schedule targets: ' + ', '.join(unbuilt))
+
+
+class _TokenCounter:
+    # Job slots owned by scheduler exclusively
+
+    def __init__(self, count: int):
+        self.count = count
+
+    def acquire(self, count: int) -> int:
+        count = min(count, self.count)
+        self.count -= count
+        return count
+
+    def release(self, count: int):
+        self.count += count
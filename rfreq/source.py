@@ -0,0 +1,71 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import typing
+
+
+class UnsupportedSourceError(AttributeError):
+    pass
+
+
+class SourceArchive(typing.NamedTuple):
+    url: str
+    checksum: str
+    patches: tuple
+
+
+class SourceRecorder:
+    # Stand-in for build state that collects sources requested by prepare_source() method of a target
+    # Access to anything else means that sources cannot be determined without actual build
+
+    def __init__(self):
+        self.archives = []
+        self.repositories = []
+
+    def __getattr__(self, name: str):
+        raise UnsupportedSourceError(name)
+
+    def download_source(self, url: str, checksum: str, patches=None):
+        if not patches:
+            patches = ()
+        elif isinstance(patches, str):
+            patches = (patches,)
+
+        self.archives.append(SourceArchive(url, checksum, tuple(patches)))
+
+    def checkout_git(self, url: str, branch: typing.Optional[str] = None):
+        self.repositories.append((url, branch, None))
+
+    def checkout_git_revision(self, url: str, revision: typing.Optional[str], commit: typing.Optional[str]):
+        # Called by rfreq.git.checkout() instead of actual checkout
+        self.repositories.append((url, revision, commit))
+
+    def set_build_datetime(self, *_):
+        pass
+
+
+def record_sources(target, prepare_source: typing.Optional[typing.Callable] = None) -> typing.Optional[SourceRecorder]:
+    # Method of the target can be given explicitly, e.g. to bypass hooks installed on it
+    recorder = SourceRecorder()
+
+    try:
+        (prepare_source or target.prepare_source)(recorder)
+    except UnsupportedSourceError:
+        return None
+
+    return recorder
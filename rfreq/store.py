@@ -0,0 +1,98 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import fcntl
+import os
+import tempfile
+from pathlib import Path
+
+from .clone import hardcopy
+
+
+class ArchiveStore:
+    # Machine-wide store of verified source archives named by their checksums
+    # It can be shared between several checkouts and concurrent builds
+
+    def __init__(self, path: Path, max_size: int):
+        self.path = path
+        self.max_size = max_size
+
+        os.makedirs(path, exist_ok=True)
+
+    def _entry_path(self, checksum: str) -> Path:
+        return self.path / checksum[:2] / checksum
+
+    def link(self, checksum: str, destination: Path) -> bool:
+        entry_path = self._entry_path(checksum)
+
+        try:
+            hardcopy(entry_path, destination, link=True)
+            # Mark entry as recently used
+            os.utime(entry_path)
+        except FileNotFoundError:
+            # Not stored yet, or just evicted by another build
+            return False
+
+        return True
+
+    def add(self, checksum: str, source: Path):
+        entry_path = self._entry_path(checksum)
+
+        if entry_path.exists():
+            return
+
+        os.makedirs(entry_path.parent, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=entry_path.parent, suffix='.tmp')
+        os.close(descriptor)
+        os.unlink(temp_path)
+
+        hardcopy(source, Path(temp_path), link=True)
+        os.replace(temp_path, entry_path)
+
+        self._evict()
+
+    def _evict(self):
+        with open(self.path / '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+            entries = []
+            total_size = 0
+
+            for entry_path in self.path.glob('??/*'):
+                if entry_path.suffix == '.tmp':
+                    continue
+
+                try:
+                    stat = entry_path.stat()
+                except FileNotFoundError:
+                    continue
+
+                entries.append((stat.st_mtime, stat.st_size, entry_path))
+                total_size += stat.st_size
+
+            # Remove least recently used entries until store fits into its size limit
+            for _, size, entry_path in sorted(entries):
+                if total_size <= self.max_size:
+                    break
+
+                try:
+                    os.unlink(entry_path)
+                except FileNotFoundError:
+                    pass
+
+                total_size -= size
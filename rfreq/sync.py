@@ -0,0 +1,200 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import hashlib
+import json
+import os
+import shutil
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .clone import hardcopy
+
+
+class BundleSync:
+    # Brings destination directory in line with the set of source files and symbolic links
+    # Only files changed since the previous run are copied, and only entries not present anymore are deleted
+
+    def __init__(self, destination: Path, manifest_path: Path):
+        self.destination = destination
+        self.manifest_path = manifest_path
+        self.files = {}
+        self.links = {}
+
+    def add_file(self, source: Path, relative_path: typing.Union[str, Path]):
+        self.files[str(relative_path)] = source
+
+    def add_link(self, target: str, relative_path: typing.Union[str, Path]):
+        self.links[str(relative_path)] = target
+
+    def add_directory(self, source: Path, relative_path: typing.Union[str, Path] = ''):
+        # Symbolic links pointing inside of source directory are kept as is, other ones are replaced with their targets
+        root = os.path.realpath(source)
+
+        def is_inside(path: str) -> bool:
+            return os.path.commonpath((root, path)) == root
+
+        for directory, subdirectories, filenames in os.walk(source, followlinks=True):
+            for name in (*subdirectories, *filenames):
+                path = Path(directory) / name
+                destination_path = Path(relative_path) / path.relative_to(source)
+
+                if path.is_symlink():
+                    target = os.readlink(path)
+
+                    if not os.path.isabs(target) and is_inside(os.path.realpath(directory)) \
+                            and is_inside(os.path.realpath(path)):
+                        self.add_link(target, destination_path)
+
+                        if name in subdirectories:
+                            subdirectories.remove(name)
+
+                        continue
+
+                if name in filenames:
+                    self.add_file(path, destination_path)
+
+    def run(self, jobs: int):
+        manifest = self._load_manifest()
+        updated_manifest = {}
+        changed_files = []
+        changed_links = []
+
+        for relative_path, source in self.files.items():
+            stat = source.stat()
+            entry = manifest.get(relative_path)
+            signature = [stat.st_size, stat.st_mtime_ns]
+
+            if entry and entry.get('destination') != _signature(self.destination / relative_path):
+                # Destination was modified or removed after the previous run, e.g. by code signing
+                entry = None
+            elif entry and entry.get('signature') != signature:
+                # Timestamp may change without actual modification, e.g. when file is rebuilt or regenerated
+                digest = _hash_file(source)
+                entry = dict(entry, signature=signature) if digest == entry['digest'] else None
+
+            if not entry:
+                entry = {'signature': signature, 'digest': _hash_file(source)}
+                changed_files.append(relative_path)
+
+            updated_manifest[relative_path] = entry
+
+        for relative_path, target in self.links.items():
+            link_path = self.destination / relative_path
+
+            if not link_path.is_symlink() or os.readlink(link_path) != target:
+                changed_links.append(relative_path)
+
+            updated_manifest[relative_path] = {'link': target}
+
+        self._remove_stale_entries()
+
+        def copy(relative_path: str):
+            destination = self.destination / relative_path
+            _copy(self.files[relative_path], destination)
+            # Record destination state to detect its changes made after copying
+            updated_manifest[relative_path]['destination'] = _signature(destination)
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            for future in [executor.submit(copy, relative_path) for relative_path in changed_files]:
+                future.result()
+
+        for relative_path in changed_links:
+            _link(self.links[relative_path], self.destination / relative_path)
+
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(updated_manifest, f, indent=1, sort_keys=True)
+
+    def _load_manifest(self) -> dict:
+        if not self.manifest_path.exists() or not self.destination.exists():
+            return {}
+
+        with open(self.manifest_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _remove_stale_entries(self):
+        if not self.destination.exists():
+            return
+
+        expected_directories = set()
+
+        for relative_path in (*self.files, *self.links):
+            expected_directories.update(str(parent) for parent in Path(relative_path).parents)
+
+        for directory, subdirectories, filenames in os.walk(self.destination):
+            relative_directory = Path(directory).relative_to(self.destination)
+
+            for subdirectory in list(subdirectories):
+                relative_path = str(relative_directory / subdirectory)
+                path = Path(directory) / subdirectory
+
+                if relative_path in self.links:
+                    # Symbolic link to directory, or directory to be replaced with it
+                    subdirectories.remove(subdirectory)
+                elif path.is_symlink():
+                    # Files are never copied through symbolic links
+                    path.unlink()
+                    subdirectories.remove(subdirectory)
+                elif relative_path not in expected_directories:
+                    shutil.rmtree(path)
+                    subdirectories.remove(subdirectory)
+
+            for filename in filenames:
+                relative_path = str(relative_directory / filename)
+
+                if relative_path not in self.files and relative_path not in self.links:
+                    os.unlink(Path(directory) / filename)
+
+
+def _signature(path: Path) -> typing.Optional[list]:
+    try:
+        stat = path.lstat()
+    except FileNotFoundError:
+        return None
+
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _remove(path: Path):
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path)
+    elif path.exists() or path.is_symlink():
+        os.unlink(path)
+
+
+def _copy(source: Path, destination: Path):
+    os.makedirs(destination.parent, exist_ok=True)
+    _remove(destination)
+    hardcopy(source, destination)
+
+
+def _link(target: str, destination: Path):
+    os.makedirs(destination.parent, exist_ok=True)
+    _remove(destination)
+    os.symlink(target, destination)
+
+
+def _hash_file(path: Path) -> str:
+    hasher = hashlib.sha256()
+
+    with open(path, 'rb') as f:
+        while chunk := f.read(1024 * 1024):
+            hasher.update(chunk)
+
+    return hasher.hexdigest()
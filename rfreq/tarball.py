@@ -0,0 +1,55 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import os
+import tarfile
+from pathlib import Path
+
+# Python versions with extraction filters verify members on their own too
+_FILTER = {'filter': 'data'} if hasattr(tarfile, 'data_filter') else {}
+
+
+def _is_outside(name: str) -> bool:
+    name = os.path.normpath(name)
+    return os.path.isabs(name) or name == '..' or name.startswith('../')
+
+
+def check_member(member: tarfile.TarInfo):
+    if _is_outside(member.name):
+        raise RuntimeError(f'Unsafe path {member.name} in archive')
+
+    if member.issym():
+        # Symbolic link target is relative to directory containing the link
+        link_path = os.path.join(os.path.dirname(member.name), member.linkname)
+
+        if os.path.isabs(member.linkname) or _is_outside(link_path):
+            raise RuntimeError(f'Unsafe symbolic link {member.name} -> {member.linkname} in archive')
+    elif member.islnk():
+        # Hard link target is relative to archive root
+        if _is_outside(member.linkname):
+            raise RuntimeError(f'Unsafe hard link {member.name} -> {member.linkname} in archive')
+    elif member.isdev():
+        raise RuntimeError(f'Unsupported device file {member.name} in archive')
+
+
+def extract(tar_file: tarfile.TarFile, path: Path):
+    # Unpack members one by one, so it works with streamed archives as well
+    for member in tar_file:
+        check_member(member)
+        tar_file.extract(member, path, **_FILTER)  # nosec B202
@@ -0,0 +1,63 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import hashlib
+import shlex
+import subprocess
+from pathlib import Path
+
+from aedi.state import BuildState
+
+_ENVIRONMENT = ('CC', 'CXX', 'CPP', 'CFLAGS', 'CXXFLAGS', 'CPPFLAGS', 'LDFLAGS', 'LIBS',
+                'SDKROOT', 'MACOSX_DEPLOYMENT_TARGET')
+
+# Standard C and POSIX headers provided by SDK, checks for them depend only on toolchain
+STANDARD_HEADERS = (
+    'alloca.h', 'arpa/inet.h', 'assert.h', 'ctype.h', 'dirent.h', 'dlfcn.h', 'errno.h', 'fcntl.h', 'float.h',
+    'inttypes.h', 'limits.h', 'locale.h', 'math.h', 'memory.h', 'netdb.h', 'netinet/in.h', 'poll.h', 'pthread.h',
+    'sched.h', 'signal.h', 'stdarg.h', 'stdbool.h', 'stddef.h', 'stdint.h', 'stdio.h', 'stdlib.h', 'string.h',
+    'strings.h', 'sys/ioctl.h', 'sys/mman.h', 'sys/param.h', 'sys/resource.h', 'sys/select.h', 'sys/socket.h',
+    'sys/stat.h', 'sys/time.h', 'sys/types.h', 'sys/uio.h', 'sys/un.h', 'sys/wait.h', 'termios.h', 'time.h',
+    'unistd.h', 'wchar.h', 'wctype.h',
+)
+
+# Functions of C library provided by SDK, checks for them depend only on toolchain and linker flags
+STANDARD_FUNCTIONS = (
+    'alarm', 'atexit', 'clock_gettime', 'dlopen', 'fork', 'ftruncate', 'getcwd', 'getenv', 'getpagesize',
+    'gettimeofday', 'localtime_r', 'memcpy', 'memmove', 'memset', 'mkdir', 'mmap', 'munmap', 'nanosleep', 'pipe',
+    'poll', 'posix_memalign', 'pthread_create', 'realpath', 'select', 'setenv', 'setlocale', 'sigaction',
+    'snprintf', 'socket', 'sqrt', 'strcasecmp', 'strchr', 'strdup', 'strerror', 'strerror_r', 'strncasecmp',
+    'strndup', 'strnlen', 'strrchr', 'strstr', 'strtol', 'strtoul', 'sysconf', 'uname', 'usleep', 'vasprintf',
+    'vsnprintf',
+)
+
+
+def toolchain_id(state: BuildState, *tools: str) -> str:
+    # Identifies architecture, SDK, and compilers with their flags, plus versions of additional tools
+    environment = state.environment
+    hasher = hashlib.sha256()
+
+    for variable in _ENVIRONMENT:
+        hasher.update(f'{variable}={environment.get(variable, "")}\n'.encode())
+
+    for tool in (environment.get('CC', 'clang'), environment.get('CXX', 'clang++'), *tools):
+        args = (*shlex.split(tool), '--version')
+        hasher.update(subprocess.run(args, check=True, capture_output=True, env=environment).stdout)
+
+    sdk = Path(environment.get('SDKROOT', 'default')).name
+    return f'{state.architecture()}-{sdk}-{hasher.hexdigest()[:16]}'
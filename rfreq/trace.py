@@ -0,0 +1,154 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from pathlib import Path
+
+from . import hooks
+
+PHASES = ('prepare_source', 'configure', 'build', 'post_build', 'install')
+
+
+def _cpu_time() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _peak_rss() -> tuple:
+    # Value is in bytes on macOS, and in kilobytes on Linux
+    scale = 1024 ** 2 if sys.platform == 'darwin' else 1024
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale)
+
+
+class Tracer:
+    # Collects events in Chrome trace format, they can be viewed with Perfetto UI or chrome://tracing
+
+    def __init__(self):
+        self.events = []
+        self.lock = threading.Lock()
+
+    def add(self, name: str, category: str, start: float, end: float, tid: int = 0, **args):
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': round(start * 1_000_000),
+            'dur': round((end - start) * 1_000_000),
+            'pid': os.getpid(),
+            'tid': tid or threading.get_ident(),
+            'args': args,
+        }
+
+        with self.lock:
+            self.events.append(event)
+
+    def name_process(self, name: str, pid: int = 0):
+        event = {'name': 'process_name', 'ph': 'M', 'pid': pid or os.getpid(), 'args': {'name': name}}
+
+        with self.lock:
+            self.events.append(event)
+
+    def add_instant(self, name: str, category: str, **args):
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'i',
+            's': 't',
+            'ts': round(time.time() * 1_000_000),
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': args,
+        }
+
+        with self.lock:
+            self.events.append(event)
+
+    def instrument(self, targets):
+        for phase in PHASES:
+            hooks.wrap_method(targets, phase, self._trace_phase)
+
+        # Capture launches of external tools by targets and by the core, like configure scripts, make, or qmake
+        sys.addaudithook(self._audit)
+
+    def _trace_phase(self, target, method, state, *args, **kwargs):
+        start = time.time()
+        start_cpu = _cpu_time()
+        start_rss, start_children_rss = _peak_rss()
+
+        try:
+            return method(state, *args, **kwargs)
+        finally:
+            # Peak RSS only grows, so delta shows how much this phase raised it, zero means it stayed below earlier peak
+            rss, children_rss = _peak_rss()
+            self.add(method.func.__name__, 'phase', start, time.time(), target=target.name,
+                     architecture=_architecture(state), cpu=round(_cpu_time() - start_cpu, 3),
+                     peak_rss_delta_mb=round(rss - start_rss, 1),
+                     children_peak_rss_delta_mb=round(children_rss - start_children_rss, 1))
+
+    def _audit(self, event: str, args: tuple):
+        if event != 'subprocess.Popen':
+            return
+
+        executable, command = args[0], args[1]
+        command = [str(arg) for arg in command] if isinstance(command, (list, tuple)) else [str(command)]
+        self.add_instant(Path(str(executable or command[0])).name, 'process', command=' '.join(command))
+
+    def write(self, path: Path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f)
+
+
+def _architecture(state) -> str:
+    try:
+        return state.architecture()
+    except Exception:  # pylint: disable=broad-except
+        # Architecture is not known outside of platform specific build steps
+        return ''
+
+
+def read_events(path: Path) -> list:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['traceEvents']
+
+
+def critical_path(prerequisites: dict, spans: dict) -> list:
+    # Walk back from the target finished last, each time through prerequisite that was finished last
+    # spans maps target name to (start, end) tuple of its build
+    if not spans:
+        return []
+
+    name = max(spans, key=lambda n: spans[n][1])
+    path = [name]
+
+    while True:
+        candidates = [prerequisite for prerequisite in prerequisites.get(name, ()) if prerequisite in spans]
+
+        if not candidates:
+            break
+
+        name = max(candidates, key=lambda n: spans[n][1])
+        path.append(name)
+
+    return path[::-1]
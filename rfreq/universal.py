@@ -0,0 +1,91 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import filecmp
+import os
+import shutil
+import stat
+import subprocess
+import typing
+from pathlib import Path
+
+from . import macho
+
+
+def _is_binary(path: Path) -> bool:
+    # Mach-O files and static libraries are combined with lipo
+    with open(path, 'rb') as f:
+        header = f.read(8)
+
+    return header == b'!<arch>\n' or macho.is_macho(path)
+
+
+def _is_skipped(relative_path: Path) -> bool:
+    # Libtool archives refer to install directory, and dotfiles include driver's fingerprint
+    return relative_path.suffix == '.la' or any(part.startswith('.') for part in relative_path.parts)
+
+
+def _relative_paths(install_paths: typing.Sequence[Path]) -> list:
+    # Union of entries of all install directories, every directory goes before its content
+    paths = {}
+
+    for install_path in install_paths:
+        for directory, subdirectories, filenames in os.walk(install_path):
+            for name in (*subdirectories, *filenames):
+                paths[(Path(directory) / name).relative_to(install_path)] = None
+
+    return list(paths)
+
+
+def merge(install_paths: typing.Sequence[Path], output_path: Path, runner=subprocess.run):
+    # Combines installations of the same target built separately for each architecture
+    # This follows merging of per-architecture builds done by aedi builder itself
+    if output_path.exists():
+        shutil.rmtree(output_path)
+
+    os.makedirs(output_path)
+
+    for relative_path in _relative_paths(install_paths):
+        if _is_skipped(relative_path):
+            continue
+
+        sources = [path / relative_path for path in install_paths if os.path.lexists(path / relative_path)]
+        source = sources[0]
+        destination = output_path / relative_path
+        os.makedirs(destination.parent, exist_ok=True)
+
+        if source.is_symlink():
+            os.symlink(os.readlink(source), destination)
+        elif source.is_dir():
+            os.makedirs(destination, exist_ok=True)
+        elif len(sources) > 1 and _is_binary(source):
+            runner(('lipo', '-create', *sources, '-output', destination), check=True)
+            shutil.copymode(source, destination)
+
+            # Executables outside of application bundles need a signature to run on Apple Silicon
+            executable = source.stat().st_mode & stat.S_IXUSR
+            bundled = any(part.endswith('.app') for part in relative_path.parts)
+
+            if executable and not bundled and macho.is_macho(source):
+                runner(('codesign', '--sign', '-', '--force', destination), check=True)
+        else:
+            shutil.copy2(source, destination)
+
+            for other in sources[1:]:
+                if other.is_file() and not filecmp.cmp(source, other, shallow=False):
+                    print(f'Warning: {relative_path} differs between architectures, {source} is used')
@@ -0,0 +1,54 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+from pathlib import Path
+
+from aedi.state import BuildState
+
+
+def link_deps(state: BuildState, *targets: str):
+    # Xcode project runs its executable from Debug directory, and needs shared libraries next to it
+    # Unlike copies, symbolic links to installed libraries are created instantly, and follow rebuilt dependencies
+    debug_path = state.build_path / 'Debug'
+    os.makedirs(debug_path, exist_ok=True)
+
+    # Link all shared libraries installed by prerequisite targets, so there is no separate list of them to maintain
+    deps_path = state.patch_path.parent / 'deps'
+
+    for target in targets:
+        libraries = tuple((deps_path / target / 'lib').glob('*.dylib'))
+
+        if not libraries:
+            raise FileNotFoundError(f'Unable to find shared library installed by {target} target')
+
+        for library in libraries:
+            link_path = debug_path / library.name
+            library = library.resolve()
+
+            # Check for symlink existence regardless of target file presence
+            if link_path.is_symlink():
+                if Path(os.readlink(link_path)) == library:
+                    continue
+
+                link_path.unlink()
+            elif link_path.exists():
+                # Copy made by earlier build
+                link_path.unlink()
+
+            link_path.symlink_to(library)
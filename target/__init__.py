@@ -20,6 +20,7 @@ from .gcc import *
 from .library import *
 from .main import *
 from .qt import *
+from .special import *
 from .tool import *
 
 
@@ -64,6 +65,7 @@ def targets():
         ArmNoneEabiGcc13Target(),
         ArmNoneEabiGcc14Target(),
         ArmNoneEabiGccTarget(),
+        ArmNoneEabiGccMatrixTarget(),
         ArmNoneEabiGdbTarget(),
         ArmNoneEabiNewlibTarget(),
         GmpTarget(),
@@ -83,4 +85,7 @@ def targets():
         Rtl433Target(),
         RtlPowerFftwTarget(),
         StlinkTarget(),
+
+        # Special
+        CheckPathsTarget(),
     )
@@ -16,12 +16,19 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 
+import hashlib
 import os
 import subprocess
+import typing
 
 from aedi.state import BuildState
 from aedi.target import base
 
+from rfreq import autoconf, jobserver
+from rfreq.fingerprint import read_fingerprint
+from rfreq.relocate import Relocator
+from rfreq.toolchain import toolchain_id
+
 
 class ArmNoneEabiBinutilsTarget(base.ConfigureMakeDependencyTarget):
     def __init__(self):
@@ -43,15 +50,26 @@ class ArmNoneEabiBinutilsTarget(base.ConfigureMakeDependencyTarget):
 
 
 class _GccBaseTarget(base.BuildTarget):
-    # TODO: Avoid absolute paths in various files
+    # TODO: Avoid absolute paths in binaries
 
-    def __init__(self, name=None):
+    def __init__(self, name: str, url: str, checksum: str):
         super().__init__(name)
         self.prerequisites = ('arm-none-eabi-binutils', 'isl', 'mpc')
+        self.source_archive = (url, checksum)
 
         # TODO: Add cross-compilation support
         self.multi_platform = False
 
+        # Top-level configure checks only host system, target libraries use their own caches
+        self.config_cache = True
+        # Make takes job slots from jobserver of parallel build
+        self.jobserver = True
+        # Cache of compiler stage, it is set by driver with --stage-cache option
+        self.stage_cache = None
+
+    def prepare_source(self, state: BuildState):
+        state.download_source(*self.source_archive)
+
     def detect(self, state: BuildState) -> bool:
         return state.has_source_file('gcc/gcc.h')
 
@@ -64,7 +82,10 @@ class _GccBaseTarget(base.BuildTarget):
         if not source_link.exists():
             os.symlink(state.source, source_link)
 
-        args = (
+        subprocess.run(self._configure_args(state), check=True, cwd=state.build_path, env=state.environment)
+
+    def _configure_args(self, state: BuildState) -> tuple:
+        return (
             'source/configure',
             '--prefix=' + self.INSTALL_PREFIX,
             '--build=' + state.host(),
@@ -82,47 +103,99 @@ class _GccBaseTarget(base.BuildTarget):
             '--with-newlib',
             '--with-system-zlib',
             '--without-headers',
+            *autoconf.cache_file_args(state),
         )
-        subprocess.run(args, check=True, cwd=state.build_path, env=state.environment)
 
     def build(self, state: BuildState):
-        args = ('make', '--jobs', state.jobs)
+        args = ('make', *jobserver.make_jobs(state))
+
+        # Compiler itself takes most of build time, and it is built first, separately from target libraries
+        stage_name = self.name + '-all-gcc'
+        stage_fingerprint = self._stage_fingerprint(state) if self.stage_cache else None
+
+        if not stage_fingerprint or not self.stage_cache.restore(stage_name, stage_fingerprint, state.build_path):
+            subprocess.run((*args, 'all-gcc'), check=True, cwd=state.build_path, env=state.environment)
+
+            if stage_fingerprint:
+                self.stage_cache.store(stage_name, stage_fingerprint, state.build_path)
+
         subprocess.run(args, check=True, cwd=state.build_path, env=state.environment)
 
+    def _stage_fingerprint(self, state: BuildState) -> typing.Optional[str]:
+        deps_path = state.patch_path.parent / 'deps'
+        hasher = hashlib.sha256()
+
+        for prerequisite in self.prerequisites:
+            fingerprint = read_fingerprint(deps_path / prerequisite)
+
+            if not fingerprint:
+                # Prerequisite was built without fingerprint, its exact content is unknown
+                return None
+
+            hasher.update(f'{prerequisite}={fingerprint}\n'.encode())
+
+        # Restored build directory must be identical to the one that would have been built, including absolute paths
+        inputs = (
+            *self.source_archive,
+            str(state.source),
+            str(state.build_path),
+            toolchain_id(state),
+            *self._configure_args(state),
+        )
+
+        for value in inputs:
+            hasher.update(f'{value}\n'.encode())
+
+        return hasher.hexdigest()
+
     def post_build(self, state: BuildState):
         self.install(state)
 
+        # Remove absolute paths to build and source directories from libtool archives and plugin headers
+        # Only text files of known kinds are rewritten, binaries keep their paths
+        relocator = Relocator()
+
+        for files in ('lib/*.la', 'libexec/*.la', 'lib/gcc/*/plugin/include/*'):
+            relocator.relativize(state.build_path, files)
+            relocator.relativize(state.source, files)
+
+        relocator.apply(state.install_path)
+
 
 class ArmNoneEabiGcc13Target(_GccBaseTarget):
     def __init__(self):
-        super().__init__('arm-none-eabi-gcc-13')
-
-    def prepare_source(self, state: BuildState):
-        state.download_source(
+        super().__init__(
+            'arm-none-eabi-gcc-13',
             'https://ftpmirror.gnu.org/gcc/gcc-13.4.0/gcc-13.4.0.tar.xz',
             '9c4ce6dbb040568fdc545588ac03c5cbc95a8dbf0c7aa490170843afb59ca8f5')
 
 
 class ArmNoneEabiGcc14Target(_GccBaseTarget):
     def __init__(self):
-        super().__init__('arm-none-eabi-gcc-14')
-
-    def prepare_source(self, state: BuildState):
-        state.download_source(
+        super().__init__(
+            'arm-none-eabi-gcc-14',
             'https://ftpmirror.gnu.org/gcc/gcc-14.3.0/gcc-14.3.0.tar.xz',
             'e0dc77297625631ac8e50fa92fffefe899a4eb702592da5c32ef04e2293aca3a')
 
 
 class ArmNoneEabiGccTarget(_GccBaseTarget):
     def __init__(self):
-        super().__init__('arm-none-eabi-gcc')
-
-    def prepare_source(self, state: BuildState):
-        state.download_source(
+        super().__init__(
+            'arm-none-eabi-gcc',
             'https://ftpmirror.gnu.org/gcc/gcc-15.2.0/gcc-15.2.0.tar.xz',
             '438fd996826b0c82485a29da03a72d71d6e3541a83ec702df4271f6fe025d24e')
 
 
+class ArmNoneEabiGccMatrixTarget(base.Target):
+    # Builds all GCC versions, with --parallel they are built concurrently sharing the same prerequisites
+    def __init__(self):
+        super().__init__('arm-none-eabi-gcc-matrix')
+
+        self.destination = self.DESTINATION_OUTPUT
+        self.multi_platform = False
+        self.prerequisites = ('arm-none-eabi-gcc-13', 'arm-none-eabi-gcc-14', 'arm-none-eabi-gcc')
+
+
 class ArmNoneEabiGdbTarget(base.BuildTarget):
     def __init__(self):
         super().__init__('arm-none-eabi-gdb')
@@ -130,6 +203,8 @@ class ArmNoneEabiGdbTarget(base.BuildTarget):
 
         # TODO: Add cross-compilation support
         self.multi_platform = False
+        self.config_cache = True
+        self.jobserver = True
 
     def prepare_source(self, state: BuildState):
         state.download_source(
@@ -157,11 +232,12 @@ class ArmNoneEabiGdbTarget(base.BuildTarget):
             '--enable-tui',
             '--target=arm-none-eabi',
             '--with-system-zlib',
+            *autoconf.cache_file_args(state),
         )
         subprocess.run(args, check=True, cwd=state.build_path, env=state.environment)
 
     def build(self, state: BuildState):
-        args = ('make', '--jobs', state.jobs)
+        args = ('make', *jobserver.make_jobs(state))
         subprocess.run(args, check=True, cwd=state.build_path, env=state.environment)
 
     def post_build(self, state: BuildState):
@@ -176,6 +252,9 @@ class ArmNoneEabiNewlibTarget(base.BuildTarget):
 
         self.multi_platform = False
         self.prerequisites = ('arm-none-eabi-gcc', 'texinfo')
+        self.jobserver = True
+
+        # Shared autoconf cache is not used because configure scripts of newlib check arm-none-eabi target only
 
     def prepare_source(self, state: BuildState):
         state.download_source(
@@ -208,7 +287,7 @@ class ArmNoneEabiNewlibTarget(base.BuildTarget):
         subprocess.run(args, check=True, cwd=state.build_path, env=state.environment)
 
     def build(self, state: BuildState):
-        args = ('make', '--jobs', state.jobs)
+        args = ('make', *jobserver.make_jobs(state))
         subprocess.run(args, check=True, cwd=state.build_path, env=state.environment)
 
     def post_build(self, state: BuildState):
@@ -244,19 +323,10 @@ class GmpTarget(base.ConfigureMakeStaticDependencyTarget):
     def post_build(self, state: BuildState):
         super().post_build(state)
 
-        replacements = {
-            '#define __GMP_CC ': 'clang\n',
-            '#define __GMP_CFLAGS ': '\n',
-        }
-
-        def cleanup_cc_cflags(line: str):
-            for prefix, replacement in replacements.items():
-                if line.startswith(prefix):
-                    return prefix + replacement
-
-            return line
-
-        self.update_text_file(state.install_path / 'include/gmp.h', cleanup_cc_cflags)
+        relocator = Relocator()
+        relocator.replace_line('#define __GMP_CC ', 'clang\n', 'include/gmp.h')
+        relocator.replace_line('#define __GMP_CFLAGS ', '\n', 'include/gmp.h')
+        relocator.apply(state.install_path)
 
 
 class IslTarget(base.ConfigureMakeStaticDependencyTarget):
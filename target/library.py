@@ -24,8 +24,15 @@ from pathlib import Path
 from aedi.state import BuildState
 from aedi.target import base
 
+from rfreq import git, xcode
+from rfreq.relocate import Relocator
+
 
 class _UsbDependentTarget(base.CMakeSharedDependencyTarget):
+    def __init__(self, name=None):
+        super().__init__(name)
+        self.prerequisites = ('usb',)
+
     @staticmethod
     def _process_pkg_config(_, line: str) -> str:
         if line.startswith('Cflags: '):
@@ -41,6 +48,7 @@ class _UsbDependentTarget(base.CMakeSharedDependencyTarget):
 class Ad9361Target(base.CMakeSharedDependencyTarget):
     def __init__(self):
         super().__init__('ad9361')
+        self.prerequisites = ('iio',)
 
     def prepare_source(self, state: BuildState):
         state.download_source(
@@ -75,6 +83,7 @@ class AirspyHFTarget(_UsbDependentTarget):
 class BladeRFTarget(base.CMakeSharedDependencyTarget):
     def __init__(self):
         super().__init__('bladerf')
+        self.prerequisites = ('usb',)
         self.src_root = 'host'
 
     def prepare_source(self, state: BuildState):
@@ -83,26 +92,9 @@ class BladeRFTarget(base.CMakeSharedDependencyTarget):
         #     'https://github.com/Nuand/bladeRF/archive/refs/tags/2023.02.tar.gz',
         #     '3bbac54ad7d6e35be31eb12393be5e7102a070fb1ddc176992d64a6a623670c7')
 
-        if not state.source.exists():
-            clone_args = ('git', 'clone', 'https://github.com/Nuand/bladeRF.git', state.source)
-            subprocess.run(clone_args, check=True, env=state.environment)
-
-        checkout_args = (
-            ('checkout', '2023.02'),
-            ('submodule', 'update', '--init', '--recursive')
-        )
-
-        for args in checkout_args:
-            subprocess.run(('git', *args), check=True, cwd=state.source, env=state.environment)
-
-        # Verify commit hash of checked out release tag
-        head_args = ('git', 'rev-parse', 'HEAD')
-        head_run = subprocess.run(head_args, check=True, cwd=state.source,
-                                  env=state.environment, stdout=subprocess.PIPE)
-        head_output = head_run.stdout.decode('ascii').strip()
-
-        if head_output != '41ef63460956e833c9b321252245257ab3946055':
-            raise RuntimeError('BladeRF commit does not match with the release tag')
+        # Check out release tag, and verify its commit hash
+        git.checkout(state, 'https://github.com/Nuand/bladeRF.git', revision='2023.02',
+                     commit='41ef63460956e833c9b321252245257ab3946055', submodules=True)
 
     def configure(self, state: BuildState):
         opts = state.options
@@ -193,25 +185,20 @@ class FftwTarget(base.CMakeSharedDependencyTarget):
         super().post_build(state)
 
         # Patch CMake module to replace absolute paths
-        replacements = {
-            'set (FFTW3f_INCLUDE_DIRS ': '"${CMAKE_CURRENT_LIST_DIR}/../../../include")\n',
-            'set (FFTW3f_LIBRARY_DIRS ': '"${CMAKE_CURRENT_LIST_DIR}/../../")\n'
-        }
+        cmake_module = 'lib/cmake/fftw3f/FFTW3fConfig.cmake'
 
-        def update_dirs(line: str):
-            for prefix, replacement in replacements.items():
-                if line.startswith(prefix):
-                    return prefix + replacement
-
-            return line
-
-        cmake_module = state.install_path / 'lib/cmake/fftw3f/FFTW3fConfig.cmake'
-        self.update_text_file(cmake_module, update_dirs)
+        relocator = Relocator()
+        relocator.replace_line('set (FFTW3f_INCLUDE_DIRS ',
+                               '"${CMAKE_CURRENT_LIST_DIR}/../../../include")\n', cmake_module)
+        relocator.replace_line('set (FFTW3f_LIBRARY_DIRS ',
+                               '"${CMAKE_CURRENT_LIST_DIR}/../../")\n', cmake_module)
+        relocator.apply(state.install_path)
 
 
 class FobosBaseTarget(base.CMakeSharedDependencyTarget):
     def __init__(self, name=None):
         super().__init__(name)
+        self.prerequisites = ('usb',)
         self.installed_tools = ()
 
     def post_build(self, state: BuildState):
@@ -220,22 +207,18 @@ class FobosBaseTarget(base.CMakeSharedDependencyTarget):
         project_name = self.project_name or self.name
 
         if state.xcode:
-            self.hardcopy_xcode_deps(state, 'usb')
+            xcode.link_deps(state, 'usb')
         else:
             for suffix in self.installed_tools:
                 self.copy_to_bin(state, f'{project_name}_{suffix}')
 
         # Delete absolute paths for .pc file
-        absolute_paths = (f' -I{state.include_path}', f' -L{state.lib_path}')
-
-        def remove_absolute_paths(line: str):
-            for path in absolute_paths:
-                line = line.replace(path, '')
-
-            return line
+        pc_file = f'lib/pkgconfig/lib{project_name}.pc'
 
-        pc_path = state.install_path / f'lib/pkgconfig/lib{project_name}.pc'
-        self.update_text_file(pc_path, remove_absolute_paths)
+        relocator = Relocator()
+        relocator.remove(f' -I{state.include_path}', pc_file)
+        relocator.remove(f' -L{state.lib_path}', pc_file)
+        relocator.apply(state.install_path)
 
 
 class FobosTarget(FobosBaseTarget):
@@ -317,6 +300,7 @@ class HydraSdrTarget(_UsbDependentTarget):
 class IioTarget(base.CMakeSharedDependencyTarget):
     def __init__(self):
         super().__init__('iio')
+        self.prerequisites = ('usb',)
 
     def prepare_source(self, state: BuildState):
         state.download_source(
@@ -341,6 +325,7 @@ class IioTarget(base.CMakeSharedDependencyTarget):
 class LimeSuiteTarget(base.CMakeSharedDependencyTarget):
     def __init__(self):
         super().__init__('limesuite')
+        self.prerequisites = ('usb',)
 
     def prepare_source(self, state: BuildState):
         state.download_source(
@@ -398,6 +383,7 @@ class MarkupSafeTarget(base.BuildTarget):
 class PerseusTarget(base.ConfigureMakeSharedDependencyTarget):
     def __init__(self):
         super().__init__('perseus')
+        self.prerequisites = ('usb',)
 
     def prepare_source(self, state: BuildState):
         state.download_source(
@@ -437,7 +423,7 @@ class PortAudioTarget(base.CMakeDependencyTarget):
 class RfnmAudioTarget(base.CMakeDependencyTarget):
     def __init__(self):
         super().__init__('rfnm')
-        self.prerequisites = 'spdlog'
+        self.prerequisites = ('spdlog', 'usb')
 
     def prepare_source(self, state: BuildState):
         # The following code fetches sources from the actual repository
@@ -468,6 +454,7 @@ class RtAudioTarget(base.CMakeSharedDependencyTarget):
 class RtlSdrTarget(base.CMakeDependencyTarget):
     def __init__(self):
         super().__init__('rtlsdr')
+        self.prerequisites = ('usb',)
 
     def prepare_source(self, state: BuildState):
         state.download_source(
@@ -478,22 +465,15 @@ class RtlSdrTarget(base.CMakeDependencyTarget):
         super().post_build(state)
 
         # Patch CMake module to replace absolute paths
-        replacements = {
-            '  INTERFACE_INCLUDE_DIRECTORIES ':
-                '"${_IMPORT_PREFIX}/include;${CMAKE_CURRENT_LIST_DIR}/../../../include/libusb-1.0"\n',
-            '  INTERFACE_LINK_LIBRARIES ':
-                '"${CMAKE_CURRENT_LIST_DIR}/../../libusb-1.0.dylib"\n',
-        }
+        cmake_module = 'lib/cmake/rtlsdr/rtlsdrTargets.cmake'
 
-        def update_dirs(line: str):
-            for prefix, replacement in replacements.items():
-                if line.startswith(prefix):
-                    return prefix + replacement
-
-            return line
-
-        cmake_module = state.install_path / 'lib/cmake/rtlsdr/rtlsdrTargets.cmake'
-        self.update_text_file(cmake_module, update_dirs)
+        relocator = Relocator()
+        relocator.replace_line('  INTERFACE_INCLUDE_DIRECTORIES ',
+                               '"${_IMPORT_PREFIX}/include;${CMAKE_CURRENT_LIST_DIR}/../../../include/libusb-1.0"\n',
+                               cmake_module)
+        relocator.replace_line('  INTERFACE_LINK_LIBRARIES ',
+                               '"${CMAKE_CURRENT_LIST_DIR}/../../libusb-1.0.dylib"\n', cmake_module)
+        relocator.apply(state.install_path)
 
 
 class SDRplayTarget(base.Target):
@@ -599,14 +579,10 @@ class VolkTarget(base.CMakeSharedDependencyTarget):
         super().post_build(state)
 
         # Patch CMake module to replace absolute path
-        soname_prefix = '  IMPORTED_SONAME_RELEASE '
-        soname_path = soname_prefix + '"${CMAKE_CURRENT_LIST_DIR}/../../libvolk.3.3.dylib"\n'
-
-        def update_path(line: str):
-            return soname_path if line.startswith(soname_prefix) else line
-
-        cmake_module = state.install_path / 'lib/cmake/volk/VolkTargets-release.cmake'
-        self.update_text_file(cmake_module, update_path)
+        relocator = Relocator()
+        relocator.replace_line('  IMPORTED_SONAME_RELEASE ', '"${CMAKE_CURRENT_LIST_DIR}/../../libvolk.3.3.dylib"\n',
+                               'lib/cmake/volk/VolkTargets-release.cmake')
+        relocator.apply(state.install_path)
 
 
 class ZstdTarget(base.CMakeDependencyTarget):
@@ -16,19 +16,22 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 
+import hashlib
 import os
 import plistlib
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 from aedi.state import BuildState
 from aedi.target.base import BuildTarget, CMakeMainTarget, MakeMainTarget
-from aedi.utility import (
-    OS_VERSION_X86_64,
-    apply_unified_diff,
-    hardcopy,
-    hardcopy_directory,
-)
+from aedi.utility import OS_VERSION_X86_64, apply_unified_diff
+
+from rfreq import git, macho, qmake, xcode
+from rfreq.sync import BundleSync
+
+from .qt import Qt6BaseTarget
 
 
 class _BaseLibreTarget(MakeMainTarget):
@@ -55,6 +58,12 @@ class _BaseLibreTarget(MakeMainTarget):
         project_path = state.source / self.src_root / (self.project + '.pro')
         args.append(project_path)
 
+        # qtbase is built without optional modules that are not listed in its target
+        disabled = sorted(qmake.project_modules(project_path).intersection(Qt6BaseTarget.disabled_modules()))
+
+        if disabled:
+            raise RuntimeError(f'{self.project} uses Qt modules disabled in qt6base target: ' + ', '.join(disabled))
+
         subprocess.run(args, check=True, cwd=state.build_path, env=state.environment)
 
     def build(self, state):
@@ -69,19 +78,17 @@ class _BaseLibreTarget(MakeMainTarget):
 
     def post_build(self, state):
         if state.xcode:
-            CMakeMainTarget.hardcopy_xcode_deps(state, 'usb')
+            xcode.link_deps(state, 'usb')
         else:
             bundle = self.project + '.app'
             self.outputs = (bundle,)
 
-            bundle_path = state.install_path / bundle
-            shutil.copytree(state.build_path / bundle, bundle_path)
-
-            bundle_lib_path = bundle_path / 'Contents/lib'
-            os.mkdir(bundle_lib_path)
+            sync = BundleSync(state.install_path / bundle, state.build_path / 'bundle-manifest.json')
+            sync.add_directory(state.build_path / bundle)
 
             usb_dylib = 'libusb-1.0.0.dylib'
-            hardcopy(state.lib_path / usb_dylib, bundle_lib_path / usb_dylib)
+            sync.add_file(state.lib_path / usb_dylib, f'Contents/lib/{usb_dylib}')
+            sync.run(int(state.jobs))
 
 
 class LibreCalGuiTarget(_BaseLibreTarget):
@@ -93,7 +100,7 @@ class LibreCalGuiTarget(_BaseLibreTarget):
         self.src_root = 'Software/LibreCAL-GUI'
 
     def prepare_source(self, state: BuildState):
-        state.checkout_git('https://github.com/jankae/LibreCAL.git')
+        git.checkout(state, 'https://github.com/jankae/LibreCAL.git', submodules=True)
 
 
 class LibreVnaGuiTarget(_BaseLibreTarget):
@@ -104,16 +111,17 @@ class LibreVnaGuiTarget(_BaseLibreTarget):
         self.src_root = 'Software/PC_Application/LibreVNA-GUI'
 
     def prepare_source(self, state: BuildState):
-        state.checkout_git('https://github.com/jankae/LibreVNA.git')
+        git.checkout(state, 'https://github.com/jankae/LibreVNA.git', submodules=True)
 
 
 class SdrPlusPlusBaseTarget(CMakeMainTarget):
     class BundleWriter:
-        def __init__(self, target, state: BuildState):
+        def __init__(self, target, state: BuildState, runner=subprocess.run):
             assert not state.xcode
 
             self.target = target
             self.state = state
+            self.runner = runner
             self.executable = 'sdrpp'
             self.icon = 'sdrpp.icns'
 
@@ -121,41 +129,43 @@ class SdrPlusPlusBaseTarget(CMakeMainTarget):
             self.src_res_path = state.source / 'root/res'
 
             self.bundle_path = state.install_path / target.outputs[0]
-            self.contents_path = self.bundle_path / 'Contents'
-            self.plist_path = self.contents_path / 'Info.plist'
+            self.contents_path = Path('Contents')
             self.macos_path = self.contents_path / 'MacOS'
             self.resources_path = self.contents_path / 'Resources'
             self.lib_path = self.contents_path / 'lib'
 
-            self._write()
-
-        def _write(self):
-            if self.bundle_path.exists():
-                shutil.rmtree(self.bundle_path)
+            manifest_path = self.build_path / 'bundle-manifest.json'
+            self.sync = BundleSync(self.bundle_path, manifest_path)
 
-            os.makedirs(self.macos_path)
-            hardcopy_directory(self.src_res_path, self.resources_path)
-            hardcopy(self.build_path / self.executable, self.macos_path / self.executable)
+        def write(self):
+            self.sync.add_directory(self.src_res_path, self.resources_path)
+            self.sync.add_file(self.build_path / self.executable, self.macos_path / self.executable)
 
             self._write_libs()
             self._write_plist()
             self._write_icon()
 
+            self.sync.run(int(self.state.jobs))
+
         def _write_libs(self):
+            core_path = self.build_path / 'core'
             core_lib = 'libsdrpp_core.dylib'
-            os.mkdir(self.lib_path)
-            hardcopy(self.build_path / 'core' / core_lib, self.lib_path / core_lib)
 
-            for dependency in self.target.dependencies:
-                dylib = f'lib{dependency}.dylib'
-                hardcopy(self.state.lib_path / dylib, self.lib_path / dylib)
+            # Each module is built in its own directory named after it, in one of *_modules directories
+            modules = [module_path / f'{module_path.name}.dylib' for module_path in self.build_path.glob('*_modules/*')]
+            modules = [module for module in modules if module.exists()]
 
             plugins_path = self.contents_path / 'Plugins'
-            os.mkdir(plugins_path)
 
-            for module in self.build_path.glob('**/*.dylib'):
-                if module.name != core_lib:
-                    hardcopy(module, plugins_path / module.name)
+            for module in modules:
+                self.sync.add_file(module, plugins_path / module.name)
+
+            # Copy only libraries referenced by executable and modules, directly or indirectly
+            binaries = [self.build_path / self.executable, core_path / core_lib, *modules]
+            libraries = macho.library_closure(binaries, (core_path, self.state.lib_path))
+
+            for name, path in libraries.items():
+                self.sync.add_file(path, self.lib_path / name)
 
         def _write_plist(self):
             version = self.state.source_version().strip()
@@ -173,10 +183,31 @@ class SdrPlusPlusBaseTarget(CMakeMainTarget):
                 'NSSupportsAutomaticGraphicsSwitching': True,
             }
 
-            with open(self.plist_path, 'wb') as f:
+            plist_path = self.build_path / 'Info.plist'
+
+            with open(plist_path, 'wb') as f:
                 plistlib.dump(plist, f)
 
+            self.sync.add_file(plist_path, self.contents_path / 'Info.plist')
+
         def _write_icon(self):
+            icon_path = self.src_res_path / 'icons/sdrpp.macos.png'
+            icns_path = self.build_path / self.icon
+            resolutions = (16, 32, 64, 128, 256, 512)
+
+            hasher = hashlib.sha256(icon_path.read_bytes())
+            hasher.update(repr(resolutions).encode())
+            icon_hash = hasher.hexdigest()
+
+            hash_path = self.build_path / 'sdrpp.icns.sha256'
+
+            if not icns_path.exists() or not hash_path.exists() or hash_path.read_text() != icon_hash:
+                self._generate_icon(icon_path, icns_path, resolutions)
+                hash_path.write_text(icon_hash)
+
+            self.sync.add_file(icns_path, self.resources_path / self.icon)
+
+        def _generate_icon(self, icon_path: Path, icns_path: Path, resolutions: tuple):
             iconset_path = self.build_path / 'sdrpp.iconset'
 
             if iconset_path.exists():
@@ -184,10 +215,7 @@ class SdrPlusPlusBaseTarget(CMakeMainTarget):
 
             os.mkdir(iconset_path)
 
-            icon_path = self.src_res_path / 'icons/sdrpp.macos.png'
-            resolutions = (16, 32, 64, 128, 256, 512)
-
-            for resolution in resolutions:
+            def resample(resolution: int):
                 res_str = str(resolution)
                 args = (
                     '/usr/bin/sips',
@@ -195,39 +223,44 @@ class SdrPlusPlusBaseTarget(CMakeMainTarget):
                     icon_path,
                     '--out', iconset_path / f'icon_{resolution}x{resolution}.png',
                 )
-                subprocess.run(args, check=True, env=self.state.environment, stdout=subprocess.DEVNULL)
+                self.runner(args, check=True, env=self.state.environment, stdout=subprocess.DEVNULL)
+
+            with ThreadPoolExecutor(max_workers=len(resolutions)) as executor:
+                # Iterate over results to propagate exceptions
+                for _ in executor.map(resample, resolutions):
+                    pass
 
             args = (
                 '/usr/bin/iconutil',
                 '-c', 'icns',
                 iconset_path,
-                '-o', self.resources_path / self.icon
+                '-o', icns_path
             )
-            subprocess.run(args, check=True, env=self.state.environment)
+            self.runner(args, check=True, env=self.state.environment)
 
     def __init__(self, name=None):
         super().__init__(name)
         self.outputs = ('SDR++.app',)
-        self.dependencies = [
-            'ad9361.0',
-            'airspy.0',
-            'airspyhf.0',
-            'bladeRF.2',
-            'fftw3f.3.6.9',
+        self.prerequisites = (
+            'ad9361',
+            'airspy',
+            'airspyhf',
+            'bladerf',
+            'fftw',
             'fobos',
-            'glfw.3',
-            'hackrf.0',
-            'hydrasdr.0',
-            'iio.0',
-            'LimeSuite.23.11-1',
-            'perseus-sdr.0',
+            'glfw',
+            'hackrf',
+            'hydrasdr',
+            'iio',
+            'limesuite',
+            'perseus',
             'portaudio',
             'rfnm',
-            'rtaudio.7',
-            'rtlsdr.0',
-            'usb-1.0.0',
-            'volk.3.3',
-        ]
+            'rtaudio',
+            'rtlsdr',
+            'usb',
+            'volk',
+        )
 
     def configure(self, state: BuildState):
         opts = state.options
@@ -257,13 +290,13 @@ class SdrPlusPlusBaseTarget(CMakeMainTarget):
         if state.xcode:
             self._prepare_xcode(state)
         else:
-            self.BundleWriter(self, state)
+            self.BundleWriter(self, state).write()
 
     def _prepare_xcode(self, state: BuildState):
         assert state.xcode
 
-        # Shared library dependencies
-        CMakeMainTarget.hardcopy_xcode_deps(state, *self.dependencies)
+        # Shared libraries of prerequisites
+        xcode.link_deps(state, *self.prerequisites)
 
         # SDR++ modules
         plugins_path = state.build_path / 'Plugins'
@@ -292,7 +325,7 @@ class SdrPlusPlusTarget(SdrPlusPlusBaseTarget):
         super().__init__('sdrpp')
 
     def prepare_source(self, state: BuildState):
-        state.checkout_git('https://github.com/AlexandreRouma/SDRPlusPlus.git')
+        git.checkout(state, 'https://github.com/AlexandreRouma/SDRPlusPlus.git', submodules=True)
 
     def configure(self, state: BuildState):
         apply_unified_diff(state.patch_path / 'sdrpp-local-ad9361-iio.diff', state.source)
@@ -302,10 +335,10 @@ class SdrPlusPlusTarget(SdrPlusPlusBaseTarget):
 class SrdppExpTarget(SdrPlusPlusBaseTarget):
     def __init__(self):
         super().__init__('sdrpp-exp')
-        self.dependencies.append('fobos_sdr')
+        self.prerequisites += ('fobos-agile',)
 
     def prepare_source(self, state: BuildState):
-        state.checkout_git('https://github.com/alexey-lysiuk/sdrpp-exp.git')
+        git.checkout(state, 'https://github.com/alexey-lysiuk/sdrpp-exp.git', submodules=True)
 
     def configure(self, state: BuildState):
         state.options['OPT_BUILD_DISCORD_PRESENCE'] = 'NO'
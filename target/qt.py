@@ -19,8 +19,21 @@
 from aedi.state import BuildState
 from aedi.target import base
 
+from rfreq.relocate import Relocator
+
 
 class _BaseQt6Target(base.CMakeStaticDependencyTarget):
+    # Optional qtbase modules, each of them is turned off by the feature with the same name
+    _OPTIONAL_MODULES = (
+        'concurrent',
+        'dbus',
+        'network',
+        'printsupport',
+        'sql',
+        'testlib',
+        'xml',
+    )
+
     def __init__(self, name=None):
         super().__init__(name)
         self.generator = 'Ninja'
@@ -29,12 +42,18 @@ class _BaseQt6Target(base.CMakeStaticDependencyTarget):
         opts = state.options
         opts['FEATURE_framework'] = 'NO'
         opts['QT_NO_FEATURE_AUTO_RESET'] = 'YES'
+        opts['QT_BUILD_EXAMPLES'] = 'NO'
+        opts['QT_BUILD_TESTS'] = 'NO'
 
         super().configure(state)
 
 
 class Qt6BaseTarget(_BaseQt6Target):
-    # TODO: Remove absolute paths from various files inside bin, lib, libexec, mkspecs directories
+    # TODO: Remove absolute paths from binaries inside bin, lib, libexec directories
+
+    # Optional qtbase modules from QT variable of LibreVNA and LibreCAL project files, other ones are not built
+    # Builds of applications check their project files against this list, see disabled_modules()
+    _USED_MODULES = ('concurrent', 'network', 'printsupport')
 
     def __init__(self):
         super().__init__('qt6base')
@@ -46,9 +65,32 @@ class Qt6BaseTarget(_BaseQt6Target):
             'aeb78d29291a2b5fd53cb55950f8f5065b4978c25fb1d77f627d695ab9adf21e')
 
     def configure(self, state):
-        state.options['FEATURE_relocatable'] = 'YES'
+        opts = state.options
+        opts['FEATURE_relocatable'] = 'YES'
+
+        for module in self.disabled_modules():
+            opts['FEATURE_' + module] = 'NO'
+
         super().configure(state)
 
+    @classmethod
+    def disabled_modules(cls) -> tuple:
+        return tuple(module for module in cls._OPTIONAL_MODULES if module not in cls._USED_MODULES)
+
+    def post_build(self, state: BuildState):
+        super().post_build(state)
+
+        # Remove absolute paths to build and source directories from qmake library files, CMake modules, etc.
+        # Only text files of known kinds are rewritten, binaries keep their paths
+        relocator = Relocator()
+        relocator.replace_line('QMAKE_PRL_BUILD_DIR = ', '\n', 'lib/*.prl')
+
+        for files in ('lib/*.prl', 'lib/*.pc', 'lib/*.la', 'lib/*.cmake', 'mkspecs/*.pri', 'mkspecs/*.prf'):
+            relocator.relativize(state.build_path, files)
+            relocator.relativize(state.source, files)
+
+        relocator.apply(state.install_path)
+
 
 class Qt6ChartsTarget(_BaseQt6Target):
     def __init__(self):
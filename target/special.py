@@ -0,0 +1,54 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from pathlib import Path
+
+from aedi.state import BuildState
+from aedi.target import base
+
+from rfreq.pathscan import describe, scan
+
+
+class CheckPathsTarget(base.Target):
+    def __init__(self):
+        super().__init__('check-paths')
+
+        self.destination = self.DESTINATION_OUTPUT
+        self.multi_platform = False
+
+    def build(self, state: BuildState):
+        root_path = state.patch_path.parent
+        arguments = state.arguments
+
+        def path_argument(name: str) -> Path:
+            value = getattr(arguments, f'{name}_path', None)
+            return Path(value).absolute() if value else root_path / name
+
+        forbidden = [path_argument(name) for name in ('build', 'source', 'temp')]
+        forbidden.append(root_path / 'prefix')
+
+        roots = [root_path / 'deps', path_argument('output')]
+        roots = [root for root in roots if root.exists()]
+
+        leaks = scan(roots, forbidden, int(state.jobs))
+
+        for line in describe(leaks, root_path):
+            print(line)
+
+        if leaks:
+            raise RuntimeError(f'Found absolute paths in {len(leaks)} file(s)')
@@ -71,6 +71,7 @@ class OrcTarget(base.MesonSharedTarget):
 class Rtl433Target(base.CMakeDependencyTarget):
     def __init__(self):
         super().__init__('rtl_433')
+        self.prerequisites = ('rtlsdr',)
 
     def prepare_source(self, state: BuildState):
         state.download_source(
@@ -91,7 +92,7 @@ class Rtl433Target(base.CMakeDependencyTarget):
 class RtlPowerFftwTarget(base.CMakeDependencyTarget):
     def __init__(self):
         super().__init__('rtl_power_fftw')
-        self.prerequisites = 'tclap'
+        self.prerequisites = ('fftw', 'rtlsdr', 'tclap')
 
     def prepare_source(self, state: BuildState):
         state.download_source(
@@ -102,6 +103,7 @@ class RtlPowerFftwTarget(base.CMakeDependencyTarget):
 class StlinkTarget(base.CMakeDependencyTarget):
     def __init__(self):
         super().__init__('stlink')
+        self.prerequisites = ('usb',)
 
     def prepare_source(self, state: BuildState):
         state.download_source(
@@ -0,0 +1,86 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import os
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+# aedi core is a submodule, and it is added to module search path by build script
+sys.path.append(str(Path(__file__).parent.parent / 'core'))
+
+try:
+    from aedi.target import base
+
+    from rfreq import autoconf
+except ImportError:
+    base = None
+
+_RESULTS = '''ac_cv_header_sys_types_h=${ac_cv_header_sys_types_h=yes}
+ac_cv_func_strndup=${ac_cv_func_strndup=yes}
+ac_cv_prog_cc_g=${ac_cv_prog_cc_g=yes}
+ac_cv_header_libusb_h=${ac_cv_header_libusb_h=yes}
+ac_cv_func_fftwf_plan_dft=${ac_cv_func_fftwf_plan_dft=no}
+ac_cv_prog_CC=${ac_cv_prog_CC=clang}
+'''
+
+
+class _State(types.SimpleNamespace):
+    @staticmethod
+    def architecture():
+        return 'arm64'
+
+
+@unittest.skipUnless(base, 'no aedi core')
+class ConfigCacheTestCase(unittest.TestCase):
+    def test_shared_results(self):
+        seen = []
+
+        class Target(base.ConfigureMakeDependencyTarget):
+            def configure(self, state):
+                cache_path = state.build_path / state.options['--cache-file']
+                seen.append(cache_path.read_text())
+
+                with open(cache_path, 'a', encoding='utf-8') as f:
+                    f.write(_RESULTS)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            cache = autoconf.ConfigCache(temp_path / 'cache')
+            targets = [Target('first'), Target('second')]
+            cache.instrument(targets)
+
+            # Compiler is only asked for its version to identify toolchain
+            environment = {**os.environ, 'CC': sys.executable, 'CXX': sys.executable}
+
+            for target in targets:
+                state = _State(build_path=temp_path / target.name, options={}, environment=environment)
+                target.configure(state)
+
+        self.assertEqual(seen[0], '')
+        # Only checks of standard headers, functions, and compiler features are shared
+        self.assertEqual(seen[1], 'ac_cv_func_strndup=${ac_cv_func_strndup=yes}\n'
+                                  'ac_cv_header_sys_types_h=${ac_cv_header_sys_types_h=yes}\n'
+                                  'ac_cv_prog_cc_g=${ac_cv_prog_cc_g=yes}\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import plistlib
+import struct
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+# aedi core is a submodule, and it is added to module search path by build script
+sys.path.append(str(Path(__file__).parent.parent / 'core'))
+
+try:
+    from target.main import SdrPlusPlusBaseTarget
+except ImportError:
+    SdrPlusPlusBaseTarget = None
+
+
+def _image(*dependencies: str) -> bytes:
+    commands = b''
+
+    for dependency in dependencies:
+        payload = dependency.encode() + b'\0'
+        size = (24 + len(payload) + 7) & ~7
+        commands += (struct.pack('<3I', 0xc, size, 24) + b'\0' * 12 + payload).ljust(size, b'\0')
+
+    header = struct.pack('<7I', 0xfeedfacf, 0x0100000c, 0, 6, len(dependencies), len(commands), 0)
+    return header + b'\0' * 4 + commands
+
+
+class _Runner:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, args: tuple, **kwargs):
+        self.calls.append(args[0])
+        # Both sips and iconutil write their output file after the last option
+        Path(args[-1]).write_bytes(repr(args).encode())
+
+
+@unittest.skipUnless(SdrPlusPlusBaseTarget, 'no aedi core')
+class BundleWriterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        temp_path = Path(self.temp_dir.name)
+
+        self.state = types.SimpleNamespace(
+            xcode=False, jobs='2', environment={},
+            build_path=temp_path / 'build', source=temp_path / 'source',
+            install_path=temp_path / 'install', lib_path=temp_path / 'lib',
+            source_version=lambda: '1.2.3\n')
+        self.target = types.SimpleNamespace(outputs=('SDR++.app',))
+
+        icons_path = self.state.source / 'root/res/icons'
+        icons_path.mkdir(parents=True)
+        (icons_path / 'sdrpp.macos.png').write_bytes(b'png')
+
+        module_path = self.state.build_path / 'source_modules/rtl_sdr_source'
+        module_path.mkdir(parents=True)
+        (module_path / 'rtl_sdr_source.dylib').write_bytes(_image('@rpath/librtlsdr.0.dylib'))
+        # Directory without module library, e.g. disabled one
+        (self.state.build_path / 'sink_modules/audio_sink').mkdir(parents=True)
+
+        core_path = self.state.build_path / 'core'
+        core_path.mkdir()
+        (core_path / 'libsdrpp_core.dylib').write_bytes(_image('/usr/lib/libSystem.B.dylib'))
+        (self.state.build_path / 'sdrpp').write_bytes(_image('@rpath/libsdrpp_core.dylib'))
+
+        self.state.lib_path.mkdir()
+        (self.state.lib_path / 'librtlsdr.0.dylib').write_bytes(_image('@rpath/libusb-1.0.0.dylib'))
+        (self.state.lib_path / 'libusb-1.0.0.dylib').write_bytes(_image())
+        (self.state.lib_path / 'libunused.dylib').write_bytes(_image())
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self) -> _Runner:
+        runner = _Runner()
+        SdrPlusPlusBaseTarget.BundleWriter(self.target, self.state, runner).write()
+        return runner
+
+    def test_write(self):
+        runner = self._write()
+        self.assertEqual(runner.calls, ['/usr/bin/sips'] * 6 + ['/usr/bin/iconutil'])
+
+        contents_path = self.state.install_path / 'SDR++.app/Contents'
+        files = sorted(str(path.relative_to(contents_path)) for path in contents_path.rglob('*') if path.is_file())
+        self.assertEqual(files, [
+            'Info.plist',
+            'MacOS/sdrpp',
+            'Plugins/rtl_sdr_source.dylib',
+            'Resources/icons/sdrpp.macos.png',
+            'Resources/sdrpp.icns',
+            'lib/librtlsdr.0.dylib',
+            'lib/libsdrpp_core.dylib',
+            'lib/libusb-1.0.0.dylib',
+        ])
+
+        with open(contents_path / 'Info.plist', 'rb') as f:
+            plist = plistlib.load(f)
+
+        self.assertEqual(plist['CFBundleExecutable'], 'sdrpp')
+        self.assertEqual(plist['CFBundleIconFile'], 'sdrpp.icns')
+        self.assertEqual(plist['CFBundleVersion'], '1.2.3')
+
+        iconset_path = self.state.build_path / 'sdrpp.iconset'
+        self.assertEqual(sorted(path.name for path in iconset_path.iterdir()),
+                         sorted(f'icon_{size}x{size}.png' for size in (16, 32, 64, 128, 256, 512)))
+
+    def test_icon_cache(self):
+        self._write()
+        self.assertEqual(self._write().calls, [])
+
+        (self.state.source / 'root/res/icons/sdrpp.macos.png').write_bytes(b'updated png')
+        self.assertEqual(len(self._write().calls), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
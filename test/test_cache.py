@@ -0,0 +1,157 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import io
+import os
+import tarfile
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from rfreq.cache import BuildCache
+
+_FINGERPRINT = '0' * 64
+
+
+class BuildCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.cache = BuildCache(self.temp_path / 'cache', 1024 ** 2)
+        self.install_path = self.temp_path / 'deps/usb'
+
+        os.makedirs(self.install_path / 'lib')
+        (self.install_path / 'lib/libusb-1.0.0.dylib').write_bytes(b'library')
+        os.symlink('libusb-1.0.0.dylib', self.install_path / 'lib/libusb-1.0.dylib')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_archive(self, *members):
+        archive_path = self.temp_path / f'cache/usb/{_FINGERPRINT}.tar'
+        os.makedirs(archive_path.parent, exist_ok=True)
+
+        with tarfile.open(archive_path, 'w') as tar_file:
+            for name, linkname in members:
+                info = tarfile.TarInfo(name)
+
+                if linkname:
+                    info.type = tarfile.SYMTYPE
+                    info.linkname = linkname
+                    tar_file.addfile(info)
+                else:
+                    info.size = 4
+                    tar_file.addfile(info, io.BytesIO(b'data'))
+
+    def test_missing(self):
+        self.assertFalse(self.cache.restore('usb', _FINGERPRINT, self.install_path))
+        self.assertTrue((self.install_path / 'lib/libusb-1.0.0.dylib').exists())
+
+    def test_store_and_restore(self):
+        self.cache.store('usb', _FINGERPRINT, self.install_path)
+
+        # Stale file must be gone after restoring
+        (self.install_path / 'stale').write_text('stale')
+
+        self.assertTrue(self.cache.restore('usb', _FINGERPRINT, self.install_path))
+        self.assertEqual((self.install_path / 'lib/libusb-1.0.0.dylib').read_bytes(), b'library')
+        self.assertEqual(os.readlink(self.install_path / 'lib/libusb-1.0.dylib'), 'libusb-1.0.0.dylib')
+        self.assertFalse((self.install_path / 'stale').exists())
+        self.assertEqual(sorted(path.name for path in self.install_path.parent.iterdir()), ['usb'])
+
+    def test_restore_to_missing_path(self):
+        self.cache.store('usb', _FINGERPRINT, self.install_path)
+        install_path = self.temp_path / 'other/usb'
+
+        self.assertTrue(self.cache.restore('usb', _FINGERPRINT, install_path))
+        self.assertEqual((install_path / 'lib/libusb-1.0.0.dylib').read_bytes(), b'library')
+
+    def test_unsafe_archives(self):
+        unsafe_archives = (
+            (('../outside', None),),
+            (('/absolute', None),),
+            (('link', '../../outside'),),
+            (('link', '/etc'),),
+            (('lib/link', '../..'),),
+        )
+
+        for members in unsafe_archives:
+            self._write_archive(('include/usb.h', None), *members)
+
+            with self.assertRaises(RuntimeError):
+                self.cache.restore('usb', _FINGERPRINT, self.install_path)
+
+            # Installed dependency is left intact, and nothing is written outside of it
+            self.assertEqual((self.install_path / 'lib/libusb-1.0.0.dylib').read_bytes(), b'library')
+            self.assertFalse((self.install_path / 'include').exists())
+            self.assertEqual(sorted(path.name for path in self.install_path.parent.iterdir()), ['usb'])
+            self.assertFalse((self.temp_path / 'outside').exists())
+
+    def test_safe_links(self):
+        self._write_archive(('lib/libusb.dylib', None), ('lib/link.dylib', 'libusb.dylib'), ('include/link', '../lib'))
+
+        self.assertTrue(self.cache.restore('usb', _FINGERPRINT, self.install_path))
+        self.assertEqual((self.install_path / 'include/link/link.dylib').read_bytes(), b'data')
+
+    def test_failed_restore(self):
+        self.cache.store('usb', _FINGERPRINT, self.install_path)
+        (self.install_path / 'current').write_text('current')
+        replace = os.replace
+
+        def failing_replace(source, destination):
+            if Path(destination) == self.install_path and 'old' not in Path(source).name:
+                raise PermissionError(destination)
+
+            replace(source, destination)
+
+        with mock.patch('os.replace', failing_replace):
+            with self.assertRaises(PermissionError):
+                self.cache.restore('usb', _FINGERPRINT, self.install_path)
+
+        # Installed dependency is put back
+        self.assertEqual((self.install_path / 'current').read_text(), 'current')
+        self.assertEqual(sorted(path.name for path in self.install_path.parent.iterdir()), ['usb'])
+
+    def test_failed_store(self):
+        with mock.patch('tarfile.TarFile.add', side_effect=OSError):
+            with self.assertRaises(OSError):
+                self.cache.store('usb', _FINGERPRINT, self.install_path)
+
+        self.assertEqual(os.listdir(self.temp_path / 'cache/usb'), [])
+
+    def test_eviction(self):
+        # Cache fits two archives of this size
+        (self.install_path / 'lib/libusb-1.0.0.dylib').write_bytes(b'library' * 60_000)
+        fingerprints = [str(index) * 64 for index in range(3)]
+
+        for index, fingerprint in enumerate(fingerprints[:2]):
+            self.cache.store('usb', fingerprint, self.install_path)
+            os.utime(self.temp_path / f'cache/usb/{fingerprint}.tar', (index, index))
+
+        # Restored entry becomes the most recently used one
+        self.assertTrue(self.cache.restore('usb', fingerprints[0], self.install_path))
+        self.cache.store('usb', fingerprints[2], self.install_path)
+
+        stored = sorted(path.stem for path in (self.temp_path / 'cache/usb').glob('*.tar'))
+        self.assertEqual(stored, [fingerprints[0], fingerprints[2]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import os
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+# aedi core is a submodule, and it is added to module search path by build script
+sys.path.append(str(Path(__file__).parent.parent / 'core'))
+
+try:
+    from aedi.target import base
+
+    from rfreq.ccache import CompilerCache
+except ImportError:
+    base = None
+
+
+class _State(types.SimpleNamespace):
+    @staticmethod
+    def architecture():
+        return 'arm64'
+
+
+@unittest.skipUnless(base, 'no aedi core')
+class CompilerCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+
+        # Fake compiler in its own directory of search path
+        self.compiler_path = self.temp_path / 'toolchain'
+        self.compiler_path.mkdir()
+        compiler = self.compiler_path / 'clang'
+        compiler.write_text('#!/bin/sh\n')
+        compiler.chmod(0o755)
+
+        self.cache = CompilerCache('/opt/ccache/bin/ccache', self.temp_path, self.temp_path / 'cache')
+        self.cache._create_links()  # pylint: disable=protected-access
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_links(self):
+        for name in ('cc', 'clang', 'clang++'):
+            self.assertEqual(os.readlink(self.cache.bin_path / name), '/opt/ccache/bin/ccache')
+
+        # Links are kept when they are already there, e.g. when another target is built concurrently
+        self.cache._create_links()  # pylint: disable=protected-access
+        self.assertEqual(sorted(os.listdir(self.cache.bin_path)), ['c++', 'cc', 'clang', 'clang++', 'g++', 'gcc'])
+
+    def test_configure_make(self):
+        search_path = f'{self.compiler_path}{os.pathsep}/usr/bin'
+        clang = str(self.compiler_path / 'clang')
+        state = _State(environment={'PATH': search_path, 'CC': clang, 'CXX': '/other/clang++'})
+
+        for _ in range(2):
+            self.cache.apply(base.ConfigureMakeDependencyTarget(), state)
+
+        environment = state.environment
+        self.assertEqual(environment['PATH'], f'{self.cache.bin_path}{os.pathsep}{search_path}')
+        self.assertEqual(environment['CC'], str(self.cache.bin_path / 'clang'))
+        # Compiler that is not in search path cannot be found by ccache, so it is left intact
+        self.assertEqual(environment['CXX'], '/other/clang++')
+        self.assertEqual(environment['CCACHE_DIR'], str(self.temp_path / 'cache' / 'arm64'))
+
+    def test_cmake(self):
+        state = _State(environment={'PATH': '/usr/bin'})
+        self.cache.apply(base.CMakeDependencyTarget(), state)
+
+        self.assertEqual(state.environment['PATH'], '/usr/bin')
+        self.assertEqual(state.environment['CMAKE_C_COMPILER_LAUNCHER'], '/opt/ccache/bin/ccache')
+        self.assertNotIn('CC', state.environment)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import errno
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from rfreq import clone
+
+
+class HardcopyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.source = self.temp_path / 'source'
+        self.source.write_text('content')
+
+        clone._strategies.clear()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        clone._strategies.clear()
+
+    def _hardcopy(self, name: str, link: bool = False) -> str:
+        destination = self.temp_path / name
+        operation = clone.hardcopy(self.source, destination, link)
+        self.assertEqual(destination.read_text(), 'content')
+        return operation
+
+    def test_copy(self):
+        self.assertIn(self._hardcopy('copy'), (clone.CLONE, clone.COPY))
+        self.assertNotEqual(os.stat(self.source).st_ino, os.stat(self.temp_path / 'copy').st_ino)
+
+    def test_link(self):
+        with mock.patch.dict(clone._OPERATIONS, {clone.CLONE: _raise(errno.ENOTSUP)}):
+            self.assertEqual(self._hardcopy('link', link=True), clone.LINK)
+
+        self.assertEqual(os.stat(self.source).st_ino, os.stat(self.temp_path / 'link').st_ino)
+
+    def test_unsupported_is_remembered(self):
+        failing_clone = mock.Mock(side_effect=OSError(errno.EXDEV, 'Cross-device link'))
+
+        with mock.patch.dict(clone._OPERATIONS, {clone.CLONE: failing_clone}):
+            self.assertEqual(self._hardcopy('first'), clone.COPY)
+            self.assertEqual(self._hardcopy('second'), clone.COPY)
+
+        self.assertEqual(failing_clone.call_count, 1)
+
+    def test_file_error_is_not_remembered(self):
+        failing_link = mock.Mock(side_effect=OSError(errno.EMLINK, 'Too many links'))
+        operations = {clone.CLONE: _raise(errno.ENOTSUP), clone.LINK: failing_link}
+
+        with mock.patch.dict(clone._OPERATIONS, operations):
+            self.assertEqual(self._hardcopy('first', link=True), clone.COPY)
+            self.assertEqual(self._hardcopy('second', link=True), clone.COPY)
+
+        self.assertEqual(failing_link.call_count, 2)
+
+    def test_other_error(self):
+        with mock.patch.dict(clone._OPERATIONS, {clone.CLONE: _raise(errno.ENOSPC)}):
+            with self.assertRaises(OSError):
+                clone.hardcopy(self.source, self.temp_path / 'destination')
+
+
+def _raise(error: int):
+    return mock.Mock(side_effect=OSError(error, os.strerror(error)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# aedi core is a submodule, and it is added to module search path by build script
+sys.path.append(str(Path(__file__).parent.parent / 'core'))
+
+try:
+    from rfreq import cmake
+except ImportError:
+    cmake = None
+
+
+@unittest.skipUnless(cmake, 'no aedi core')
+class CheckCacheTestCase(unittest.TestCase):
+    def test_shared_checks(self):
+        shared = cmake._SHARED_CHECKS  # pylint: disable=protected-access
+
+        for name in ('HAVE_SYS_TYPES_H', 'HAVE_STDINT_H', 'HAVE_ARPA_INET_H', 'HAVE_STRNDUP', 'HAVE_CLOCK_GETTIME'):
+            self.assertIn(name, shared)
+
+        for name in ('HAVE_LIBUSB_H', 'HAVE_FFTW3F_THREADS', 'HAVE_CONFIG_H'):
+            self.assertNotIn(name, shared)
+
+    def test_merge(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / 'cmake' / 'toolchain.json'
+            cache = cmake.CheckCache(path.parent)
+
+            cache._merge(path, {'HAVE_STDINT_H': '1', 'HAVE_STRNDUP': '1'})  # pylint: disable=protected-access
+            # The same name with different value is not shared anymore
+            cache._merge(path, {'HAVE_STDINT_H': '1', 'HAVE_STRNDUP': ''})  # pylint: disable=protected-access
+            cache._merge(path, {'HAVE_STRNDUP': '1'})  # pylint: disable=protected-access
+
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(json.load(f), {'conflicts': ['HAVE_STRNDUP'], 'results': {'HAVE_STDINT_H': '1'}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,247 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import functools
+import hashlib
+import http.server
+import io
+import os
+import tarfile
+import tempfile
+import threading
+import time
+import types
+import unittest
+from pathlib import Path
+
+from rfreq.download import fetch, instrument, prefetch
+
+
+class _RequestHandler(http.server.SimpleHTTPRequestHandler):
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def do_GET(self):
+        cls = type(self)
+
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+
+        try:
+            # Keep request in flight long enough to overlap with others
+            time.sleep(0.1)
+            super().do_GET()
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+def _archive(*members) -> bytes:
+    data = io.BytesIO()
+
+    with tarfile.open(fileobj=data, mode='w:gz') as tar_file:
+        for name, linkname in members:
+            info = tarfile.TarInfo(name)
+
+            if linkname:
+                info.type = tarfile.SYMTYPE
+                info.linkname = linkname
+                tar_file.addfile(info)
+            else:
+                info.size = len(name)
+                tar_file.addfile(info, io.BytesIO(name.encode()))
+
+    return data.getvalue()
+
+
+class DownloadTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.served_path = self.temp_path / 'served'
+        self.served_path.mkdir()
+
+        _RequestHandler.peak = 0
+        handler = functools.partial(_RequestHandler, directory=str(self.served_path))
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.server_thread = threading.Thread(target=self.server.serve_forever)
+        self.server_thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.server_thread.join()
+        self.temp_dir.cleanup()
+
+    def _serve(self, name: str, data: bytes) -> tuple:
+        (self.served_path / name).write_bytes(data)
+        url = f'http://127.0.0.1:{self.server.server_address[1]}/{name}'
+        return url, hashlib.sha256(data).hexdigest()
+
+    def test_checksum_match(self):
+        data = os.urandom(3 * 1024 * 1024)
+        url, checksum = self._serve('archive.tar.gz', data)
+        path = self.temp_path / 'source/archive.tar.gz'
+
+        fetch(url, checksum, path)
+        self.assertEqual(path.read_bytes(), data)
+        self.assertEqual(os.listdir(path.parent), ['archive.tar.gz'])
+
+    def test_checksum_mismatch(self):
+        url, _ = self._serve('archive.tar.gz', b'corrupted')
+        path = self.temp_path / 'source/archive.tar.gz'
+
+        with self.assertRaises(RuntimeError):
+            fetch(url, '0' * 64, path)
+
+        # Neither downloaded file nor its temporary copy is left behind
+        self.assertEqual(os.listdir(path.parent), [])
+
+    def test_missing_file(self):
+        url = f'http://127.0.0.1:{self.server.server_address[1]}/missing.tar.gz'
+        path = self.temp_path / 'source/missing.tar.gz'
+
+        with self.assertRaises(OSError):
+            fetch(url, '0' * 64, path)
+
+        self.assertEqual(os.listdir(path.parent), [])
+
+    def test_already_downloaded(self):
+        url, checksum = self._serve('archive.tar.gz', b'archive')
+        path = self.temp_path / 'source/archive.tar.gz'
+        os.makedirs(path.parent)
+        path.write_bytes(b'archive')
+        (self.served_path / 'archive.tar.gz').unlink()
+
+        fetch(url, checksum, path)
+        self.assertEqual(path.read_bytes(), b'archive')
+
+    def test_prefetch(self):
+        downloads = []
+
+        for index in range(8):
+            url, checksum = self._serve(f'archive{index}.tar.gz', os.urandom(64 * 1024))
+            downloads.append((url, checksum, self.temp_path / f'source/target{index}/archive{index}.tar.gz'))
+
+        prefetch(downloads, 4)
+
+        for url, checksum, path in downloads:
+            self.assertEqual(hashlib.sha256(path.read_bytes()).hexdigest(), checksum)
+
+        self.assertGreater(_RequestHandler.peak, 1)
+        self.assertLessEqual(_RequestHandler.peak, 4)
+
+    def test_prefetch_failure(self):
+        good_url, good_checksum = self._serve('good.tar.gz', b'good')
+        bad_url, _ = self._serve('bad.tar.gz', b'bad')
+        good_path = self.temp_path / 'source/good/good.tar.gz'
+        bad_path = self.temp_path / 'source/bad/bad.tar.gz'
+
+        with self.assertRaises(RuntimeError):
+            prefetch([(bad_url, '0' * 64, bad_path), (good_url, good_checksum, good_path)], 2)
+
+        self.assertFalse(bad_path.exists())
+        self.assertTrue(good_path.exists())
+
+    def test_extract(self):
+        data = _archive(('usb-1.0/configure', None), ('usb-1.0/link', 'configure'))
+        url, checksum = self._serve('usb-1.0.tar.gz', data)
+        path = self.temp_path / 'source/usb/usb-1.0.tar.gz'
+
+        # Unrelated directory must not be taken for unpacked archive
+        os.makedirs(path.parent / 'other')
+
+        fetch(url, checksum, path, extract=True)
+        self.assertEqual((path.parent / 'usb-1.0/configure').read_text(), 'usb-1.0/configure')
+        self.assertEqual(os.readlink(path.parent / 'usb-1.0/link'), 'configure')
+        self.assertEqual(sorted(os.listdir(path.parent)), ['other', 'usb-1.0', 'usb-1.0.tar.gz'])
+
+        # Already unpacked archive is left as is
+        (path.parent / 'usb-1.0/configure').write_text('patched')
+        fetch(url, checksum, path, extract=True)
+        self.assertEqual((path.parent / 'usb-1.0/configure').read_text(), 'patched')
+
+    def test_extract_downloaded(self):
+        data = _archive(('usb-1.0/configure', None))
+        url, checksum = self._serve('usb-1.0.tar.gz', data)
+        path = self.temp_path / 'source/usb/usb-1.0.tar.gz'
+        os.makedirs(path.parent)
+        path.write_bytes(data)
+
+        fetch(url, checksum, path, extract=True)
+        self.assertEqual((path.parent / 'usb-1.0/configure').read_text(), 'usb-1.0/configure')
+
+    def test_extract_checksum_mismatch(self):
+        url, _ = self._serve('usb-1.0.tar.gz', _archive(('usb-1.0/configure', None)))
+        path = self.temp_path / 'source/usb/usb-1.0.tar.gz'
+
+        with self.assertRaises(RuntimeError):
+            fetch(url, '0' * 64, path, extract=True)
+
+        self.assertEqual(os.listdir(path.parent), [])
+
+    def test_extract_unsafe(self):
+        for members in ((('usb-1.0/link', '../../..'),), (('../usb-1.0', None),)):
+            data = _archive(('usb-1.0/configure', None), *members)
+            url, checksum = self._serve('usb-1.0.tar.gz', data)
+            path = self.temp_path / 'source/usb/usb-1.0.tar.gz'
+
+            with self.assertRaises(RuntimeError):
+                fetch(url, checksum, path, extract=True)
+
+            self.assertEqual(os.listdir(path.parent), [])
+            self.assertEqual(os.listdir(path.parent.parent), ['usb'])
+
+    def test_instrument(self):
+        url, checksum = self._serve('usb-1.0.tar.gz', _archive(('usb-1.0/configure', None)))
+        source_path = self.temp_path / 'source'
+        unpacked = []
+
+        class Target:
+            name = 'usb'
+
+            def prepare_source(self, state):
+                state.download_source(url, checksum)
+
+        class State:
+            external_source = False
+
+            @staticmethod
+            def download_source(*_):
+                # Build state gets archive already verified and unpacked
+                unpacked.append((source_path / 'usb/usb-1.0/configure').exists())
+
+        instrument([Target()], source_path)
+        Target().prepare_source(State())
+        self.assertEqual(unpacked, [True])
+
+        # Sources specified by user are not downloaded
+        (self.served_path / 'usb-1.0.tar.gz').unlink()
+        Target.name = 'other'
+        Target().prepare_source(types.SimpleNamespace(external_source=True, download_source=State.download_source))
+        self.assertFalse((source_path / 'other').exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
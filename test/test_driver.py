@@ -0,0 +1,99 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import argparse
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from rfreq.graph import TargetGraph
+
+# aedi core is a submodule, and it is added to module search path by build script
+sys.path.append(str(Path(__file__).parent.parent / 'core'))
+
+try:
+    from aedi.target import base
+
+    from rfreq.driver import Driver, _Build
+except ImportError:
+    Driver = None
+
+
+class _Target:
+    DESTINATION_DEPS = 0
+
+    def __init__(self, name: str, prerequisites=(), multi_platform=True, repository=False):
+        self.name = name
+        self.prerequisites = prerequisites
+        self.multi_platform = multi_platform
+        self.destination = self.DESTINATION_DEPS
+        self.repository = repository
+
+    def prepare_source(self, state):
+        if self.repository:
+            state.checkout_git(f'https://example.com/{self.name}.git')
+        else:
+            state.download_source(f'https://example.com/{self.name}.tar.gz', 'checksum')
+
+
+@unittest.skipUnless(Driver, 'no aedi core')
+class SplitTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root_path = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _nodes(self, targets: tuple, **options) -> dict:
+        graph = TargetGraph(targets, self.root_path / 'deps')
+        arguments = argparse.Namespace(build_path=None, source_path=None, build_cache=False, archive_store=None,
+                                       parallel_arch=True, xcode=False, target=targets[-1].name, **options)
+        build = _Build(arguments, graph, self.root_path, self.root_path / 'cache', [])
+        build.fingerprints = {target.name: f'{target.name}-fingerprint' for target in targets}
+        return build._schedule_nodes([target.name for target in targets])  # pylint: disable=protected-access
+
+    def test_split(self):
+        targets = (_Target('usb'), _Target('glfw', multi_platform=False), _Target('iio', ('usb', 'glfw')))
+        self.assertEqual(self._nodes(targets), {
+            'usb:arm64': (),
+            'usb:x86_64': (),
+            'usb': ('usb:arm64', 'usb:x86_64'),
+            'glfw': (),
+            'iio:arm64': ('glfw', 'usb'),
+            'iio:x86_64': ('glfw', 'usb'),
+            'iio': ('iio:arm64', 'iio:x86_64'),
+        })
+
+    def test_meta(self):
+        matrix = base.Target('matrix')
+        matrix.prerequisites = ('usb', 'iio')
+        targets = (_Target('usb'), _Target('iio', ('usb',)), matrix, _Target('app', ('matrix',)))
+        self.assertEqual(self._nodes(targets, disable_arm=True), {'usb': (), 'iio': ('usb',), 'app': ('iio', 'usb')})
+
+    def test_not_split(self):
+        targets = (_Target('usb'), _Target('iio', ('usb',), repository=True))
+        self.assertEqual(self._nodes(targets, disable_arm=True), {'usb': (), 'iio': ('usb',)})
+        self.assertEqual(self._nodes(targets), {'usb:arm64': (), 'usb:x86_64': (),
+                                                'usb': ('usb:arm64', 'usb:x86_64'), 'iio': ('usb',)})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import os
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# aedi core is a submodule, and it is added to module search path by build script
+sys.path.append(str(Path(__file__).parent.parent / 'core'))
+
+try:
+    from rfreq.cache import BuildCache
+    from rfreq.fingerprint import FINGERPRINT_FILENAME, write_fingerprint
+    from target.gcc import ArmNoneEabiGcc14Target, ArmNoneEabiGccTarget
+except ImportError:
+    BuildCache = None
+
+
+class _State(types.SimpleNamespace):
+    @staticmethod
+    def architecture():
+        return 'arm64'
+
+    @staticmethod
+    def host():
+        return 'aarch64-apple-darwin'
+
+
+@unittest.skipUnless(BuildCache, 'no aedi core')
+class StageCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root_path = Path(self.temp_dir.name)
+        self.cache = BuildCache(self.root_path / 'cache/stage', 1024 ** 3)
+
+        for prerequisite in ('arm-none-eabi-binutils', 'isl', 'mpc'):
+            install_path = self.root_path / 'deps' / prerequisite
+            install_path.mkdir(parents=True)
+            write_fingerprint(install_path, f'{prerequisite}-fingerprint')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _build(self, target) -> list:
+        commands = []
+
+        def run(args, **kwargs):
+            commands.append(args)
+
+            if args[-1] == 'all-gcc':
+                (kwargs['cwd'] / 'gcc').write_text('compiler')
+
+        target.stage_cache = self.cache
+        build_path = self.root_path / 'build' / target.name
+        build_path.mkdir(parents=True, exist_ok=True)
+
+        # Compiler is only asked for its version to identify toolchain
+        environment = {**os.environ, 'CC': sys.executable, 'CXX': sys.executable}
+        state = _State(build_path=build_path, source=self.root_path / 'source' / target.name, options={}, jobs=4,
+                       environment=environment, patch_path=self.root_path / 'patch')
+
+        with mock.patch('target.gcc.subprocess', types.SimpleNamespace(run=run)):
+            with mock.patch.dict(os.environ, {'MAKEFLAGS': ''}):
+                target.build(state)
+
+        self.assertEqual((build_path / 'gcc').read_text(), 'compiler')
+        return [args[-1] for args in commands]
+
+    def test_restore(self):
+        self.assertEqual(self._build(ArmNoneEabiGccTarget()), ['all-gcc', 4])
+
+        # Build directory is restored with compiler stage, only target libraries are built
+        (self.root_path / 'build/arm-none-eabi-gcc/gcc').unlink()
+        self.assertEqual(self._build(ArmNoneEabiGccTarget()), [4])
+
+        # Other version has different sources
+        self.assertEqual(self._build(ArmNoneEabiGcc14Target()), ['all-gcc', 4])
+
+    def test_unknown_prerequisite(self):
+        os.unlink(self.root_path / 'deps/isl' / FINGERPRINT_FILENAME)
+        self._build(ArmNoneEabiGccTarget())
+
+        self.assertEqual(list(self.cache.path.glob('*/*.tar')), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import os
+import subprocess
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+from rfreq.source import SourceRecorder
+
+# aedi core is a submodule, and it is added to module search path by build script
+sys.path.append(str(Path(__file__).parent.parent / 'core'))
+
+try:
+    from rfreq import git
+except ImportError:
+    git = None
+
+_ENVIRONMENT = {
+    **os.environ,
+    'GIT_AUTHOR_NAME': 'test',
+    'GIT_AUTHOR_EMAIL': 'test@example.com',
+    'GIT_COMMITTER_NAME': 'test',
+    'GIT_COMMITTER_EMAIL': 'test@example.com',
+    'GIT_CONFIG_GLOBAL': os.devnull,
+    'GIT_CONFIG_NOSYSTEM': '1',
+}
+
+
+def _git(path: Path, *args) -> str:
+    result = subprocess.run(('git', *args), check=True, cwd=path, env=_ENVIRONMENT, stdout=subprocess.PIPE)
+    return result.stdout.decode('ascii').strip()
+
+
+class RecorderTestCase(unittest.TestCase):
+    @unittest.skipIf(git is None, 'aedi core is not available')
+    def test_record(self):
+        recorder = SourceRecorder()
+        git.checkout(recorder, 'https://example.com/repo.git', revision='v1.0', commit='0' * 40)
+        self.assertEqual(recorder.repositories, [('https://example.com/repo.git', 'v1.0', '0' * 40)])
+
+
+@unittest.skipIf(git is None, 'aedi core is not available')
+class CheckoutTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+
+        self.origin_path = self.temp_path / 'origin'
+        self.origin_path.mkdir()
+        _git(self.origin_path, 'init', '--quiet')
+        (self.origin_path / 'file').write_text('1')
+        _git(self.origin_path, 'add', 'file')
+        _git(self.origin_path, 'commit', '--quiet', '-m', 'first')
+        _git(self.origin_path, 'tag', 'v1')
+        self.first_commit = _git(self.origin_path, 'rev-parse', 'HEAD')
+        (self.origin_path / 'file').write_text('2')
+        _git(self.origin_path, 'commit', '--quiet', '-am', 'second')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _state(self, mirrors_path=None, external_source=False):
+        arguments = types.SimpleNamespace(git_mirrors=mirrors_path)
+        return types.SimpleNamespace(source=self.temp_path / 'source', environment=_ENVIRONMENT,
+                                     arguments=arguments, jobs=1, external_source=external_source)
+
+    def _commit(self, content: str, tag: str) -> str:
+        (self.origin_path / 'file').write_text(content)
+        _git(self.origin_path, 'commit', '--quiet', '-am', content)
+        _git(self.origin_path, 'tag', tag)
+        return _git(self.origin_path, 'rev-parse', 'HEAD')
+
+    def test_checkout(self):
+        state = self._state()
+        git.checkout(state, self.origin_path.as_uri(), revision='v1', commit=self.first_commit)
+        self.assertEqual((state.source / 'file').read_text(), '1')
+
+    def test_commit_mismatch(self):
+        with self.assertRaises(RuntimeError):
+            git.checkout(self._state(), self.origin_path.as_uri(), revision='v1', commit='0' * 40)
+
+    def test_mirror(self):
+        mirrors_path = self.temp_path / 'mirrors'
+        state = self._state(str(mirrors_path))
+        git.checkout(state, self.origin_path.as_uri(), revision='v1', commit=self.first_commit)
+
+        self.assertEqual((state.source / 'file').read_text(), '1')
+        self.assertTrue(any(mirrors_path.glob('**/objects')))
+
+        # Checkout must not borrow objects from mirror, it can be pruned or removed later
+        self.assertFalse((state.source / '.git/objects/info/alternates').exists())
+
+    def _test_update(self, mirrors_path=None):
+        state = self._state(mirrors_path)
+        git.checkout(state, self.origin_path.as_uri(), revision='v1', commit=self.first_commit)
+
+        # Existing checkout gets newly pinned revision
+        commit = self._commit('3', 'v3')
+        git.checkout(state, self.origin_path.as_uri(), revision='v3', commit=commit)
+        self.assertEqual((state.source / 'file').read_text(), '3')
+
+        # Moved tag is fetched again
+        _git(self.origin_path, 'tag', '--delete', 'v3')
+        commit = self._commit('4', 'v3')
+        git.checkout(state, self.origin_path.as_uri(), revision='v3', commit=commit)
+        self.assertEqual((state.source / 'file').read_text(), '4')
+
+    def test_update(self):
+        self._test_update()
+
+    def test_update_mirror(self):
+        self._test_update(str(self.temp_path / 'mirrors'))
+
+    def test_external_source(self):
+        state = self._state(external_source=True)
+        state.source.mkdir()
+        (state.source / 'file').write_text('local')
+
+        # Sources specified by user are neither checked out nor updated
+        git.checkout(state, self.origin_path.as_uri(), revision='v1', commit=self.first_commit, submodules=True)
+        self.assertEqual(os.listdir(state.source), ['file'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from rfreq.graph import TargetGraph
+
+
+class _Target:
+    def __init__(self, name: str, prerequisites=()):
+        self.name = name
+        self.prerequisites = prerequisites
+
+
+def _graph(*targets) -> TargetGraph:
+    with tempfile.TemporaryDirectory() as deps_path:
+        return TargetGraph(targets, Path(deps_path))
+
+
+class TargetGraphTestCase(unittest.TestCase):
+    def setUp(self):
+        self.graph = _graph(
+            _Target('usb'),
+            _Target('iio', ('usb',)),
+            _Target('ad9361', 'iio'),
+            _Target('airspy', ('usb',)),
+            _Target('sdrpp', ('ad9361', 'airspy')),
+            _Target('glfw'),
+        )
+
+    def test_prerequisites(self):
+        self.assertEqual(self.graph.prerequisites['ad9361'], ('iio',))
+        self.assertEqual(self.graph.prerequisites['sdrpp'], ('ad9361', 'airspy'))
+        self.assertEqual(self.graph.prerequisites['glfw'], ())
+
+    def test_dependents(self):
+        dependents = self.graph.dependents()
+        self.assertEqual(sorted(dependents['usb']), ['airspy', 'iio'])
+        self.assertEqual(dependents['sdrpp'], [])
+
+    def test_closure(self):
+        self.assertEqual(self.graph.closure('sdrpp'), ['usb', 'iio', 'ad9361', 'airspy', 'sdrpp'])
+        self.assertEqual(self.graph.closure('glfw'), ['glfw'])
+
+    def test_reverse_closure(self):
+        self.assertEqual(self.graph.reverse_closure('iio'), ['iio', 'ad9361', 'sdrpp'])
+        self.assertEqual(self.graph.reverse_closure('usb'), ['usb', 'iio', 'ad9361', 'airspy', 'sdrpp'])
+
+    def test_errors(self):
+        with self.assertRaises(RuntimeError):
+            self.graph.closure('unknown')
+
+        graph = _graph(_Target('a', ('b',)), _Target('b', ('a',)))
+
+        with self.assertRaises(RuntimeError):
+            graph.closure('a')
+
+
+class ChangedTestCase(unittest.TestCase):
+    def setUp(self):
+        # Build-only prerequisite is not installed to deps directory by plain build of the main target
+        self.graph = _graph(_Target('mako'), _Target('usb'), _Target('volk', ('mako',)), _Target('iio', ('usb',)),
+                            _Target('sdrpp', ('iio', 'volk')))
+        self.names = self.graph.closure('sdrpp')
+        self.fingerprints = {name: f'{name}-fingerprint' for name in self.names if name != 'sdrpp'}
+
+    def test_changed(self):
+        recorded = dict(self.fingerprints)
+        self.assertEqual(self.graph.changed(self.names, self.fingerprints, recorded), ['sdrpp'])
+
+        # Dependents of changed target are changed too
+        recorded['usb'] = 'old-fingerprint'
+        self.assertEqual(self.graph.changed(self.names, self.fingerprints, recorded), ['usb', 'iio', 'sdrpp'])
+
+    def test_not_recorded(self):
+        recorded = {'usb': 'usb-fingerprint', 'iio': 'iio-fingerprint'}
+        self.assertEqual(self.graph.changed(self.names, self.fingerprints, recorded), ['mako', 'volk', 'sdrpp'])
+
+    def test_stale_only(self):
+        # Dependencies built by plain build have no recorded fingerprints, and they are not rebuilt for Xcode
+        self.assertEqual(self.graph.changed(self.names, self.fingerprints, {}, stale_only=True), ['sdrpp'])
+
+        recorded = {'usb': 'old-fingerprint'}
+        self.assertEqual(self.graph.changed(self.names, self.fingerprints, recorded, stale_only=True),
+                         ['usb', 'iio', 'sdrpp'])
+
+
+if __name__ == '__main__':
+    unittest.main()
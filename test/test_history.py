@@ -0,0 +1,51 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from rfreq.history import BuildHistory
+
+
+class BuildHistoryTestCase(unittest.TestCase):
+    def test_estimates(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            history = BuildHistory(Path(temp_dir) / 'cache' / 'history.sqlite3')
+
+            for duration in (10, 30, 20):
+                history.record('usb', 'arm64 x86_64', 4, duration)
+
+            history.record('usb', 'arm64', 4, 5)
+
+            for duration in range(BuildHistory.SAMPLES):
+                history.record('iio', 'arm64', 4, 100 + duration)
+
+            # Only the most recent samples are taken into account
+            history.record('iio', 'arm64', 4, 1000)
+
+            self.assertEqual(history.estimate('usb', 'arm64 x86_64'), 20)
+            self.assertEqual(history.estimate('usb', 'arm64'), 5)
+            self.assertIsNone(history.estimate('usb', 'x86_64'))
+            self.assertEqual(history.estimates({'usb': 'arm64', 'iio': 'arm64', 'glfw': 'arm64'}),
+                             {'usb': 5, 'iio': 103})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import os
+import sys
+import types
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# aedi core is a submodule, and it is added to module search path by build script
+sys.path.append(str(Path(__file__).parent.parent / 'core'))
+
+try:
+    from rfreq import jobserver
+except ImportError:
+    jobserver = None
+
+
+@unittest.skipUnless(jobserver, 'no aedi core')
+class JobServerTestCase(unittest.TestCase):
+    def test_tokens(self):
+        with jobserver.JobServer(4) as server:
+            environment = server.environment({'MAKEFLAGS': '-k'})
+            self.assertEqual(environment['MAKEFLAGS'], f'-k -j4 --jobserver-auth=fifo:{server.path}')
+
+            # Driver acquires a token for implicit job slot of every client, so the pipe holds all of them
+            self.assertEqual(server.acquire(3), 3)
+            self.assertEqual(server.acquire(3), 1)
+            self.assertEqual(server.acquire(1), 0)
+
+            server.release(2)
+            self.assertEqual(os.read(server.descriptor, 16), b'++')
+
+        self.assertFalse(server.temp_path.exists())
+
+    def test_make_jobs(self):
+        state = types.SimpleNamespace(environment={}, jobs=8)
+
+        with mock.patch.dict(os.environ, {'MAKEFLAGS': ''}):
+            self.assertEqual(jobserver.make_jobs(state), ('--jobs', 8))
+
+        makeflags = ' -j4 --jobserver-auth=fifo:/tmp/fifo'
+
+        with mock.patch.dict(os.environ, {'MAKEFLAGS': makeflags}):
+            self.assertEqual(jobserver.make_jobs(state), ())
+            self.assertEqual(state.environment['MAKEFLAGS'], makeflags)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+
+from rfreq import macho
+
+_DEPS_PATH = Path(__file__).parent.parent / 'deps'
+
+_CPU_TYPE_X86_64 = 0x01000007
+_CPU_TYPE_ARM64 = 0x0100000c
+_MH_DYLIB = 6
+
+
+def _string_command(cmd: int, string: str, header_size: int = 12) -> bytes:
+    payload = string.encode() + b'\0'
+    size = (header_size + len(payload) + 7) & ~7
+    header = struct.pack('<3I', cmd, size, header_size) + b'\0' * (header_size - 12)
+    return (header + payload).ljust(size, b'\0')
+
+
+def _dylib_command(cmd: int, name: str) -> bytes:
+    # dylib_command has name offset, timestamp, current and compatibility versions
+    return _string_command(cmd, name, header_size=24)
+
+
+def _build_version_command(minos: int) -> bytes:
+    return struct.pack('<6I', 0x32, 24, 1, minos, minos, 0)
+
+
+def _thin_image(cputype: int, commands: list) -> bytes:
+    body = b''.join(commands)
+    header = struct.pack('<7I', 0xfeedfacf, cputype, 0, _MH_DYLIB, len(commands), len(body), 0)
+    return header + b'\0' * 4 + body
+
+
+def _fat_image(*images: tuple) -> bytes:
+    offset = 0x1000
+    header = struct.pack('>2I', 0xcafebabe, len(images))
+    slices = b''
+
+    for cputype, image in images:
+        header += struct.pack('>5I', cputype, 0, offset + len(slices), len(image), 12)
+        slices += image.ljust(0x1000, b'\0')
+
+    return header.ljust(offset, b'\0') + slices
+
+
+def _library_commands() -> list:
+    return [
+        _dylib_command(0xd, '@rpath/libtest.1.dylib'),
+        _dylib_command(0xc, '/usr/lib/libSystem.B.dylib'),
+        _dylib_command(0x18 | 0x80000000, '@rpath/libweak.dylib'),
+        _string_command(0x1c | 0x80000000, '@loader_path/../lib'),
+        _build_version_command((11 << 16) | (3 << 8)),
+    ]
+
+
+class MachOTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, name: str, data: bytes) -> Path:
+        path = self.temp_path / name
+        path.write_bytes(data)
+        return path
+
+    def _check_library(self, image: macho.MachOImage):
+        self.assertEqual(image.filetype, _MH_DYLIB)
+        self.assertEqual(image.install_name, '@rpath/libtest.1.dylib')
+        self.assertEqual(image.dependencies, ['/usr/lib/libSystem.B.dylib', '@rpath/libweak.dylib'])
+        self.assertEqual(image.rpaths, ['@loader_path/../lib'])
+        self.assertEqual(image.min_os_version, '11.3.0')
+        self.assertEqual(len(image.load_commands), 5)
+
+    def test_thin(self):
+        path = self._write('libtest.dylib', _thin_image(_CPU_TYPE_ARM64, _library_commands()))
+        self.assertTrue(macho.is_macho(path))
+
+        images = macho.read(path)
+        self.assertEqual([image.architecture for image in images], ['arm64'])
+        self._check_library(images[0])
+
+    def test_fat(self):
+        commands = _library_commands()
+        data = _fat_image(
+            (_CPU_TYPE_X86_64, _thin_image(_CPU_TYPE_X86_64, commands)),
+            (_CPU_TYPE_ARM64, _thin_image(_CPU_TYPE_ARM64, commands)),
+        )
+        path = self._write('libtest.dylib', data)
+        self.assertTrue(macho.is_macho(path))
+
+        images = macho.read(path)
+        self.assertEqual([image.architecture for image in images], ['x86_64', 'arm64'])
+
+        for image in images:
+            self._check_library(image)
+
+    def test_fat_static_library(self):
+        archive = b'!<arch>\n'.ljust(64, b'\0')
+        path = self._write('libtest.a', _fat_image((_CPU_TYPE_X86_64, archive), (_CPU_TYPE_ARM64, archive)))
+
+        images = macho.read(path)
+        self.assertEqual([image.architecture for image in images], ['x86_64', 'arm64'])
+        self.assertEqual([image.filetype for image in images], [0, 0])
+        self.assertEqual(images[0].dependencies, [])
+
+    def test_not_macho(self):
+        self.assertFalse(macho.is_macho(self._write('empty', b'')))
+        self.assertFalse(macho.is_macho(self._write('text', b'#!/bin/sh\n')))
+
+        with self.assertRaises(ValueError):
+            macho.read(self._write('garbage', b'\0' * 64))
+
+    @unittest.skipUnless((_DEPS_PATH / 'usb/lib/libusb-1.0.0.dylib').exists(), 'no checked-in libusb')
+    def test_checked_in_libusb(self):
+        images = macho.read(_DEPS_PATH / 'usb/lib/libusb-1.0.0.dylib')
+        self.assertEqual(sorted(image.architecture for image in images), ['arm64', 'x86_64'])
+
+        for image in images:
+            self.assertTrue(image.install_name.endswith('libusb-1.0.0.dylib'))
+            self.assertIn('/usr/lib/libSystem.B.dylib', image.dependencies)
+            self.assertIsNotNone(image.min_os_version)
+
+
+class LibraryClosureTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.core_path = self.temp_path / 'core'
+        self.lib_path = self.temp_path / 'lib'
+        self.core_path.mkdir()
+        self.lib_path.mkdir()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, path: Path, *dependencies: str) -> Path:
+        commands = [_dylib_command(0xc, dependency) for dependency in dependencies]
+        path.write_bytes(_thin_image(_CPU_TYPE_ARM64, commands))
+        return path
+
+    def test_closure(self):
+        # Executable -> core -> libusb -> libusb dependency via @rpath, and external SDRplay API
+        executable = self._write(self.temp_path / 'sdrpp', '@rpath/libsdrpp_core.dylib', '/usr/lib/libSystem.B.dylib')
+        core = self._write(self.core_path / 'libsdrpp_core.dylib', '@rpath/libusb-1.0.0.dylib',
+                           '/usr/local/lib/libsdrplay_api.so.3', '/System/Library/Frameworks/Cocoa.framework/Cocoa')
+        usb = self._write(self.lib_path / 'libusb-1.0.0.dylib', '@loader_path/libdependency.dylib')
+        dependency = self._write(self.lib_path / 'libdependency.dylib', f'{self.lib_path}/libabsolute.dylib')
+        absolute = self._write(self.lib_path / 'libabsolute.dylib')
+        self._write(self.lib_path / 'libunreachable.dylib')
+
+        libraries = macho.library_closure([executable], (self.core_path, self.lib_path))
+        self.assertEqual(libraries, {
+            'libsdrpp_core.dylib': core,
+            'libusb-1.0.0.dylib': usb,
+            'libdependency.dylib': dependency,
+            'libabsolute.dylib': absolute,
+        })
+
+    def test_missing(self):
+        executable = self._write(self.temp_path / 'sdrpp', '@rpath/libmissing.dylib')
+
+        with self.assertRaises(RuntimeError):
+            macho.library_closure([executable], (self.core_path, self.lib_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from rfreq.pathscan import describe, scan
+
+
+class PathScanTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root_path = Path(self.temp_dir.name)
+        self.build_path = self.root_path / 'build'
+        self.deps_path = self.root_path / 'deps'
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, path: Path, content: bytes) -> Path:
+        os.makedirs(path.parent, exist_ok=True)
+        path.write_bytes(content)
+        return path
+
+    def test_binary(self):
+        prefix = str(self.build_path).encode()
+        library = self._write(self.deps_path / 'usb/lib/libusb.dylib', b'\xcf\xfa\xed\xfe\0\0' + prefix + b'/usb\0')
+        self._write(self.deps_path / 'usb/lib/clean.dylib', b'\xcf\xfa\xed\xfe\0\0/usr/lib\0')
+        self._write(self.deps_path / 'usb/lib/empty.a', b'')
+
+        leaks = scan([self.deps_path], [self.build_path], 2)
+        self.assertEqual(leaks, {library: [(6, str(self.build_path))]})
+        self.assertEqual(describe(leaks, self.root_path), [f'deps/usb/lib/libusb.dylib: 0x6 {self.build_path}'])
+
+    def test_reporting_limit(self):
+        line = str(self.build_path).encode() + b'\n'
+        header = self._write(self.deps_path / 'usb/include/libusb.h', line * 10)
+
+        leaks = scan([self.deps_path], [self.build_path], 1)
+        self.assertEqual(len(leaks[header]), 10)
+
+        offsets = ', '.join(f'{index * len(line):#x} {self.build_path}' for index in range(8))
+        self.assertEqual(describe(leaks, self.root_path), [f'deps/usb/include/libusb.h: {offsets} and 2 more'])
+
+    def test_outside_root(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            output = self._write(Path(output_dir) / 'tool', str(self.build_path).encode())
+            leaks = scan([Path(output_dir)], [self.build_path], 1)
+
+            # Output path can be outside of root directory
+            self.assertEqual(describe(leaks, self.root_path), [f'{output}: 0x0 {self.build_path}'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from rfreq import qmake
+
+# aedi core is a submodule, and it is added to module search path by build script
+sys.path.append(str(Path(__file__).parent.parent / 'core'))
+
+try:
+    from target.qt import Qt6BaseTarget
+except ImportError:
+    Qt6BaseTarget = None
+
+
+class QMakeTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_modules(self):
+        (self.temp_path / 'common').mkdir()
+        (self.temp_path / 'common/common.pri').write_text('QT *= network\n')
+
+        project_path = self.temp_path / 'app.pro'
+        project_path.write_text(
+            'QT += core gui widgets \\\n'
+            '    svg  # charts are added below\n'
+            '# QT += sql\n'
+            'greaterThan(QT_MAJOR_VERSION, 5): QT += charts\n'
+            'macx { QT += printsupport }\n'
+            'QT -= widgets\n'
+            'QT_CONFIG += xml\n'
+            'include($$PWD/common/common.pri)\n'
+            'include(missing.pri)\n')
+
+        self.assertEqual(qmake.project_modules(project_path),
+                         {'charts', 'core', 'gui', 'network', 'printsupport', 'svg', 'widgets'})
+
+    @unittest.skipUnless(Qt6BaseTarget, 'no aedi core')
+    def test_disabled_modules(self):
+        self.assertEqual(Qt6BaseTarget.disabled_modules(), ('dbus', 'sql', 'testlib', 'xml'))
+
+
+if __name__ == '__main__':
+    unittest.main()
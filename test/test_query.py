@@ -0,0 +1,126 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from rfreq.graph import TargetGraph
+from rfreq.query import describe, format_dot, format_json
+
+
+class _Target:
+    def __init__(self, name: str, prerequisites=(), archives=(), repository=False):
+        self.name = name
+        self.prerequisites = prerequisites
+        self.archives = archives
+        self.repository = repository
+
+    def prepare_source(self, state):
+        if self.repository:
+            state.checkout_git(f'https://example.com/{self.name}.git')
+
+        for archive in self.archives:
+            state.download_source(f'https://example.com/{archive}', 'checksum')
+
+
+class _UnknownTarget(_Target):
+    def prepare_source(self, state):
+        # Sources depend on something that only actual build state has
+        state.download_source(state.source_url(), 'checksum')
+
+
+class QueryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root_path = Path(self.temp_dir.name)
+        self.source_path = root_path / 'source'
+
+        self.graph = TargetGraph((
+            _Target('usb', archives=('libusb.tar.bz2',)),
+            _Target('iio', ('usb',), archives=('libiio.tar.gz', 'patch.tar.gz')),
+            _Target('glfw', repository=True),
+            _UnknownTarget('fftw'),
+            _Target('sdrpp', ('fftw', 'glfw', 'iio')),
+        ), root_path / 'deps')
+
+        usb_path = self.source_path / 'usb'
+        usb_path.mkdir(parents=True)
+        (usb_path / 'libusb.tar.bz2').write_bytes(b'\0' * 1024 ** 2)
+
+        # Only one of two archives is downloaded
+        iio_path = self.source_path / 'iio'
+        iio_path.mkdir()
+        (iio_path / 'libiio.tar.gz').write_bytes(b'\0' * 1024)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _describe(self, names: list) -> dict:
+        build_times = {'usb': 10.0, 'iio': 20.0, 'glfw': 30.0, 'sdrpp': 100.0}
+        return {node.name: node for node in describe(self.graph, names, build_times, self.source_path)}
+
+    def test_describe(self):
+        nodes = self._describe(self.graph.closure('sdrpp'))
+
+        self.assertEqual(nodes['sdrpp'].prerequisites, ('fftw', 'glfw', 'iio'))
+        self.assertEqual(nodes['sdrpp'].closure_size, 4)
+        self.assertEqual(nodes['usb'].dependents, ('iio',))
+        self.assertEqual(nodes['usb'].closure_build_time, 10.0)
+        self.assertEqual(nodes['iio'].closure_build_time, 30.0)
+        # Build time of one of prerequisites is unknown
+        self.assertIsNone(nodes['sdrpp'].closure_build_time)
+
+        self.assertEqual((nodes['usb'].archive_count, nodes['usb'].archive_size), (1, 1024 ** 2))
+        self.assertEqual((nodes['iio'].archive_count, nodes['iio'].archive_size), (2, None))
+        self.assertEqual((nodes['glfw'].archive_count, nodes['glfw'].archive_size), (0, 0))
+        self.assertEqual((nodes['fftw'].archive_count, nodes['fftw'].archive_size), (None, None))
+
+    def test_shown_nodes(self):
+        # Prerequisites and dependents outside of shown targets are omitted
+        nodes = self._describe(self.graph.reverse_closure('iio'))
+
+        self.assertEqual(list(nodes), ['iio', 'sdrpp'])
+        self.assertEqual(nodes['iio'].prerequisites, ())
+        self.assertEqual(nodes['iio'].closure_size, 1)
+        self.assertEqual(nodes['sdrpp'].prerequisites, ('iio',))
+
+    def test_format(self):
+        nodes = describe(self.graph, ['usb', 'iio', 'glfw'], {'usb': 10.0}, self.source_path)
+
+        self.assertEqual(format_dot(nodes).splitlines(), [
+            'digraph targets {',
+            '    rankdir=LR;',
+            '    node [shape=box];',
+            '    "usb" [label="usb\\n0 prerequisite(s), 10 s, 1.0 MB"];',
+            '    "iio" [label="iio\\n1 prerequisite(s), archive size unknown"];',
+            '    "glfw" [label="glfw\\n0 prerequisite(s)"];',
+            '    "usb" -> "iio";',
+            '}',
+        ])
+
+        entries = json.loads(format_json(nodes))
+        self.assertEqual([entry['name'] for entry in entries], ['usb', 'iio', 'glfw'])
+        self.assertEqual(entries[1]['prerequisites'], ['usb'])
+        self.assertIsNone(entries[1]['archive_size'])
+
+
+if __name__ == '__main__':
+    unittest.main()
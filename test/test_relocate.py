@@ -0,0 +1,153 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from rfreq.relocate import Relocator
+
+
+class RelocatorTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, relative_path: str, content: bytes) -> Path:
+        path = self.path / relative_path
+        os.makedirs(path.parent, exist_ok=True)
+        path.write_bytes(content)
+        return path
+
+    def test_rules(self):
+        self._write('lib/cmake/fftw/FFTW3fConfig.cmake', b'set (FFTW3f_INCLUDE_DIRS /prefix/include)\n'
+                                                         b'set (FFTW3f_LIBRARY_DIRS /prefix/lib)\n'
+                                                         b'include (/prefix/lib/cmake/fftw/FFTW3fTargets.cmake)\n')
+        self._write('lib/pkgconfig/fftw3f.pc', b'Cflags: -I/prefix/include -I${includedir}\n')
+
+        relocator = Relocator()
+        relocator.replace_line('set (FFTW3f_INCLUDE_DIRS ', '${CMAKE_CURRENT_LIST_DIR}/../../../include)\n')
+        relocator.replace('/prefix/lib/cmake/fftw/', '${CMAKE_CURRENT_LIST_DIR}/', 'lib/cmake/*')
+        relocator.remove(' -I/prefix/include', 'lib/pkgconfig/fftw3f.pc')
+        relocator.apply(self.path)
+
+        self.assertEqual((self.path / 'lib/cmake/fftw/FFTW3fConfig.cmake').read_bytes(),
+                         b'set (FFTW3f_INCLUDE_DIRS ${CMAKE_CURRENT_LIST_DIR}/../../../include)\n'
+                         b'set (FFTW3f_LIBRARY_DIRS /prefix/lib)\n'
+                         b'include (${CMAKE_CURRENT_LIST_DIR}/FFTW3fTargets.cmake)\n')
+        self.assertEqual((self.path / 'lib/pkgconfig/fftw3f.pc').read_bytes(), b'Cflags: -I${includedir}\n')
+
+    def test_line_rule_precedence(self):
+        # Longer substring rule matching at the start of line must not win over line rule
+        self._write('lib/Qt6Core.prl', b'QMAKE_PRL_BUILD_DIR = /build/qt6base/lib\nQMAKE_PRL_TARGET = Qt6Core\n')
+
+        relocator = Relocator()
+        relocator.replace_line('QMAKE_PRL', '\n')
+        relocator.remove('QMAKE_PRL_BUILD_DIR = /build/')
+        relocator.apply(self.path)
+
+        self.assertEqual((self.path / 'lib/Qt6Core.prl').read_bytes(), b'QMAKE_PRL\nQMAKE_PRL\n')
+
+    def test_last_line(self):
+        # The last line without newline must stay without it
+        self._write('include/gmp.h', b'#define __GMP_CC "/usr/bin/clang"\n#define __GMP_CFLAGS "-O2"')
+
+        relocator = Relocator()
+        relocator.replace_line('#define __GMP_CC ', '"clang"\n')
+        relocator.replace_line('#define __GMP_CFLAGS ', '""\n')
+        relocator.apply(self.path)
+
+        self.assertEqual((self.path / 'include/gmp.h').read_bytes(),
+                         b'#define __GMP_CC "clang"\n#define __GMP_CFLAGS ""')
+
+    def test_relativize(self):
+        build_path = self.path / 'build'
+        self._write('bin/qt-cmake', f'cmake -S {build_path}/src -B {build_path}\n'.encode())
+
+        relocator = Relocator()
+        relocator.relativize(build_path)
+        relocator.apply(self.path / 'bin')
+
+        self.assertEqual((self.path / 'bin/qt-cmake').read_bytes(), f'cmake -S src -B {build_path}\n'.encode())
+
+    def test_skipped_files(self):
+        binary = self._write('lib/libgmp.dylib', b'/prefix\0/prefix')
+        self._write('include/gmp.h', b'/prefix\n')
+        os.symlink('gmp.h', self.path / 'include/link.h')
+        other = self._write('share/gmp.h', b'/prefix\n')
+
+        relocator = Relocator()
+        relocator.remove('/prefix', 'include/*')
+        relocator.remove('/prefix', 'lib/*.dylib')
+        relocator.apply(self.path)
+
+        self.assertEqual(binary.read_bytes(), b'/prefix\0/prefix')
+        self.assertEqual((self.path / 'include/gmp.h').read_bytes(), b'\n')
+        self.assertTrue((self.path / 'include/link.h').is_symlink())
+        self.assertEqual(other.read_bytes(), b'/prefix\n')
+
+    def test_particular_file(self):
+        self._write('include/gmp.h', b'#define __GMP_CC "/usr/bin/clang"\n#define __GMP_CFLAGS "-O2"\n')
+
+        relocator = Relocator()
+        relocator.replace_line('#define __GMP_CC ', '"clang"\n', 'include/gmp.h')
+
+        # Particular file is updated without walking installed tree
+        with mock.patch('os.walk') as walk:
+            relocator.apply(self.path)
+
+        walk.assert_not_called()
+        self.assertEqual((self.path / 'include/gmp.h').read_bytes(),
+                         b'#define __GMP_CC "clang"\n#define __GMP_CFLAGS "-O2"\n')
+
+        relocator.remove('-O2', 'include/missing.h')
+
+        with self.assertRaises(FileNotFoundError):
+            relocator.apply(self.path)
+
+    def test_walked_directories(self):
+        self._write('lib/cmake/volk/VolkTargets.cmake', b'/prefix\n')
+        self._write('share/doc/volk.txt', b'/prefix\n')
+
+        relocator = Relocator()
+        relocator.remove('/prefix', 'lib/cmake/*.cmake')
+        relocator.remove('/prefix', 'lib/*.pc')
+
+        walked = []
+        walk = os.walk
+
+        def walk_and_record(path, *args, **kwargs):
+            walked.append(Path(path).relative_to(self.path).as_posix())
+            return walk(path, *args, **kwargs)
+
+        with mock.patch('os.walk', walk_and_record):
+            relocator.apply(self.path)
+
+        self.assertEqual(walked, ['lib'])
+        self.assertEqual((self.path / 'lib/cmake/volk/VolkTargets.cmake').read_bytes(), b'\n')
+        self.assertEqual((self.path / 'share/doc/volk.txt').read_bytes(), b'/prefix\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import threading
+import time
+import unittest
+
+from rfreq.scheduler import Scheduler
+
+_PREREQUISITES = {
+    'usb': (),
+    'iio': ('usb',),
+    'ad9361': ('iio',),
+    'airspy': ('usb',),
+    'glfw': (),
+    'sdrpp': ('ad9361', 'airspy', 'glfw'),
+}
+
+
+class _Pool:
+    def __init__(self, tokens: int):
+        self.tokens = tokens
+        self.lock = threading.Lock()
+
+    def acquire(self, count: int) -> int:
+        with self.lock:
+            count = min(count, self.tokens)
+            self.tokens -= count
+            return count
+
+    def release(self, count: int):
+        with self.lock:
+            self.tokens += count
+
+
+class SchedulerTestCase(unittest.TestCase):
+    def test_order(self):
+        finished = []
+        lock = threading.Lock()
+
+        def build(name: str, _):
+            with lock:
+                for prerequisite in _PREREQUISITES[name]:
+                    self.assertIn(prerequisite, finished)
+
+            time.sleep(0.01)
+
+            with lock:
+                finished.append(name)
+
+        Scheduler(_PREREQUISITES, 4).run(build)
+        self.assertEqual(sorted(finished), sorted(_PREREQUISITES))
+        self.assertEqual(finished[-1], 'sdrpp')
+
+    def test_job_budget(self):
+        prerequisites = {f'target{index}': () for index in range(8)}
+        running = 0
+        peak = 0
+        total_jobs = 0
+        lock = threading.Lock()
+
+        def build(_, jobs: int):
+            nonlocal running, peak, total_jobs
+
+            with lock:
+                running += 1
+                peak = max(peak, running)
+                total_jobs += jobs
+
+            time.sleep(0.02)
+
+            with lock:
+                running -= 1
+
+        Scheduler(prerequisites, 3).run(build)
+        self.assertLessEqual(peak, 3)
+        self.assertEqual(total_jobs, 8)
+
+    def test_pool(self):
+        prerequisites = {f'target{index}': () for index in range(6)}
+        pool = _Pool(4)
+        shares = {}
+        lock = threading.Lock()
+
+        def build(name: str, jobs: int):
+            with lock:
+                shares[name] = jobs
+
+            # Shared target takes additional job slots from the pool on its own, like GNU make does
+            borrowed = pool.acquire(3) if name == 'target0' else 0
+            time.sleep(0.02)
+            pool.release(borrowed)
+
+        Scheduler(prerequisites, 4).run(build, pool, shared=('target0',))
+        self.assertEqual(shares['target0'], 1)
+        self.assertEqual(sorted(shares), sorted(prerequisites))
+        self.assertEqual(pool.tokens, 4)
+
+    def test_critical_path_first(self):
+        started = []
+        durations = {'usb': 1.0, 'iio': 10.0, 'ad9361': 10.0, 'airspy': 1.0, 'glfw': 1.0, 'sdrpp': 1.0}
+        scheduler = Scheduler(_PREREQUISITES, 1, durations=durations)
+
+        self.assertEqual(scheduler.estimate(), 22.0)
+
+        scheduler.run(lambda name, _: started.append(name))
+        self.assertEqual(started[:3], ['usb', 'iio', 'ad9361'])
+
+    def test_prerequisites_outside_of_set(self):
+        built = []
+        Scheduler({'ad9361': ('iio',)}, 2).run(lambda name, _: built.append(name))
+        self.assertEqual(built, ['ad9361'])
+
+    def test_failure(self):
+        built = []
+
+        def build(name: str, _):
+            if name == 'iio':
+                raise OSError('build failed')
+
+            built.append(name)
+
+        with self.assertRaises(RuntimeError) as context:
+            Scheduler(_PREREQUISITES, 1).run(build)
+
+        self.assertIn('iio', str(context.exception))
+        self.assertNotIn('ad9361', built)
+        self.assertNotIn('sdrpp', built)
+
+
+if __name__ == '__main__':
+    unittest.main()
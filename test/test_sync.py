@@ -0,0 +1,146 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from rfreq import sync
+from rfreq.sync import BundleSync
+
+
+class BundleSyncTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.source_path = self.temp_path / 'source'
+        self.bundle_path = self.temp_path / 'SDR++.app'
+        self.manifest_path = self.temp_path / 'manifest.json'
+
+        self._write('res/icons/sdrpp.png', 'icon')
+        self._write('res/themes/dark.json', 'dark')
+        os.symlink('dark.json', self.source_path / 'res/themes/default.json')
+        os.symlink('themes', self.source_path / 'res/styles')
+        self._write('external/font.ttf', 'font')
+        os.symlink('../external/font.ttf', self.source_path / 'res/font.ttf')
+        self._write('sdrpp', 'executable')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, relative_path: str, content: str) -> Path:
+        path = self.source_path / relative_path
+        os.makedirs(path.parent, exist_ok=True)
+        path.write_text(content)
+        return path
+
+    def _sync(self, **extra_files) -> list:
+        bundle_sync = BundleSync(self.bundle_path, self.manifest_path)
+        bundle_sync.add_directory(self.source_path / 'res', 'Contents/Resources')
+        bundle_sync.add_file(self.source_path / 'sdrpp', 'Contents/MacOS/sdrpp')
+
+        for name, source in extra_files.items():
+            bundle_sync.add_file(source, f'Contents/lib/{name}')
+
+        copied = []
+        copy = sync._copy
+
+        def copy_and_record(source: Path, destination: Path):
+            copied.append(destination.relative_to(self.bundle_path).as_posix())
+            copy(source, destination)
+
+        with mock.patch('rfreq.sync._copy', copy_and_record):
+            bundle_sync.run(2)
+
+        return sorted(copied)
+
+    def test_initial(self):
+        copied = self._sync()
+        resources_path = self.bundle_path / 'Contents/Resources'
+
+        self.assertEqual(copied, ['Contents/MacOS/sdrpp', 'Contents/Resources/font.ttf',
+                                  'Contents/Resources/icons/sdrpp.png', 'Contents/Resources/themes/dark.json'])
+        self.assertEqual(os.readlink(resources_path / 'themes/default.json'), 'dark.json')
+        self.assertEqual(os.readlink(resources_path / 'styles'), 'themes')
+        self.assertFalse((resources_path / 'font.ttf').is_symlink())
+        self.assertEqual((resources_path / 'font.ttf').read_text(), 'font')
+        self.assertEqual((self.bundle_path / 'Contents/MacOS/sdrpp').read_text(), 'executable')
+
+    def test_unchanged(self):
+        self._sync()
+        self.assertEqual(self._sync(), [])
+
+        # Timestamp change without content change
+        os.utime(self.source_path / 'sdrpp', ns=(0, 0))
+        self.assertEqual(self._sync(), [])
+
+    def test_changed_source(self):
+        self._sync()
+        self._write('sdrpp', 'rebuilt executable')
+
+        self.assertEqual(self._sync(), ['Contents/MacOS/sdrpp'])
+        self.assertEqual((self.bundle_path / 'Contents/MacOS/sdrpp').read_text(), 'rebuilt executable')
+
+    def test_changed_destination(self):
+        self._sync()
+
+        # Code signing modifies bundle files in place
+        executable_path = self.bundle_path / 'Contents/MacOS/sdrpp'
+        executable_path.write_text('signed executable')
+        (self.bundle_path / 'Contents/Resources/icons/sdrpp.png').unlink()
+
+        self.assertEqual(self._sync(), ['Contents/MacOS/sdrpp', 'Contents/Resources/icons/sdrpp.png'])
+        self.assertEqual(executable_path.read_text(), 'executable')
+
+    def test_changed_links(self):
+        self._sync()
+        resources_path = self.bundle_path / 'Contents/Resources'
+
+        os.unlink(self.source_path / 'res/themes/default.json')
+        os.symlink('../icons/sdrpp.png', self.source_path / 'res/themes/default.json')
+        os.unlink(self.source_path / 'res/styles')
+        self._write('res/styles/light.json', 'light')
+
+        self.assertEqual(self._sync(), ['Contents/Resources/styles/light.json'])
+        self.assertEqual(os.readlink(resources_path / 'themes/default.json'), '../icons/sdrpp.png')
+        self.assertFalse((resources_path / 'styles').is_symlink())
+        self.assertEqual((resources_path / 'styles/light.json').read_text(), 'light')
+        self.assertFalse((self.source_path / 'res/themes/light.json').exists())
+
+    def test_stale_entries(self):
+        library = self._write('libusb-1.0.0.dylib', 'library')
+        self._sync(**{'libusb-1.0.0.dylib': library})
+        self._write('res/stale/file', 'stale')
+        self._sync(**{'libusb-1.0.0.dylib': library})
+
+        (self.source_path / 'res/stale/file').unlink()
+        (self.source_path / 'res/stale').rmdir()
+        os.unlink(self.source_path / 'res/styles')
+
+        self.assertEqual(self._sync(), [])
+        self.assertFalse((self.bundle_path / 'Contents/lib').exists())
+        self.assertFalse((self.bundle_path / 'Contents/Resources/stale').exists())
+        self.assertFalse(os.path.lexists(self.bundle_path / 'Contents/Resources/styles'))
+        self.assertTrue((self.bundle_path / 'Contents/Resources/themes/dark.json').exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import copy
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from rfreq import hooks
+from rfreq.trace import Tracer, read_events
+
+
+class _State:
+    @staticmethod
+    def architecture():
+        return 'arm64'
+
+
+class _BaseTarget:
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = []
+
+    def configure(self, state):
+        self.calls.append('base')
+
+
+class _DerivedTarget(_BaseTarget):
+    def configure(self, state):
+        super().configure(state)
+        self.calls.append('derived')
+
+
+class HooksTestCase(unittest.TestCase):
+    def test_wrap_method(self):
+        hooked = []
+
+        class Base(_BaseTarget):
+            pass
+
+        class Derived(_DerivedTarget):
+            pass
+
+        def hook(target, method, state):
+            hooked.append(target.name)
+            return method(state)
+
+        # Both classes are instrumented, and call of base method via super() must not trigger the hook again
+        targets = [Base('base'), Derived('derived')]
+        hooks.wrap_method(targets, 'configure', hook)
+
+        for target in targets + [copy.deepcopy(target) for target in targets]:
+            target.configure(_State())
+
+        self.assertEqual(hooked, ['base', 'derived', 'base', 'derived'])
+        self.assertEqual(targets[1].calls, ['base', 'derived'])
+
+    def test_predicate(self):
+        class Base(_BaseTarget):
+            pass
+
+        hooked = []
+        hooks.wrap_method([Base('base')], 'configure', lambda *args: hooked.append(args), lambda _: False)
+        Base('base').configure(_State())
+
+        self.assertEqual(hooked, [])
+
+
+class TracerTestCase(unittest.TestCase):
+    def test_events(self):
+        class Target(_DerivedTarget):
+            def build(self, state):
+                subprocess.run((sys.executable, '-c', 'pass'), check=True)
+
+        tracer = Tracer()
+        target = Target('test')
+        tracer.instrument([target])
+        target.configure(_State())
+        target.build(_State())
+
+        phases = [event for event in tracer.events if event['cat'] == 'phase']
+        self.assertEqual([event['name'] for event in phases], ['configure', 'build'])
+
+        for event in phases:
+            self.assertEqual(event['args']['target'], 'test')
+            self.assertEqual(event['args']['architecture'], 'arm64')
+            self.assertGreaterEqual(event['args']['peak_rss_delta_mb'], 0)
+            self.assertGreaterEqual(event['args']['children_peak_rss_delta_mb'], 0)
+
+        processes = [event for event in tracer.events if event['cat'] == 'process']
+        self.assertEqual(len(processes), 1)
+        self.assertEqual(processes[0]['args']['command'], f'{sys.executable} -c pass')
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / 'trace.json'
+            tracer.write(path)
+            self.assertEqual(read_events(path), tracer.events)
+
+
+if __name__ == '__main__':
+    unittest.main()
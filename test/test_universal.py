@@ -0,0 +1,114 @@
+#
+#    Module to build radio frequency libraries and tools for macOS
+#    Copyright (C) 2020-2026 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import contextlib
+import io
+import os
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+
+from rfreq import universal
+
+# Header of 64-bit Mach-O file, content after it is not read by merge
+_MACHO_HEADER = struct.pack('<I', 0xfeedfacf)
+
+
+class MergeTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.install_paths = [self.temp_path / 'arm64', self.temp_path / 'x86_64']
+        self.output_path = self.temp_path / 'output'
+        self.commands = []
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, relative_path: str, *contents: bytes, mode: int = 0o644):
+        for install_path, content in zip(self.install_paths, contents):
+            path = install_path / relative_path
+            os.makedirs(path.parent, exist_ok=True)
+            path.write_bytes(content)
+            os.chmod(path, mode)
+
+    def _run(self, args: tuple, check: bool):
+        self.assertTrue(check)
+        self.commands.append(args)
+
+        if args[0] == 'lipo':
+            args[-1].write_bytes(b''.join(path.read_bytes() for path in args[2:-2]))
+
+    def _merge(self) -> str:
+        output = io.StringIO()
+
+        with contextlib.redirect_stdout(output):
+            universal.merge(self.install_paths, self.output_path, runner=self._run)
+
+        return output.getvalue()
+
+    def test_binaries(self):
+        self._write('lib/libusb.dylib', _MACHO_HEADER + b'arm64', _MACHO_HEADER + b'x86_64', mode=0o755)
+        self._write('lib/libusb.a', b'!<arch>\narm64', b'!<arch>\nx86_64')
+        self._write('bin/lsusb', _MACHO_HEADER + b'arm64', _MACHO_HEADER + b'x86_64', mode=0o755)
+        self._merge()
+
+        lipo = [command for command in self.commands if command[0] == 'lipo']
+        self.assertEqual(len(lipo), 3)
+        universal_binary = _MACHO_HEADER + b'arm64' + _MACHO_HEADER + b'x86_64'
+        self.assertEqual((self.output_path / 'bin/lsusb').read_bytes(), universal_binary)
+        self.assertTrue(os.access(self.output_path / 'bin/lsusb', os.X_OK))
+
+        signed = [command[-1] for command in self.commands if command[0] == 'codesign']
+        self.assertEqual(sorted(signed), [self.output_path / 'bin/lsusb', self.output_path / 'lib/libusb.dylib'])
+
+    def test_files(self):
+        self._write('include/libusb.h', b'header', b'header')
+        self._write('lib/pkgconfig/libusb.pc', b'arm64', b'x86_64')
+        self._write('lib/libusb.la', b'libtool', b'libtool')
+        self._write('.fingerprint', b'arm64', b'x86_64')
+        self._write('share/arm64.txt', b'arm64')
+        os.symlink('libusb.h', self.install_paths[0] / 'include/usb.h')
+        output = self._merge()
+
+        self.assertEqual(self.commands, [])
+        self.assertEqual((self.output_path / 'include/libusb.h').read_bytes(), b'header')
+        self.assertEqual(os.readlink(self.output_path / 'include/usb.h'), 'libusb.h')
+        self.assertEqual((self.output_path / 'share/arm64.txt').read_bytes(), b'arm64')
+        self.assertFalse((self.output_path / 'lib/libusb.la').exists())
+        self.assertFalse((self.output_path / '.fingerprint').exists())
+
+        # The first architecture wins when files differ
+        self.assertEqual((self.output_path / 'lib/pkgconfig/libusb.pc').read_bytes(), b'arm64')
+        self.assertIn('libusb.pc differs', output)
+        self.assertNotIn('libusb.h differs', output)
+
+    def test_replace(self):
+        self._write('old.txt', b'old', b'old')
+        universal.merge(self.install_paths, self.output_path, runner=self._run)
+        (self.install_paths[0] / 'old.txt').unlink()
+        (self.install_paths[1] / 'old.txt').unlink()
+        self._write('new.txt', b'new', b'new')
+        self._merge()
+
+        self.assertEqual(sorted(os.listdir(self.output_path)), ['new.txt'])
+
+
+if __name__ == '__main__':
+    unittest.main()